@@ -53,6 +53,20 @@ class ActivityStreamWidget(QtGui.QWidget):
     # Activity attributes that we do not want displayed.
     _SKIP_ACTIVITY_ATTRIBUTES = ["viewed_by_current_user"]
 
+    # style applied to items that are new since data was last loaded
+    _NEW_ARRIVAL_STYLESHEET = (
+        "QFrame#frame{ border: 1px solid rgba(48, 167, 227, 50%); }"
+    )
+
+    # when creating widgets lazily, the height of the placeholder for
+    # an item that hasn't been displayed before.
+    LAZY_WIDGET_DEFAULT_HEIGHT = 80
+
+    # when creating widgets lazily, widgets are created for the items
+    # within this many viewport heights above and below the visible
+    # part of the activity stream.
+    LAZY_WIDGET_PRELOAD_PAGES = 1
+
     entity_requested = QtCore.Signal(str, int)
     playback_requested = QtCore.Signal(dict)
 
@@ -94,6 +108,8 @@ class ActivityStreamWidget(QtGui.QWidget):
         self._highlight_new_arrivals = True
         self._notes_are_selectable = False
         self._attachments_filter = None
+        self._lazy_widget_creation = False
+        self._load_older_on_scroll = False
 
         # apply styling
         self._load_stylesheet()
@@ -112,6 +128,7 @@ class ActivityStreamWidget(QtGui.QWidget):
         # set up signals
         self._data_manager.note_arrived.connect(self._process_new_note)
         self._data_manager.update_arrived.connect(self._process_new_data)
+        self._data_manager.older_update_arrived.connect(self._process_older_data)
         self._data_manager.thumbnail_arrived.connect(self._process_thumbnail)
         self._data_manager.requesting_ui_refresh.connect(self._clear)
         self.ui.note_widget.entity_created.connect(self._on_entity_created)
@@ -122,6 +139,23 @@ class ActivityStreamWidget(QtGui.QWidget):
         self._activity_stream_static_widgets = []
         self._activity_stream_data_widgets = {}
 
+        # when creating widgets lazily, placeholders stand in for the
+        # widgets that haven't been created yet. They are sized from
+        # the last known height of the widget for the same activity.
+        self._activity_stream_placeholder_widgets = {}
+        self._activity_widget_heights = {}
+
+        # create the widgets coming into view as the stream is scrolled
+        # or resized. The timer batches the updates triggered by the
+        # scroll bar signals into a single pass.
+        self._lazy_widget_timer = QtCore.QTimer(self)
+        self._lazy_widget_timer.setSingleShot(True)
+        self._lazy_widget_timer.timeout.connect(self._create_visible_activity_widgets)
+        scroll_bar = self.ui.activity_stream_scroll_area.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self._schedule_lazy_widget_creation)
+        scroll_bar.rangeChanged.connect(self._schedule_lazy_widget_creation)
+        scroll_bar.valueChanged.connect(self._on_scroll_value_changed)
+
         # state management
         self._task_manager = None
         self._sg_entity_dict = None
@@ -167,6 +201,7 @@ class ActivityStreamWidget(QtGui.QWidget):
         """
         Should be called before the widget is closed
         """
+        self._lazy_widget_timer.stop()
         self._data_manager.destroy()
         self._task_manager = None
 
@@ -425,10 +460,45 @@ class ActivityStreamWidget(QtGui.QWidget):
 
     attachments_filter = property(_get_attachments_filter, _set_attachments_filter)
 
+    def _get_lazy_widget_creation(self):
+        """
+        If True, widgets are only created for the items in and around the
+        visible part of the activity stream. The other items are represented
+        by placeholders, sized from the last known height of their widget,
+        and their widgets are created as the activity stream is scrolled.
+        This keeps loading entities with long activity streams fast.
+
+        Changing this takes effect the next time data is loaded.
+        """
+        return self._lazy_widget_creation
+
+    def _set_lazy_widget_creation(self, state):
+        self._lazy_widget_creation = bool(state)
+
+    lazy_widget_creation = property(
+        _get_lazy_widget_creation, _set_lazy_widget_creation
+    )
+
+    def _get_load_older_on_scroll(self):
+        """
+        If True, older activity is loaded a page at a time, see
+        :meth:`load_older_data`, when the activity stream is scrolled
+        close to its bottom.
+        """
+        return self._load_older_on_scroll
+
+    def _set_load_older_on_scroll(self, state):
+        self._load_older_on_scroll = bool(state)
+
+    load_older_on_scroll = property(
+        _get_load_older_on_scroll, _set_load_older_on_scroll
+    )
+
     ############################################################################
     # public interface
 
     def select_note(self, note_id):
+        self._create_note_activity_widgets(note_id)
         selectedWidget = None
         for widget in self._activity_stream_data_widgets.values():
             if isinstance(widget, NoteWidget):
@@ -467,6 +537,7 @@ class ActivityStreamWidget(QtGui.QWidget):
 
         :param int note_id: The Note entity id.
         """
+        self._create_note_activity_widgets(note_id)
         for widget in self._activity_stream_data_widgets.values():
             if isinstance(widget, NoteWidget) and widget.note_id == note_id:
                 return widget.attachments
@@ -576,6 +647,11 @@ class ActivityStreamWidget(QtGui.QWidget):
             # old items first order...
             self._bundle.log_debug("Adding activity widgets...")
             for activity_id in ids_to_process:
+                if self.lazy_widget_creation:
+                    # the widget is created once it comes into view
+                    self._add_activity_placeholder(activity_id)
+                    continue
+
                 w = self._create_activity_widget(activity_id)
                 # note that not all activity data entries generate
                 # a widget in our factory method.
@@ -624,10 +700,12 @@ class ActivityStreamWidget(QtGui.QWidget):
         # note that we don't interleave these requests with building
         # the ui - this is to minimise the risk of GIL signal issues
 
-        # request thumbs
+        # request thumbs. When creating widgets lazily, they are requested
+        # as the widgets are created instead.
         self._bundle.log_debug("Request thumbnails...")
         for activity_id in ids_to_process:
-            self._data_manager.request_activity_thumbnails(activity_id)
+            if activity_id not in self._activity_stream_placeholder_widgets:
+                self._data_manager.request_activity_thumbnails(activity_id)
 
         for attachment_req in attachment_requests:
             self._data_manager.request_attachment_thumbnail(
@@ -651,11 +729,30 @@ class ActivityStreamWidget(QtGui.QWidget):
 
         self._bundle.log_debug("...done")
 
+        self._schedule_lazy_widget_creation()
+
         # and now request an update check
         self._bundle.log_debug("Ask db manager to ask shotgun for updates...")
         self._data_manager.rescan()
         self._bundle.log_debug("...done")
 
+    def load_older_data(self):
+        """
+        Load a page of activity older than the activity currently shown,
+        and add it to the bottom of the activity stream.
+
+        Older activity is read from the cache first. Once the cache runs
+        out, it is fetched from ShotGrid in the background, and added to
+        the stream when it arrives.
+        """
+        if self._entity_type is None:
+            return
+
+        activity_ids = self._data_manager.load_older_activity_data(
+            self.MAX_STREAM_LENGTH
+        )
+        self._process_older_data(activity_ids)
+
     def show_new_note_dialog(self, modal=True):
         """
         Shows a dialog that allows the user to input a new note.
@@ -725,14 +822,23 @@ class ActivityStreamWidget(QtGui.QWidget):
             self._clear_loading_widget()
 
             self._bundle.log_debug("Removing all widget items")
-            for x in self._activity_stream_data_widgets.values():
+            for activity_id, x in self._activity_stream_data_widgets.items():
+                # remember the height of displayed widgets to size their
+                # placeholders the next time the activity is loaded lazily
+                if x.isVisible():
+                    self._activity_widget_heights[activity_id] = x.height()
                 # remove widget from layout:
                 self.ui.activity_stream_layout.removeWidget(x)
                 # set it's parent to None so that it is removed from the widget hierarchy
                 x.setParent(None)
 
+            for x in self._activity_stream_placeholder_widgets.values():
+                self.ui.activity_stream_layout.removeWidget(x)
+                x.setParent(None)
+
             self._bundle.log_debug("Clearing python data structures")
             self._activity_stream_data_widgets = {}
+            self._activity_stream_placeholder_widgets = {}
 
             self._bundle.log_debug("Removing expanding widget")
             for w in self._activity_stream_static_widgets:
@@ -955,6 +1061,8 @@ class ActivityStreamWidget(QtGui.QWidget):
 
         # keep track of new note widgets created
         note_widgets_added = []
+        # and of the new placeholders when creating widgets lazily
+        placeholders_added = []
 
         # remove the "loading please wait .... widget
         self._clear_loading_widget()
@@ -986,6 +1094,13 @@ class ActivityStreamWidget(QtGui.QWidget):
             activity_ids = activity_ids[-self.MAX_STREAM_LENGTH :]
 
         for activity_id in activity_ids:
+            if self.lazy_widget_creation:
+                # the widget is created once it comes into view
+                placeholder = self._add_activity_placeholder(activity_id)
+                placeholder.highlight = self.highlight_new_arrivals
+                placeholders_added.append(placeholder)
+                continue
+
             self._bundle.log_debug("Creating new widget...")
             w = self._create_activity_widget(activity_id)
             if w:
@@ -994,9 +1109,7 @@ class ActivityStreamWidget(QtGui.QWidget):
                 self.ui.activity_stream_layout.addWidget(w)
                 # add special blue border to indicate that this is a new arrival
                 if self.highlight_new_arrivals:
-                    w.setStyleSheet(
-                        "QFrame#frame{ border: 1px solid rgba(48, 167, 227, 50%); }"
-                    )
+                    w.setStyleSheet(self._NEW_ARRIVAL_STYLESHEET)
                 # register if it is a note so we can post process
                 if isinstance(w, NoteWidget):
                     note_widgets_added.append(w)
@@ -1004,7 +1117,8 @@ class ActivityStreamWidget(QtGui.QWidget):
         # when everything is loaded in, load the thumbs
         self._bundle.log_debug("Requesting thumbnails")
         for activity_id in activity_ids:
-            self._data_manager.request_activity_thumbnails(activity_id)
+            if activity_id not in self._activity_stream_placeholder_widgets:
+                self._data_manager.request_activity_thumbnails(activity_id)
 
         self._bundle.log_debug("Process new data complete.")
 
@@ -1012,15 +1126,47 @@ class ActivityStreamWidget(QtGui.QWidget):
         # this may be the case if a note has been replied to - in this case
         # the note already exists in the list
         note_ids_added = [widget.note_id for widget in note_widgets_added]
+        for placeholder in placeholders_added:
+            note_id = self._get_activity_note_id(placeholder.activity_id)
+            if note_id is not None:
+                note_ids_added.append(note_id)
         for widget in self._activity_stream_data_widgets.values():
             if isinstance(widget, NoteWidget) and widget not in note_widgets_added:
                 if widget.note_id in note_ids_added:
                     widget.hide()
 
+        # the same goes for the items whose widget hasn't been created yet
+        for activity_id, placeholder in list(
+            self._activity_stream_placeholder_widgets.items()
+        ):
+            if placeholder not in placeholders_added:
+                if self._get_activity_note_id(activity_id) in note_ids_added:
+                    self._remove_activity_placeholder(activity_id)
+
+        self._schedule_lazy_widget_creation()
+
         # turn off the overlay in case it is spinning
         # (which only happens on a full load)
         self.__overlay.hide()
 
+    def _process_older_data(self, activity_ids):
+        """
+        Add older activity ids to the bottom of the stream, as they are
+        loaded from the cache or arrive from the data manager.
+
+        :param activity_ids: List of activity ids, in ascending order
+        """
+        # the items go right above the static widgets at the bottom of the
+        # stream. Insert the most recent ones first, so that the older ones
+        # end up below them.
+        index = len(self._activity_stream_static_widgets)
+        for activity_id in reversed(activity_ids):
+            self._add_activity_placeholder(activity_id, index)
+            if not self.lazy_widget_creation:
+                self._create_placeholder_activity_widget(activity_id)
+
+        self._schedule_lazy_widget_creation()
+
     def _process_thumbnail(self, data):
         """
         New thumbnail has arrived from the data manager
@@ -1040,22 +1186,176 @@ class ActivityStreamWidget(QtGui.QWidget):
             )
 
             # request thumbs
-            for attachment_req in attachment_requests:
-                self._data_manager.request_attachment_thumbnail(
-                    attachment_req["activity_id"],
-                    attachment_req["attachment_group_id"],
-                    attachment_req["attachment_data"],
-                )
-
-            for reply_user in reply_users:
-                self._data_manager.request_user_thumbnail(
-                    reply_user["type"], reply_user["id"], reply_user["image"]
-                )
+            self._request_note_thumbnails(reply_users, attachment_requests)
             self.note_arrived.emit(note_id)
 
         else:
             self.note_arrived.emit(note_id)
 
+    def _request_note_thumbnails(self, reply_users, attachment_requests):
+        """
+        Request the thumbnails for the replies and attachments of a note
+        widget.
+
+        :param reply_users: List of users who have replied, as returned
+                            by :meth:`_populate_note_widget`.
+        :param attachment_requests: List of attachment request dictionaries,
+                                    as returned by :meth:`_populate_note_widget`.
+        """
+        for attachment_req in attachment_requests:
+            self._data_manager.request_attachment_thumbnail(
+                attachment_req["activity_id"],
+                attachment_req["attachment_group_id"],
+                attachment_req["attachment_data"],
+            )
+
+        for reply_user in reply_users:
+            self._data_manager.request_user_thumbnail(
+                reply_user["type"], reply_user["id"], reply_user["image"]
+            )
+
+    ############################################################################
+    # lazy widget creation
+
+    def _get_activity_note_id(self, activity_id):
+        """
+        Get the id of the Note displayed by the widget for an activity.
+
+        :param activity_id: Activity stream id
+        :returns: Note entity id, or None if the activity isn't about a note
+        """
+        data = self._data_manager.get_activity_data(activity_id)
+        entity = data["primary_entity"]
+        if (
+            data["update_type"] in ("create", "create_reply")
+            and entity
+            and entity["type"] == "Note"
+        ):
+            return entity["id"]
+        return None
+
+    def _add_activity_placeholder(self, activity_id, index=-1):
+        """
+        Add a placeholder for an activity to the stream. The widget for the
+        activity is created once the placeholder comes into view.
+
+        :param activity_id: Activity stream id
+        :param index: Position of the placeholder in the layout, by default
+                      at the top of the stream
+        :returns: The placeholder widget
+        """
+        height = self._activity_widget_heights.get(
+            activity_id, self.LAZY_WIDGET_DEFAULT_HEIGHT
+        )
+        placeholder = _ActivityPlaceholderWidget(activity_id, height, self)
+        self._activity_stream_placeholder_widgets[activity_id] = placeholder
+        self.ui.activity_stream_layout.insertWidget(index, placeholder)
+        return placeholder
+
+    def _remove_activity_placeholder(self, activity_id):
+        """
+        Remove the placeholder for an activity from the stream.
+
+        :param activity_id: Activity stream id
+        :returns: The position the placeholder had in the layout
+        """
+        placeholder = self._activity_stream_placeholder_widgets.pop(activity_id)
+        index = self.ui.activity_stream_layout.indexOf(placeholder)
+        self.ui.activity_stream_layout.removeWidget(placeholder)
+        placeholder.setParent(None)
+        return index
+
+    def _create_placeholder_activity_widget(self, activity_id):
+        """
+        Replace the placeholder for an activity with the activity widget,
+        and request the note content and thumbnails it displays.
+
+        :param activity_id: Activity stream id
+        :returns: Activity widget object or None
+        """
+        highlight = self._activity_stream_placeholder_widgets[activity_id].highlight
+        index = self._remove_activity_placeholder(activity_id)
+
+        w = self._create_activity_widget(activity_id)
+        if not w:
+            # no widget for this activity, so don't reserve space for it
+            # the next time it is loaded
+            self._activity_widget_heights[activity_id] = 0
+            return None
+
+        self._activity_stream_data_widgets[activity_id] = w
+        self.ui.activity_stream_layout.insertWidget(index, w)
+        if highlight:
+            w.setStyleSheet(self._NEW_ARRIVAL_STYLESHEET)
+
+        self._data_manager.request_activity_thumbnails(activity_id)
+        if isinstance(w, NoteWidget):
+            reply_users, attachment_requests = self._populate_note_widget(
+                w, activity_id, w.note_id
+            )
+            self._request_note_thumbnails(reply_users, attachment_requests)
+
+        return w
+
+    def _create_note_activity_widgets(self, note_id):
+        """
+        Create the widgets for the activities of a note that are still
+        represented by placeholders.
+
+        :param note_id: Note entity id
+        """
+        for activity_id in list(self._activity_stream_placeholder_widgets):
+            if self._get_activity_note_id(activity_id) == note_id:
+                self._create_placeholder_activity_widget(activity_id)
+
+    def _schedule_lazy_widget_creation(self, *args):
+        """
+        Schedule the creation of the widgets for the placeholders in and
+        around the visible part of the stream.
+        """
+        if self._activity_stream_placeholder_widgets:
+            self._lazy_widget_timer.start(0)
+
+    def _on_scroll_value_changed(self, value):
+        """
+        Load older activity when the stream is scrolled close to its bottom.
+
+        :param value: The scroll bar position
+        """
+        scroll_bar = self.ui.activity_stream_scroll_area.verticalScrollBar()
+        if (
+            self.load_older_on_scroll
+            and scroll_bar.maximum() > 0
+            and value >= scroll_bar.maximum() - scroll_bar.pageStep()
+        ):
+            self.load_older_data()
+
+    def _create_visible_activity_widgets(self):
+        """
+        Replace the placeholders in and around the visible part of the
+        stream with activity widgets.
+        """
+        if not self._activity_stream_placeholder_widgets:
+            return
+
+        # make sure the placeholders are positioned before looking at them
+        self.ui.activity_stream_layout.activate()
+
+        scroll_area = self.ui.activity_stream_scroll_area
+        page_height = scroll_area.viewport().height()
+        preload_height = page_height * self.LAZY_WIDGET_PRELOAD_PAGES
+        top = -scroll_area.widget().y() - preload_height
+        bottom = top + page_height + 2 * preload_height
+
+        placeholders = self._activity_stream_placeholder_widgets
+        activity_ids = []
+        for activity_id, placeholder in placeholders.items():
+            geometry = placeholder.geometry()
+            if geometry.bottom() >= top and geometry.top() <= bottom:
+                activity_ids.append(activity_id)
+        for activity_id in activity_ids:
+            self._create_placeholder_activity_widget(activity_id)
+
     def _on_entity_created(self, entity):
         """
         Callback when an entity is created by an underlying widget.
@@ -1171,3 +1471,22 @@ class ActivityStreamWidget(QtGui.QWidget):
                 if selected != widget.selected:
                     widget.set_selected(selected)
                     self._note_selected_changed(selected, widget.note_id)
+
+
+class _ActivityPlaceholderWidget(QtGui.QWidget):
+    """
+    Empty widget standing in for an activity widget that hasn't been
+    created yet.
+    """
+
+    def __init__(self, activity_id, height, parent):
+        """
+        :param activity_id: Activity stream id
+        :param height: Height of the placeholder
+        :param parent: QT parent object
+        """
+        super().__init__(parent)
+        self.activity_id = activity_id
+        # whether to highlight the widget as a new arrival once created
+        self.highlight = False
+        self.setFixedHeight(height)
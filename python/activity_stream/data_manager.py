@@ -10,6 +10,7 @@
 
 from sgtk.platform.qt import QtCore, QtGui
 
+import collections
 import copy
 import datetime
 import hashlib
@@ -17,8 +18,11 @@ import sgtk
 import sqlite3
 import sys
 import os
+import threading
 import time
 
+from . import payload_codec
+
 shotgun_model = sgtk.platform.import_framework(
     "tk-framework-shotgunutils", "shotgun_model"
 )
@@ -31,7 +35,9 @@ def _db_connect(function):
     """
     Decorator helper to use with database methods. This is to reduce
     code duplication and it passes in a connection and cursor argument
-    to the decorated method. Use it like this:
+    to the decorated method. The connection is the long lived database
+    connection for the current thread, and any transaction left open by
+    the method is rolled back. Use it like this:
 
         @_db_connect
         def my_method(self, connection, cursor, note_id):
@@ -47,26 +53,63 @@ def _db_connect(function):
     """
 
     def wrap_function(*args, **kwargs):
-        connection = None
-        cursor = None
         self = args[0]
-        try:
-            connection = self._init_db()
-            cursor = connection.cursor()
-            new_args = (self, connection, cursor) + args[1:]
-            return function(*new_args, **kwargs)
-        finally:
-            try:
-                if cursor:
-                    cursor.close()
-                if connection:
-                    connection.close()
-            except:
-                self._bundle.log_exception("Could not close database handle")
+        while True:
+            db = self._get_db_connection()
+            # hold the connection lock while it is in use, so that it can't
+            # be closed by another thread in the middle of a query.
+            with db.lock:
+                if db.closed:
+                    # closed since it was fetched, get a new connection.
+                    continue
+                connection = db.connection
+                cursor = None
+                try:
+                    cursor = connection.cursor()
+                    new_args = (self, connection, cursor) + args[1:]
+                    return function(*new_args, **kwargs)
+                finally:
+                    try:
+                        if cursor:
+                            cursor.close()
+                        # the connection is reused, so make sure that changes
+                        # which were not committed don't leak into the next
+                        # call.
+                        if connection.in_transaction:
+                            connection.rollback()
+                    except Exception:
+                        self._bundle.log_exception("Could not close database handle")
 
     return wrap_function
 
 
+class _DbConnection(object):
+    """
+    A long lived database connection used by a single thread. The lock
+    is held while the connection is in use, and when it is closed, so
+    that it is never closed by another thread while a query is running.
+    """
+
+    def __init__(self, connection):
+        """
+        :param connection: The sqlite connection.
+        """
+        self.connection = connection
+        # reentrant, since decorated methods may call each other.
+        self.lock = threading.RLock()
+        self.closed = False
+
+    def close(self):
+        """
+        Closes the connection, waiting for any query in progress to
+        finish first.
+        """
+        with self.lock:
+            if not self.closed:
+                self.closed = True
+                self.connection.close()
+
+
 class ActivityStreamDataHandler(QtCore.QObject):
     """
     Data retriever and manager for activity stream data
@@ -77,8 +120,101 @@ class ActivityStreamDataHandler(QtCore.QObject):
     for performance.
     """
 
+    # The version in the name of the database file. The schema of the
+    # database is versioned separately (see DATABASE_SCHEMA_VERSION) and
+    # existing databases are migrated in place, so this only needs to change
+    # if a database can't be migrated.
     DATBASE_FORMAT_VERSION = 18
 
+    # The version of the database schema, stored in the database as its
+    # user_version. Databases with an older schema are migrated with the
+    # DATABASE_MIGRATIONS scripts.
+    DATABASE_SCHEMA_VERSION = 2
+
+    # The database schema, for new databases.
+    DATABASE_SCHEMA = """
+        CREATE TABLE entity (entity_type text, entity_id integer, activity_id integer, created_at datetime, PRIMARY KEY (entity_type, entity_id, activity_id));
+
+        CREATE TABLE activity (activity_id integer primary key, note_id integer default null, payload blob, created_at datetime);
+
+        CREATE TABLE note (note_id integer primary key, payload blob, created_at datetime);
+
+        CREATE TABLE entity_access (entity_type text, entity_id integer, accessed_at datetime, PRIMARY KEY (entity_type, entity_id));
+
+        CREATE INDEX entity_activity_id ON entity(activity_id);
+        CREATE INDEX activity_note_id ON activity(note_id);
+    """
+
+    # Scripts to migrate the database schema, keyed by the schema version
+    # they migrate from. Each script migrates to the next version.
+    DATABASE_MIGRATIONS = {
+        # Version 0 databases have no keys, and may contain duplicate rows.
+        # Rebuild the tables with keys, keeping the most recent of any
+        # duplicate rows, and without the old indices: the keys cover all
+        # queries.
+        0: """
+            CREATE TABLE entity_v1 (entity_type text, entity_id integer, activity_id integer, created_at datetime, PRIMARY KEY (entity_type, entity_id, activity_id));
+            INSERT OR IGNORE INTO entity_v1
+                SELECT entity_type, entity_id, activity_id, created_at FROM entity ORDER BY rowid DESC;
+            DROP TABLE entity;
+            ALTER TABLE entity_v1 RENAME TO entity;
+
+            CREATE TABLE activity_v1 (activity_id integer primary key, note_id integer default null, payload blob, created_at datetime);
+            INSERT OR IGNORE INTO activity_v1
+                SELECT activity_id, note_id, payload, created_at FROM activity ORDER BY rowid DESC;
+            UPDATE activity_v1 SET note_id = (
+                SELECT max(a.note_id) FROM activity a WHERE a.activity_id = activity_v1.activity_id
+            ) WHERE note_id IS NULL;
+            DROP TABLE activity;
+            ALTER TABLE activity_v1 RENAME TO activity;
+
+            CREATE TABLE note_v1 (note_id integer primary key, payload blob, created_at datetime);
+            INSERT OR IGNORE INTO note_v1
+                SELECT note_id, payload, created_at FROM note ORDER BY rowid DESC;
+            DROP TABLE note;
+            ALTER TABLE note_v1 RENAME TO note;
+        """,
+        # Version 2 tracks when the entities were last accessed, for cache
+        # eviction. Entities cached before are considered to have been last
+        # accessed when they were last updated.
+        1: """
+            CREATE TABLE entity_access (entity_type text, entity_id integer, accessed_at datetime, PRIMARY KEY (entity_type, entity_id));
+            INSERT OR IGNORE INTO entity_access
+                SELECT entity_type, entity_id, max(created_at) FROM entity GROUP BY entity_type, entity_id;
+
+            CREATE INDEX entity_activity_id ON entity(activity_id);
+            CREATE INDEX activity_note_id ON activity(note_id);
+        """,
+    }
+
+    # Cache eviction policy. Entities which have not been accessed for
+    # CACHE_MAX_AGE_DAYS are removed from the cache, only the most recent
+    # CACHE_MAX_ACTIVITIES_PER_ENTITY activities are kept for each entity,
+    # and the least recently accessed entities are removed while the cache
+    # is larger than CACHE_MAX_SIZE_MB. The eviction runs in the background
+    # at most once every CACHE_EVICTION_INTERVAL seconds.
+    CACHE_MAX_AGE_DAYS = 90
+    CACHE_MAX_ACTIVITIES_PER_ENTITY = 1000
+    CACHE_MAX_SIZE_MB = 250
+    CACHE_EVICTION_INTERVAL = 3600  # 1 hour
+
+    # The number of least recently accessed entities to remove at a time
+    # when the cache is larger than its maximum size.
+    CACHE_EVICTION_BATCH_SIZE = 20
+
+    # The number of free pages to reclaim at a time with an incremental
+    # vacuum, so that other connections are not locked out for long.
+    CACHE_VACUUM_PAGES = 1000
+
+    # Databases created before incremental vacuum was enabled need a full
+    # vacuum to enable it, which rewrites the whole file. This is only done
+    # for files up to this size, larger files keep reusing their free pages.
+    CACHE_VACUUM_CONVERT_MAX_SIZE_MB = 20
+
+    # The time of the last cache eviction for each cache path.
+    _cache_eviction_times = {}
+    _cache_eviction_lock = threading.Lock()
+
     # The amount of time to wait before triggering a cache dump and rescan
     # when a placeholder thumbnail is detected in the cache. This happens
     # when we end up caching thumbnail during the interim period after a
@@ -91,10 +227,58 @@ class ActivityStreamDataHandler(QtCore.QObject):
     # available.
     PLACEHOLDER_THUMBNAIL_HASHSUM = "d730702c967dcad5347efe885f0bd4344f6c568e"
 
+    # The sqlite journal mode to use for the cache database, or None to
+    # use the sqlite default. WAL mode lets reads and writes proceed
+    # concurrently and makes commits cheaper, but sqlite does not support
+    # it on network file systems, where the cache location may be. Only
+    # set it to "WAL" if the cache is known to be on a local disk.
+    DATABASE_JOURNAL_MODE = None
+
+    # The name of the codec used to encode the activity and note payloads
+    # stored in the database, see payload_codec.py. Payloads are stored
+    # with a marker identifying their codec, so the codec can be changed
+    # without invalidating existing databases.
+    PAYLOAD_CODEC = payload_codec.ZlibJsonPayloadCodec.name
+
+    # The amount of time to collect note threads that arrive from Shotgun
+    # before writing them to the cache database in a single transaction.
+    NOTE_WRITE_INTERVAL = 200  # 0.2 seconds
+
     # max number of items to pull from shotgun
     # typically the updates are incremental and hence smaller
     MAX_ITEMS_TO_GET_FROM_SG = 300
 
+    # max number of note conversations to pull from shotgun in a single
+    # background request. The conversations in a request are retrieved
+    # with one query per entity type rather than one query per note.
+    NOTE_THREAD_BATCH_SIZE = 100
+
+    # max size of the thumbnail images kept in memory, once loaded, so
+    # that they don't need to be requested again.
+    THUMBNAIL_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 64 MB
+
+    # fields to retrieve for the entities in a note conversation
+    NOTE_THREAD_FIELDS = {
+        "Note": [
+            "addressings_cc",
+            "addressings_to",
+            "user",
+            "content",
+            "body",
+            "note_links",
+            "user.HumanUser.image",
+            "user.ApiUser.image",
+            "user.ClientUser.image",
+            "created_at",
+            "client_note",
+            "read_by_current_user",
+            "subject",
+            "tasks",
+        ],
+        "Reply": ["content", "updated_at", "user"],
+        "Attachment": ["this_file", "image", "attachment_links"],
+    }
+
     # define the different types of thumbnails that can be
     # handled by the activity stream
     (
@@ -105,6 +289,7 @@ class ActivityStreamDataHandler(QtCore.QObject):
     ) = range(4)
 
     update_arrived = QtCore.Signal(list)
+    older_update_arrived = QtCore.Signal(list)
     note_arrived = QtCore.Signal(int, int)
     note_thread_arrived = QtCore.Signal(int, object)
     thumbnail_arrived = QtCore.Signal(dict)
@@ -136,6 +321,14 @@ class ActivityStreamDataHandler(QtCore.QObject):
         # set up a data retriever
         self._sg_data_retriever = None
 
+        # long lived database connections, one per thread, keyed by thread id.
+        # The database schema is only checked when the first connection is
+        # opened.
+        self._db_connections = {}
+        self._db_connections_lock = threading.Lock()
+        self._db_schema_checked = False
+        self._db_schema_lock = threading.Lock()
+
         # Offered as an option to rescan(), and if True will trigger
         # a forced requery of activity stream data during rescan.
         self._force_activity_stream_update = False
@@ -147,6 +340,22 @@ class ActivityStreamDataHandler(QtCore.QObject):
         self._rescan_timer.setInterval(self.RESCAN_TIMER_INTERVAL)
         self._rescan_timer.timeout.connect(self.__hard_refresh)
 
+        # Note threads waiting to be written to the cache database, as a list
+        # of (update_id, note_id, payload) tuples. These are written in batches
+        # when the timer fires, or before reading from the database.
+        self._pending_note_updates = []
+        self._note_write_timer = QtCore.QTimer(self)
+        self._note_write_timer.setSingleShot(True)
+        self._note_write_timer.setInterval(self.NOTE_WRITE_INTERVAL)
+        self._note_write_timer.timeout.connect(self.__write_pending_note_updates)
+
+        # Thumbnail images loaded so far, least recently used first, keyed
+        # like the thumbnail requests, see __request_thumbnail. These are
+        # kept when loading another entity, since the same users tend to
+        # show up in the activity streams of related entities.
+        self._thumbnail_cache = collections.OrderedDict()
+        self._thumbnail_cache_size = 0
+
         # set up defaults
         self.__reset()
 
@@ -239,6 +448,9 @@ class ActivityStreamDataHandler(QtCore.QObject):
             self._sg_data_retriever.work_failure.disconnect(self.__on_worker_failure)
             self._sg_data_retriever = None
 
+        self.__write_pending_note_updates()
+        self._close_db_connections()
+
     def __reset(self):
         """
         Reset all internal state.
@@ -254,8 +466,17 @@ class ActivityStreamDataHandler(QtCore.QObject):
 
         # tracking requests
         self._processing_id = None
+        self._older_processing_id = None
+        self._older_processing_limit = None
+
+        # paging back through the activity stream: the lowest activity id
+        # loaded so far, and whether there is no older activity in Shotgun.
+        self._lowest_activity_id = None
+        self._older_activity_exhausted = False
         self._thumb_map = {}
+        self._thumb_requests = {}
         self._note_map = {}
+        self._note_batch_map = {}
 
     ###########################################################################
     # public interface
@@ -274,8 +495,12 @@ class ActivityStreamDataHandler(QtCore.QObject):
 
         self._bundle.log_debug("Loading cached note data for %s" % note_id)
 
+        # make sure the database is up to date before reading from it
+        self.__write_pending_note_updates()
+
         # load note thread only
         note_data = self.__get_note_thread_data(note_id)
+        self.__db_record_entity_access("Note", note_id)
         if note_data:
             self._note_threads[note_id] = note_data
             self.note_thread_arrived.emit(note_id, note_data)
@@ -306,13 +531,18 @@ class ActivityStreamDataHandler(QtCore.QObject):
         time_before = time.time()
         self._bundle.log_debug("Loading cached data...")
 
+        # make sure the database is up to date before reading from it
+        self.__write_pending_note_updates()
+
         # load activity stream and associated notes
         (
             self._activity_data,
             self._note_threads,
+            self._lowest_activity_id,
         ) = self.__get_db_activity_stream_records(
             self._entity_type, self._entity_id, limit
         )
+        self.__db_record_entity_access(self._entity_type, self._entity_id)
         time_diff = time.time() - time_before
         self._bundle.log_debug(
             "...loading complete! %s "
@@ -324,6 +554,62 @@ class ActivityStreamDataHandler(QtCore.QObject):
         sorted_keys = sorted(self._activity_data.keys())
         return sorted_keys
 
+    def load_older_activity_data(self, limit=200):
+        """
+        Load a page of activity stream data older than the data currently
+        loaded for the entity.
+
+        The activity ids below the lowest id loaded so far are read from
+        the cache and returned straight away. Once the cache holds no older
+        data, the next page is requested from Shotgun instead, and the
+        older_update_arrived signal is emitted when it arrives.
+
+        :param limit: Max number of activity entries to load
+        :returns: A list of activity ids loaded from the cache.
+                  The data returned is always in ascending order with
+                  older items first.
+        """
+        if (
+            self._entity_type in (None, "Note")
+            or self._lowest_activity_id is None
+            or self._older_processing_id is not None
+            or self._older_activity_exhausted
+        ):
+            # nothing loaded to page back from, the page is already being
+            # fetched, or there is no older data
+            return []
+
+        self._bundle.log_debug(
+            "Loading max %s cached activity stream data entries "
+            "older than %s" % (limit, self._lowest_activity_id)
+        )
+
+        # make sure the database is up to date before reading from it
+        self.__write_pending_note_updates()
+
+        # keep reading until entries are found that are not duplicates of
+        # notes already loaded, or the cache runs out of older entries.
+        activities = {}
+        while not activities:
+            activities, notes, lowest_id = self.__get_db_activity_stream_records(
+                self._entity_type,
+                self._entity_id,
+                limit,
+                self._lowest_activity_id,
+                self.__get_activity_note_ids(),
+            )
+            if lowest_id is None:
+                # nothing older in the cache, fetch it from Shotgun
+                self.__request_older_activity_data(limit)
+                break
+
+            self._lowest_activity_id = lowest_id
+            self._activity_data.update(activities)
+            for note_id, note_data in notes.items():
+                self._note_threads.setdefault(note_id, note_data)
+
+        return sorted(activities.keys())
+
     def rescan(self, force_activity_stream_update=False):
         """
         Check for updates asynchronously.
@@ -335,6 +621,8 @@ class ActivityStreamDataHandler(QtCore.QObject):
         if self._sg_data_retriever is None:
             return
 
+        self.__schedule_cache_eviction()
+
         if self._entity_type == "Note":
 
             # refresh note
@@ -400,14 +688,16 @@ class ActivityStreamDataHandler(QtCore.QObject):
         :param entity_id: Shotgun id
         :param url: Thumbnail url
         """
-        uid = self._sg_data_retriever.request_thumbnail(
-            url, entity_type, entity_id, "image", load_image=True
+        self.__request_thumbnail(
+            url,
+            entity_type,
+            entity_id,
+            {
+                "activity_id": None,
+                "entity": {"type": entity_type, "id": entity_id},
+                "thumbnail_type": self.THUMBNAIL_USER,
+            },
         )
-        self._thumb_map[uid] = {
-            "activity_id": None,
-            "entity": {"type": entity_type, "id": entity_id},
-            "thumbnail_type": self.THUMBNAIL_USER,
-        }
 
     def request_attachment_thumbnail(self, activity_id, attachment_group_id, sg_data):
         """
@@ -418,15 +708,17 @@ class ActivityStreamDataHandler(QtCore.QObject):
         :param attachment_group_id: attachment group id
         :param sg_data: Shotgun data
         """
-        uid = self._sg_data_retriever.request_thumbnail(
-            sg_data["image"], sg_data["type"], sg_data["id"], "image", load_image=True
+        self.__request_thumbnail(
+            sg_data["image"],
+            sg_data["type"],
+            sg_data["id"],
+            {
+                "activity_id": activity_id,
+                "attachment_group_id": attachment_group_id,
+                "entity": {"type": sg_data["type"], "id": sg_data["id"]},
+                "thumbnail_type": self.THUMBNAIL_ATTACHMENT,
+            },
         )
-        self._thumb_map[uid] = {
-            "activity_id": activity_id,
-            "attachment_group_id": attachment_group_id,
-            "entity": {"type": sg_data["type"], "id": sg_data["id"]},
-            "thumbnail_type": self.THUMBNAIL_ATTACHMENT,
-        }
 
     def request_activity_thumbnails(self, activity_id):
         """
@@ -460,44 +752,22 @@ class ActivityStreamDataHandler(QtCore.QObject):
             # entry. This ie because when someone replies to a note, the
             # activity will be created by the reply-er but we still want to
             # display the thumbnail of the original author of the note.
-            if entity.get("user.HumanUser.image") and self._sg_data_retriever:
-                uid = self._sg_data_retriever.request_thumbnail(
-                    entity["user.HumanUser.image"],
-                    entity["user"]["id"],
-                    entity["user"]["type"],
-                    "image",
-                    load_image=True,
-                )
-                self._thumb_map[uid] = {
-                    "activity_id": activity_id,
-                    "thumbnail_type": self.THUMBNAIL_CREATED_BY,
-                }
-
-            elif entity.get("user.ClientUser.image") and self._sg_data_retriever:
-                uid = self._sg_data_retriever.request_thumbnail(
-                    entity["user.ClientUser.image"],
-                    entity["user"]["id"],
-                    entity["user"]["type"],
-                    "image",
-                    load_image=True,
-                )
-                self._thumb_map[uid] = {
-                    "activity_id": activity_id,
-                    "thumbnail_type": self.THUMBNAIL_CREATED_BY,
-                }
-
-            elif entity.get("user.ApiUser.image") and self._sg_data_retriever:
-                uid = self._sg_data_retriever.request_thumbnail(
-                    entity["user.ApiUser.image"],
-                    entity["user"]["id"],
-                    entity["user"]["type"],
-                    "image",
-                    load_image=True,
-                )
-                self._thumb_map[uid] = {
-                    "activity_id": activity_id,
-                    "thumbnail_type": self.THUMBNAIL_CREATED_BY,
-                }
+            for image_field in (
+                "user.HumanUser.image",
+                "user.ClientUser.image",
+                "user.ApiUser.image",
+            ):
+                if entity.get(image_field) and self._sg_data_retriever:
+                    self.__request_thumbnail(
+                        entity[image_field],
+                        entity["user"]["type"],
+                        entity["user"]["id"],
+                        {
+                            "activity_id": activity_id,
+                            "thumbnail_type": self.THUMBNAIL_CREATED_BY,
+                        },
+                    )
+                    break
 
             else:
                 self._bundle.log_debug("No thumbnail found for this note!")
@@ -505,38 +775,77 @@ class ActivityStreamDataHandler(QtCore.QObject):
         elif created_by and created_by.get("image") and self._sg_data_retriever:
             # for all other activities, the thumbnail reflects who
             # created the activity
-            uid = self._sg_data_retriever.request_thumbnail(
+            self.__request_thumbnail(
                 created_by["image"],
                 created_by["type"],
                 created_by["id"],
-                "image",
-                load_image=True,
+                {
+                    "activity_id": activity_id,
+                    "thumbnail_type": self.THUMBNAIL_CREATED_BY,
+                },
             )
-            self._thumb_map[uid] = {
-                "activity_id": activity_id,
-                "thumbnail_type": self.THUMBNAIL_CREATED_BY,
-            }
 
         # see if there is a thumbnail for the main object
         # e.g. for versions and thumbnails
         if entity and entity.get("image") and self._sg_data_retriever:
-            uid = self._sg_data_retriever.request_thumbnail(
-                entity["image"], entity["type"], entity["id"], "image", load_image=True
+            self.__request_thumbnail(
+                entity["image"],
+                entity["type"],
+                entity["id"],
+                {
+                    "activity_id": activity_id,
+                    "thumbnail_type": self.THUMBNAIL_ENTITY,
+                },
             )
-            self._thumb_map[uid] = {
-                "activity_id": activity_id,
-                "thumbnail_type": self.THUMBNAIL_ENTITY,
-            }
 
     ###########################################################################
     # sqlite database access methods
 
+    def _get_db_connection(self):
+        """
+        Returns the database connection for the current thread, opening
+        it if needed. The connection is kept open and reused by subsequent
+        calls from the same thread, until the connections are closed with
+        :meth:`_close_db_connections`.
+
+        :returns: :class:`_DbConnection` for the current thread.
+        """
+        thread_id = threading.get_ident()
+        with self._db_connections_lock:
+            db = self._db_connections.get(thread_id)
+
+        if db is None:
+            db = _DbConnection(self._init_db())
+            with self._db_connections_lock:
+                self._db_connections[thread_id] = db
+
+        return db
+
+    def _close_db_connections(self):
+        """
+        Closes all open database connections. Connections which are in
+        use by other threads are closed once their current query is done,
+        and those threads open a new connection on their next query.
+        """
+        with self._db_connections_lock:
+            connections = list(self._db_connections.values())
+            self._db_connections = {}
+
+        for db in connections:
+            try:
+                db.close()
+            except Exception:
+                self._bundle.log_exception("Could not close database handle")
+
     def _init_db(self):
         """
-        Sets up the database if it doesn't exist.
-        Returns a handle that must be closed.
+        Opens a new connection to the database, setting up the database
+        if it doesn't exist. Returns a handle that must be closed.
         """
-        connection = sqlite3.connect(self._cache_path)
+        # the connection may be closed from a different thread than it was
+        # opened from, when all connections are closed. It is otherwise only
+        # used by the thread that opened it.
+        connection = sqlite3.connect(self._cache_path, check_same_thread=False)
 
         # this is to handle unicode properly - make sure that sqlite returns
         # str objects for TEXT fields rather than unicode. Note that any unicode
@@ -549,31 +858,28 @@ class ActivityStreamDataHandler(QtCore.QObject):
 
         c = connection.cursor()
         try:
-
-            # get a list of tables in the current database
-            ret = c.execute("SELECT name FROM main.sqlite_master WHERE type='table';")
-            table_names = [x[0] for x in ret.fetchall()]
-
-            if len(table_names) == 0:
-                self._bundle.log_debug("Creating schema in sqlite db.")
-
-                # we have a brand new database. Create all tables and indices
-                c.executescript("""
-                    CREATE TABLE entity (entity_type text, entity_id integer, activity_id integer, created_at datetime);
-
-                    CREATE TABLE activity (activity_id integer, note_id integer default null, payload blob, created_at datetime);
-
-                    CREATE TABLE note (note_id integer, payload blob, created_at datetime);
-
-                    CREATE INDEX entity_1 ON entity(entity_type, entity_id, created_at);
-                    CREATE INDEX entity_2 ON entity(entity_type, entity_id, activity_id, created_at);
-
-                    CREATE INDEX activity_1 ON activity(activity_id);
-                    CREATE INDEX activity_2 ON activity(activity_id, note_id);
-
-                    CREATE INDEX note_1 ON activity(note_id);
-                    """)
-                connection.commit()
+            # enable incremental vacuum to reclaim space after cache eviction.
+            # This only takes effect if the database is new, and must be set
+            # before the journal mode, which initializes the database file.
+            c.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+
+            if self.DATABASE_JOURNAL_MODE:
+                # the journal mode is stored in the database file, other
+                # settings only apply to this connection.
+                ret = c.execute("PRAGMA journal_mode=%s;" % self.DATABASE_JOURNAL_MODE)
+                self._bundle.log_debug(
+                    "Activity stream cache journal mode: %s" % ret.fetchone()[0]
+                )
+            # the database is a cache that can be rebuilt, so don't wait for
+            # the data to be synced to disk on every commit.
+            c.execute("PRAGMA synchronous=NORMAL;")
+            c.execute("PRAGMA temp_store=MEMORY;")
+
+            # only one connection should check and update the schema
+            with self._db_schema_lock:
+                if not self._db_schema_checked:
+                    self.__update_db_schema(connection, c)
+                    self._db_schema_checked = True
         except:
             connection.close()
             c = None
@@ -585,6 +891,55 @@ class ActivityStreamDataHandler(QtCore.QObject):
 
         return connection
 
+    def __update_db_schema(self, connection, cursor):
+        """
+        Creates the database schema if the database is new, or migrates
+        the schema of an existing database to the current version.
+
+        :param connection: Database connection
+        :param cursor: Database cursor
+        """
+        # get a list of tables in the current database
+        ret = cursor.execute("SELECT name FROM main.sqlite_master WHERE type='table';")
+        table_names = [x[0] for x in ret.fetchall()]
+
+        if len(table_names) == 0:
+            self._bundle.log_debug("Creating schema in sqlite db.")
+
+            # we have a brand new database. Create all tables and indices
+            cursor.executescript(
+                "BEGIN; %s PRAGMA user_version = %d; COMMIT;"
+                % (self.DATABASE_SCHEMA, self.DATABASE_SCHEMA_VERSION)
+            )
+            return
+
+        version = cursor.execute("PRAGMA user_version;").fetchone()[0]
+        if version > self.DATABASE_SCHEMA_VERSION:
+            self._bundle.log_warning(
+                "Activity stream cache database %s has schema version %s, newer "
+                "than the supported version %s."
+                % (self._cache_path, version, self.DATABASE_SCHEMA_VERSION)
+            )
+            return
+
+        while version < self.DATABASE_SCHEMA_VERSION:
+            self._bundle.log_debug(
+                "Migrating sqlite db schema from version %s to %s."
+                % (version, version + 1)
+            )
+            # each migration is applied in its own transaction, along with
+            # the schema version update.
+            try:
+                cursor.executescript(
+                    "BEGIN; %s PRAGMA user_version = %d; COMMIT;"
+                    % (self.DATABASE_MIGRATIONS[version], version + 1)
+                )
+            except:
+                if connection.in_transaction:
+                    connection.rollback()
+                raise
+            version += 1
+
     @_db_connect
     def __get_note_thread_data(self, connection, cursor, note_id):
         """
@@ -601,7 +956,7 @@ class ActivityStreamDataHandler(QtCore.QObject):
             res = list(res)
             if len(res) > 0:
                 note_payload = res[0][0]
-                note_data = sgtk.util.pickle.loads(bytes(note_payload))
+                note_data = payload_codec.decode_payload(note_payload)
         except:
             # supress and continue
             self._bundle.log_exception(
@@ -613,7 +968,14 @@ class ActivityStreamDataHandler(QtCore.QObject):
 
     @_db_connect
     def __get_db_activity_stream_records(
-        self, connection, cursor, entity_type, entity_id, limit
+        self,
+        connection,
+        cursor,
+        entity_type,
+        entity_id,
+        limit,
+        before_id=None,
+        skip_note_ids=None,
     ):
         """
         Returns the cached activity stream for a particular record.
@@ -623,34 +985,48 @@ class ActivityStreamDataHandler(QtCore.QObject):
         :param entity_type: Entity type to load
         :param entity_id: Entity id to load
         :param limit: Max records to load
+        :param before_id: If set, only records with a lower activity id
+                          are loaded
+        :param skip_note_ids: Ids of notes already loaded, whose activity
+                              records are skipped
+        :returns: tuple with the activities and notes loaded, and the
+                  lowest activity id read, including skipped records,
+                  or None if no records were read.
         """
         activities = {}
         notes = {}
+        skip_note_ids = skip_note_ids or set()
+        lowest_id = None
+        if before_id is None:
+            # activity ids are positive
+            before_id = sys.maxsize
         try:
             # get the activity payload for the first X entities
-            # if they have a note thread associated, bring that in too
+            # if they have a note thread associated, bring that in too.
+            # Ordering by the entity table's activity id lets the query
+            # walk the entity key backwards and stop at the limit, rather
+            # than sorting all of the entity's activities.
             res = cursor.execute(
                 """
                 SELECT a.activity_id, a.payload, n.note_id, n.payload
                 FROM activity a
                 INNER JOIN entity e on e.activity_id = a.activity_id
                 LEFT OUTER JOIN note n on a.note_id = n.note_id
-                WHERE e.entity_type=? and e.entity_id=?
-                order by a.activity_id desc
+                WHERE e.entity_type=? and e.entity_id=? and e.activity_id<?
+                order by e.activity_id desc
                 LIMIT ?
                 """,
-                (entity_type, entity_id, limit),
+                (entity_type, entity_id, before_id, limit),
             )
 
             for data in res:
                 activity_id = data[0]
+                lowest_id = activity_id
                 activity_payload = data[1]
                 note_id = data[2]
                 note_payload = data[3]
 
-                # we're receiving a buffer object, so we should extract the bytes from
-                # it. In Python 2, bytes == str
-                activity_data = sgtk.util.pickle.loads(bytes(activity_payload))
+                activity_data = payload_codec.decode_payload(activity_payload)
 
                 # if the activity links to a note and this note
                 # has already been registered, skip the activity altogether.
@@ -659,17 +1035,16 @@ class ActivityStreamDataHandler(QtCore.QObject):
                 # several note-reply items. Because we are going through the
                 # sql recordset in descending id order, all duplicate
                 # records after the first discovered (most recent) are
-                # discarded
+                # discarded, as are records for notes loaded previously.
                 pe = activity_data.get("primary_entity")
-                if pe and pe.get("type") == "Note" and pe.get("id") in notes:
-                    continue
+                if pe and pe.get("type") == "Note":
+                    if pe.get("id") in notes or pe.get("id") in skip_note_ids:
+                        continue
 
                 activities[activity_id] = activity_data
 
                 if note_id:
-                    # we're receiving a buffer object, so we should extract the bytes from
-                    # it. In Python 2, bytes == str
-                    notes[note_id] = sgtk.util.pickle.loads(bytes(note_payload))
+                    notes[note_id] = payload_codec.decode_payload(note_payload)
 
                 # now for items where there is just the note created
                 # and no note updates yet, we haevn't pulled down
@@ -694,70 +1069,64 @@ class ActivityStreamDataHandler(QtCore.QObject):
                 "from cache database %s" % self._cache_path
             )
 
-        return (activities, notes)
+        return (activities, notes, lowest_id)
 
     @_db_connect
     def __db_insert_activity_updates(
-        self, connection, cursor, entity_type, entity_id, events
+        self, connection, cursor, entity_type, entity_id, events, payloads=None
     ):
         """
         Adds a number of records to the activity db. If they
-        already exist, they are not re-added
+        already exist, they are not re-added, unless an update
+        of the activity stream is being forced.
+
+        All records are added in a single transaction.
 
         :param connection: Database connection (coming from the decorator)
         :param cursor: Database cursor (coming from the decorator)
         :param entity_type: Entity type to process
         :param entity_id: Entity id to process
         :param events: Events to insert
+        :param payloads: Optional list of encoded payloads for the events, as
+                         returned by :meth:`_encode_payload`. If None, the
+                         events are encoded here.
         """
         self._bundle.log_debug("Updating database with %s new events" % len(events))
         try:
-            for event in events:
-                activity_id = event["id"]
-                payload = sgtk.util.pickle.dumps(event)
-                if isinstance(payload, str):
-                    payload = payload.encode("utf-8")
-                blob = sqlite3.Binary(payload)
-
-                # first insert event
-                if self._force_activity_stream_update:
-                    sql = """
-                        INSERT OR REPLACE INTO activity(activity_id, payload, created_at)
-                        SELECT ?, ?, datetime('now')
-                    """
-                    params = (activity_id, blob)
-                else:
-                    sql = """
-                        INSERT INTO activity(activity_id, payload, created_at)
-                        SELECT ?, ?, datetime('now')
-                        WHERE NOT EXISTS(SELECT activity_id FROM activity WHERE activity_id = ?);
-                    """
-                    params = (activity_id, blob, activity_id)
-
-                cursor.execute(sql, params)
-                if self._force_activity_stream_update:
-                    sql = """
-                        INSERT OR REPLACE INTO entity (entity_type, entity_id, activity_id, created_at)
-                        SELECT ?, ?, ?, datetime('now')
-                    """
-                    params = (entity_type, entity_id, activity_id)
-                else:
-                    # now insert entity record
-                    sql = """
-                        INSERT INTO entity (entity_type, entity_id, activity_id, created_at)
-                        SELECT ?, ?, ?, datetime('now')
-                        WHERE NOT EXISTS(SELECT entity_id FROM entity WHERE entity_type = ? and entity_id = ? and activity_id = ?);
-                    """
-                    params = (
-                        entity_type,
-                        entity_id,
-                        activity_id,
-                        entity_type,
-                        entity_id,
-                        activity_id,
-                    )
+            if payloads is None:
+                payloads = [self._encode_payload(event) for event in events]
+
+            activity_params = [
+                (event["id"], sqlite3.Binary(payload))
+                for (event, payload) in zip(events, payloads)
+            ]
+
+            if self._force_activity_stream_update:
+                # replace the payload of existing records, keeping the link
+                # to their note threads
+                cursor.executemany(
+                    "UPDATE activity SET payload = ?, created_at = datetime('now') "
+                    "WHERE activity_id = ?",
+                    [(blob, activity_id) for (activity_id, blob) in activity_params],
+                )
 
-                cursor.execute(sql, params)
+            # first insert events
+            cursor.executemany(
+                """
+                INSERT OR IGNORE INTO activity(activity_id, payload, created_at)
+                VALUES (?, ?, datetime('now'))
+                """,
+                activity_params,
+            )
+
+            # now insert entity records
+            cursor.executemany(
+                """
+                INSERT OR IGNORE INTO entity (entity_type, entity_id, activity_id, created_at)
+                VALUES (?, ?, ?, datetime('now'))
+                """,
+                [(entity_type, entity_id, event["id"]) for event in events],
+            )
 
             connection.commit()
         except:
@@ -772,91 +1141,568 @@ class ActivityStreamDataHandler(QtCore.QObject):
         self._bundle.log_debug("...update complete")
 
     @_db_connect
-    def __db_insert_note_update(self, connection, cursor, update_id, note_id, data):
+    def __db_insert_note_updates(self, connection, cursor, note_updates):
         """
-        update the sql db with note data
+        update the sql db with note data. All notes are updated
+        in a single transaction.
 
         :param connection: Database connection (coming from the decorator)
         :param cursor: Database cursor (coming from the decorator)
-        :param update_id: Activity stream id to update. If None, only
-                          the note will be rebuilt in the database.
-        :param note_id: Id of note to store
-        :param data: data to store
-
+        :param note_updates: List of (update_id, note_id, payload) tuples,
+                             where update_id is the activity stream id to
+                             update, or None to only rebuild the note in the
+                             database, and payload is the encoded note data
+                             as returned by :meth:`_encode_payload`.
         """
-        self._bundle.log_debug(
-            "Adding note %s to database, "
-            "linking it to event %s" % (note_id, update_id)
-        )
+        self._bundle.log_debug("Adding %s notes to database" % len(note_updates))
         try:
+            # insert our new blobs, replacing any existing records
+            cursor.executemany(
+                """INSERT OR REPLACE INTO note(note_id, payload, created_at)
+                   VALUES(?, ?, datetime('now'))""",
+                [
+                    (note_id, sqlite3.Binary(payload))
+                    for (_, note_id, payload) in note_updates
+                ],
+            )
 
-            # first pickle the note data
-            payload = sgtk.util.pickle.dumps(data)
-            if isinstance(payload, str):
-                payload = payload.encode("utf-8")
-            blob = sqlite3.Binary(payload)
+            # and finally update the event records to point at the notes
+            cursor.executemany(
+                """UPDATE activity
+                   SET note_id = ?
+                   WHERE activity_id = ?
+                """,
+                [
+                    (note_id, update_id)
+                    for (update_id, note_id, _) in note_updates
+                    if update_id is not None
+                ],
+            )
 
-            # first delete any existing record
-            cursor.execute("DELETE FROM note where note_id = ?", (note_id,))
+            connection.commit()
 
-            # now insert our new blob
-            sql = """INSERT INTO note(note_id, payload, created_at)
-                     VALUES(?, ?, datetime('now'))"""
+        except:
+            # supress and continue
+            self._bundle.log_exception(
+                "Could not add note data " "to cache database %s" % self._cache_path
+            )
 
-            cursor.execute(sql, (note_id, blob))
+    @_db_connect
+    def __db_record_entity_access(self, connection, cursor, entity_type, entity_id):
+        """
+        Records that the cached data for an entity was accessed, so that
+        it is kept in the cache over data that was accessed less recently.
 
-            if update_id is not None:
+        :param connection: Database connection (coming from the decorator)
+        :param cursor: Database cursor (coming from the decorator)
+        :param entity_type: Entity type that was accessed
+        :param entity_id: Entity id that was accessed
+        """
+        try:
+            cursor.execute(
+                """INSERT OR REPLACE INTO entity_access(entity_type, entity_id, accessed_at)
+                   VALUES(?, ?, datetime('now'))""",
+                (entity_type, entity_id),
+            )
+            connection.commit()
+        except:
+            # supress and continue
+            self._bundle.log_exception(
+                "Could not update cache database %s" % self._cache_path
+            )
 
-                # and finally update the event record to point at this note
-                sql = """UPDATE activity
-                         SET note_id = ?
-                         WHERE activity_id = ?
-                      """
+    @_db_connect
+    def __db_evict_cache(self, connection, cursor):
+        """
+        Removes data from the cache database according to the eviction
+        policy, and reclaims the space that was used by the removed data.
+        Each step is committed separately, to avoid locking the database
+        for long.
+
+        :param connection: Database connection (coming from the decorator)
+        :param cursor: Database cursor (coming from the decorator)
+        :returns: The number of entities removed from the cache.
+        """
 
-                cursor.execute(sql, (note_id, update_id))
+        def evict_entities(entities):
+            cursor.executemany(
+                "DELETE FROM entity WHERE entity_type = ? AND entity_id = ?",
+                entities,
+            )
+            cursor.executemany(
+                "DELETE FROM entity_access WHERE entity_type = ? AND entity_id = ?",
+                entities,
+            )
+            connection.commit()
 
+        def evict_orphans():
+            # remove activities that are no longer linked to any entity, and
+            # notes that are no longer linked to any activity and were not
+            # accessed directly.
+            cursor.execute("""DELETE FROM activity WHERE NOT EXISTS (
+                       SELECT 1 FROM entity e WHERE e.activity_id = activity.activity_id
+                   )""")
+            cursor.execute("""DELETE FROM note WHERE NOT EXISTS (
+                       SELECT 1 FROM activity a WHERE a.note_id = note.note_id
+                   ) AND NOT EXISTS (
+                       SELECT 1 FROM entity_access ea
+                       WHERE ea.entity_type = 'Note' AND ea.entity_id = note.note_id
+                   )""")
             connection.commit()
 
-        except:
+        def get_size_mb():
+            # the size of the data in the database, excluding free pages
+            page_size = cursor.execute("PRAGMA page_size;").fetchone()[0]
+            page_count = cursor.execute("PRAGMA page_count;").fetchone()[0]
+            free_count = cursor.execute("PRAGMA freelist_count;").fetchone()[0]
+            return (page_count - free_count) * page_size / (1024.0 * 1024.0)
+
+        num_evicted = 0
+        try:
+            # remove entities that have not been accessed recently
+            entities = cursor.execute(
+                """SELECT entity_type, entity_id FROM entity_access
+                   WHERE accessed_at < datetime('now', ?)""",
+                ("-%d days" % self.CACHE_MAX_AGE_DAYS,),
+            ).fetchall()
+            evict_entities(entities)
+            num_evicted += len(entities)
+
+            # only keep the most recent activities for each entity
+            entities = cursor.execute(
+                """SELECT entity_type, entity_id FROM entity
+                   GROUP BY entity_type, entity_id HAVING count(*) > ?""",
+                (self.CACHE_MAX_ACTIVITIES_PER_ENTITY,),
+            ).fetchall()
+            cursor.executemany(
+                """DELETE FROM entity WHERE entity_type = ? AND entity_id = ?
+                   AND activity_id < (
+                       SELECT activity_id FROM entity
+                       WHERE entity_type = ? AND entity_id = ?
+                       ORDER BY activity_id DESC LIMIT 1 OFFSET ?
+                   )""",
+                [
+                    (
+                        entity_type,
+                        entity_id,
+                        entity_type,
+                        entity_id,
+                        self.CACHE_MAX_ACTIVITIES_PER_ENTITY - 1,
+                    )
+                    for (entity_type, entity_id) in entities
+                ],
+            )
+            connection.commit()
+            evict_orphans()
+
+            # remove the least recently accessed entities until the cache
+            # is small enough
+            while get_size_mb() > self.CACHE_MAX_SIZE_MB:
+                entities = cursor.execute(
+                    """SELECT entity_type, entity_id FROM entity_access
+                       ORDER BY accessed_at LIMIT ?""",
+                    (self.CACHE_EVICTION_BATCH_SIZE,),
+                ).fetchall()
+                if not entities:
+                    break
+                evict_entities(entities)
+                evict_orphans()
+                num_evicted += len(entities)
+
+            # finally reclaim the free space, a few pages at a time.
+            auto_vacuum = cursor.execute("PRAGMA auto_vacuum;").fetchone()[0]
+            if auto_vacuum == 2:
+                free_count = cursor.execute("PRAGMA freelist_count;").fetchone()[0]
+                while free_count > 0:
+                    # the pragma only frees a single page per step when run
+                    # with execute, so run it as a script, in its own
+                    # transaction.
+                    cursor.executescript(
+                        "PRAGMA incremental_vacuum(%d);" % self.CACHE_VACUUM_PAGES
+                    )
+                    prev_free_count = free_count
+                    free_count = cursor.execute("PRAGMA freelist_count;").fetchone()[0]
+                    if free_count >= prev_free_count:
+                        break
+            elif (
+                os.path.getsize(self._cache_path)
+                <= self.CACHE_VACUUM_CONVERT_MAX_SIZE_MB * 1024 * 1024
+            ):
+                # databases created before incremental vacuum was enabled
+                # need a full vacuum to enable it.
+                self._bundle.log_debug(
+                    "Enabling incremental vacuum for %s" % self._cache_path
+                )
+                cursor.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+                cursor.execute("VACUUM;")
+            else:
+                self._bundle.log_debug(
+                    "Not enabling incremental vacuum for large cache %s"
+                    % self._cache_path
+                )
+
+            # and shrink the journal if the database is in WAL mode
+            cursor.execute("PRAGMA wal_checkpoint(TRUNCATE);").fetchall()
+        except Exception:
             # supress and continue
             self._bundle.log_exception(
-                "Could not add note data " "to cache database %s" % self._cache_path
+                "Could not evict data from cache database %s" % self._cache_path
             )
 
+        return num_evicted
+
+    def __write_pending_note_updates(self):
+        """
+        Writes the note threads waiting to be written to the database.
+        """
+        self._note_write_timer.stop()
+
+        if self._pending_note_updates:
+            note_updates = self._pending_note_updates
+            self._pending_note_updates = []
+            self.__db_insert_note_updates(note_updates)
+
     ###########################################################################
     # private methods
 
+    def _encode_payload(self, data):
+        """
+        Encodes data to be stored in the database, using the PAYLOAD_CODEC.
+
+        :param data: data to encode, with timestamps converted to unix time
+        :returns: encoded data as bytes
+        """
+        return payload_codec.encode_payload(
+            data, payload_codec.get_codec(self.PAYLOAD_CODEC)
+        )
+
+    def __get_activity_note_ids(self):
+        """
+        Returns the ids of the notes that the loaded activities are about.
+
+        :returns: set of note ids
+        """
+        note_ids = set()
+        for update in self._activity_data.values():
+            note_id = self.__get_update_note_id(update)
+            if note_id is not None:
+                note_ids.add(note_id)
+        return note_ids
+
+    def __get_update_note_id(self, update):
+        """
+        Returns the id of the note an activity stream update is about.
+
+        :param update: activity stream update
+        :returns: note id, or None if the update is not note related
+        """
+        if (
+            update["update_type"] == "create"
+            and update["primary_entity"]["type"] == "Note"
+        ) or update["update_type"] == "create_reply":
+            return update["primary_entity"]["id"]
+        return None
+
+    def __request_note_threads(self, note_updates):
+        """
+        Requests the note conversations for activity stream updates from
+        Shotgun, in batches of NOTE_THREAD_BATCH_SIZE notes. The note_arrived
+        signal is emitted for each update when its conversation arrives.
+
+        :param note_updates: list of (update_id, note_id) tuples, with
+                             the activity stream id of each note update
+                             and the note id to fetch the conversation for
+        """
+        # several updates can be about the same note, e.g. a note and its
+        # replies, the conversation only needs to be fetched once for them.
+        update_ids_by_note = {}
+        for update_id, note_id in note_updates:
+            update_ids_by_note.setdefault(note_id, []).append(update_id)
+
+        note_ids = list(update_ids_by_note.keys())
+        for start in range(0, len(note_ids), self.NOTE_THREAD_BATCH_SIZE):
+            batch = note_ids[start : start + self.NOTE_THREAD_BATCH_SIZE]
+            self._bundle.log_debug("Requesting async data for note ids %s" % batch)
+            note_uid = self._sg_data_retriever.execute_method(
+                self._get_note_threads, {"note_ids": batch}
+            )
+
+            # map the unique id with the update ids so we can merge the
+            # two later as the data arrives
+            self._note_batch_map[note_uid] = dict(
+                (note_id, update_ids_by_note[note_id]) for note_id in batch
+            )
+
+    def __process_note_thread(self, update_id, note_id, note_thread, payload):
+        """
+        Caches a note conversation that arrived from Shotgun and emits the
+        note_arrived signal.
+
+        :param update_id: activity stream id of the note update, or None
+        :param note_id: note id of the conversation
+        :param note_thread: list of entities in the note conversation
+        :param payload: the encoded note conversation for the database
+        """
+        # queue the note to be written to the database with any other
+        # notes that arrive shortly
+        self._pending_note_updates.append((update_id, note_id, payload))
+        if not self._note_write_timer.isActive():
+            self._note_write_timer.start()
+
+        # and update our dictionary of note conversations
+        self._note_threads[note_id] = note_thread
+
+        # emit signal
+        self.note_arrived.emit(update_id, note_id)
+
+    def __request_older_activity_data(self, limit):
+        """
+        Requests the page of activity stream data below the lowest activity
+        id loaded from Shotgun.
+
+        :param limit: Max number of activity entries to fetch
+        """
+        if self._sg_data_retriever is None:
+            return
+
+        data = {
+            "entity_type": self._entity_type,
+            "entity_id": self._entity_id,
+            "highest_id": None,
+            "lowest_id": self._lowest_activity_id,
+            "limit": limit,
+        }
+        self._older_processing_limit = limit
+        self._older_processing_id = self._sg_data_retriever.execute_method(
+            self._get_activity_stream, data
+        )
+
+    def __request_thumbnail(self, url, entity_type, entity_id, thumb_info):
+        """
+        Requests a thumbnail asynchronously, and emits a thumbnail_arrived
+        signal with the thumbnail image once it is available.
+
+        Requests are keyed by the entity and the url, without its query
+        string, which holds a signature that changes over time. A thumbnail
+        that was loaded before is emitted straight away from the memory
+        cache, and a thumbnail that has already been requested is not
+        requested again: its request emits one signal per requester.
+
+        :param url: Thumbnail url
+        :param entity_type: Shotgun entity type the thumbnail is for
+        :param entity_id: Shotgun id
+        :param thumb_info: Dictionary describing the requester, emitted in
+                           the thumbnail_arrived signal with the image
+        """
+        key = (entity_type, entity_id, (url or "").split("?")[0])
+
+        if key in self._thumbnail_cache:
+            self._thumbnail_cache.move_to_end(key)
+            image, thumb_path, _ = self._thumbnail_cache[key]
+            self.__emit_thumbnail(thumb_info, image, thumb_path)
+            return
+
+        uid = self._thumb_requests.get(key)
+        if uid is None:
+            uid = self._sg_data_retriever.request_thumbnail(
+                url, entity_type, entity_id, "image", load_image=True
+            )
+            self._thumb_requests[key] = uid
+            self._thumb_map[uid] = {"key": key, "requesters": []}
+
+        self._thumb_map[uid]["requesters"].append(thumb_info)
+
+    def __cache_thumbnail(self, key, image, thumb_path):
+        """
+        Adds a thumbnail image to the memory cache, evicting the least
+        recently used images beyond THUMBNAIL_CACHE_MAX_BYTES.
+
+        :param key: Thumbnail request key
+        :param image: QImage with thumbnail data
+        :param thumb_path: Path to the thumbnail on disk
+        """
+        if key in self._thumbnail_cache:
+            self._thumbnail_cache_size -= self._thumbnail_cache.pop(key)[2]
+
+        size = image.bytesPerLine() * image.height()
+        self._thumbnail_cache[key] = (image, thumb_path, size)
+        self._thumbnail_cache_size += size
+
+        while self._thumbnail_cache_size > self.THUMBNAIL_CACHE_MAX_BYTES:
+            _, (_, _, evicted_size) = self._thumbnail_cache.popitem(last=False)
+            self._thumbnail_cache_size -= evicted_size
+
+    def __emit_thumbnail(self, thumb_info, image, thumb_path):
+        """
+        Emits the thumbnail_arrived signal for a thumbnail requester.
+
+        :param thumb_info: Dictionary describing the requester
+        :param image: QImage with thumbnail data
+        :param thumb_path: Path to the thumbnail on disk
+        """
+        signal_payload = copy.copy(thumb_info)
+        signal_payload["image"] = image
+        signal_payload["thumb_path"] = thumb_path
+        self.thumbnail_arrived.emit(signal_payload)
+
+    def __schedule_cache_eviction(self):
+        """
+        Starts the cache eviction in the background, unless it has run
+        recently.
+        """
+        last_eviction_time = self._cache_eviction_times.get(self._cache_path, 0)
+        if time.time() - last_eviction_time < self.CACHE_EVICTION_INTERVAL:
+            return
+
+        self._sg_data_retriever.execute_method(self._evict_cache, {})
+
+    def _evict_cache(self, sg, data):
+        """
+        Async callback called by the data retriever.
+        Removes old data from the cache database, see __db_evict_cache.
+
+        Note: This runs in a different thread and cannot access
+        any QT UI components.
+
+        :param sg: Shotgun instance
+        :param data: data dictionary passed in from _submit()
+        :returns: The number of entities removed from the cache.
+        """
+        # several evictions may have been scheduled before the first one
+        # ran, make sure that only one of them runs.
+        with self._cache_eviction_lock:
+            last_eviction_time = self._cache_eviction_times.get(self._cache_path, 0)
+            if time.time() - last_eviction_time < self.CACHE_EVICTION_INTERVAL:
+                return 0
+            self._cache_eviction_times[self._cache_path] = time.time()
+
+        time_before = time.time()
+        num_evicted = self.__db_evict_cache()
+        self._bundle.log_debug(
+            "Evicted %s entities from the activity stream cache in %4fs"
+            % (num_evicted, time.time() - time_before)
+        )
+        return num_evicted
+
     def _get_note_thread(self, sg, data):
         """
         Async callback called by the data retriever.
         Retrieves the entire note conversation for a given note
+
+        Note: This runs in a different thread and cannot access
+        any QT UI components.
+
+        :param sg: Shotgun instance
+        :param data: data dictionary passed in from _submit()
+        :returns: dictionary with the note conversation, with time stamps
+                  converted to unix time, in the "note_thread" key and
+                  its encoded data in the "payload" key.
         """
         note_id = data["note_id"]
 
-        entity_fields = {
-            "Note": [
-                "addressings_cc",
-                "addressings_to",
-                "user",
-                "content",
-                "body",
-                "note_links",
-                "user.HumanUser.image",
-                "user.ApiUser.image",
-                "user.ClientUser.image",
-                "created_at",
-                "client_note",
-                "read_by_current_user",
-                "subject",
-                "tasks",
-            ],
-            "Reply": ["content", "updated_at", "user"],
-            "Attachment": ["this_file", "image", "attachment_links"],
-        }
+        sg_data = sg.note_thread_read(note_id, self.NOTE_THREAD_FIELDS)
 
-        sg_data = sg.note_thread_read(note_id, entity_fields)
+        # Convert time stamps and encode the data for the database here, so
+        # that it doesn't need to be done in the main thread.
+        sg_data = self.__convert_timestamp_r(sg_data)
 
-        return sg_data
+        return {"note_thread": sg_data, "payload": self._encode_payload(sg_data)}
+
+    def _get_note_threads(self, sg, data):
+        """
+        Async callback called by the data retriever.
+        Retrieves the entire note conversations for several notes, with a
+        single query per entity type, and splits the results into the same
+        note conversations that note_thread_read() returns.
+
+        Note: This runs in a different thread and cannot access
+        any QT UI components.
+
+        :param sg: Shotgun instance
+        :param data: data dictionary passed in from _submit()
+        :returns: dictionary with a list of dictionaries in the "note_threads"
+                  key, one per note, holding the note id in the "note_id" key,
+                  the note conversation, with time stamps converted to unix
+                  time, in the "note_thread" key and its encoded data in the
+                  "payload" key.
+        """
+        note_ids = data["note_ids"]
+        notes = [{"type": "Note", "id": note_id} for note_id in note_ids]
+        default_fields = ["created_at", "created_by"]
+        user_image_fields = [
+            "user.HumanUser.image",
+            "user.ApiUser.image",
+            "user.ClientUser.image",
+        ]
+
+        note_data = dict(
+            (note["id"], note)
+            for note in sg.find(
+                "Note",
+                [["id", "in", note_ids]],
+                self.NOTE_THREAD_FIELDS["Note"] + default_fields,
+            )
+        )
+
+        replies_and_attachments = dict((note_id, []) for note_id in note_ids)
+
+        for reply in sg.find(
+            "Reply",
+            [["entity", "in", notes]],
+            self.NOTE_THREAD_FIELDS["Reply"]
+            + default_fields
+            + user_image_fields
+            + ["entity"],
+        ):
+            note_id = reply.pop("entity")["id"]
+            # like note_thread_read, the reply user holds the thumbnail
+            # of the user in an additional image field
+            user_images = dict(
+                (field, reply.pop(field, None)) for field in user_image_fields
+            )
+            if reply.get("user"):
+                reply["user"]["image"] = user_images.get(
+                    "user.%s.image" % reply["user"]["type"]
+                )
+            replies_and_attachments[note_id].append(reply)
+
+        for attachment in sg.find(
+            "Attachment",
+            [["attachment_links", "in", notes]],
+            self.NOTE_THREAD_FIELDS["Attachment"] + default_fields,
+        ):
+            for link in attachment["attachment_links"] or []:
+                if link["type"] == "Note" and link["id"] in replies_and_attachments:
+                    replies_and_attachments[link["id"]].append(attachment)
+
+        note_threads = []
+        for note_id in note_ids:
+            if note_id in note_data:
+                note_thread = [note_data[note_id]] + replies_and_attachments[note_id]
+            else:
+                # the note has been deleted or can't be seen by the user
+                note_thread = []
+
+            # Convert time stamps and encode the data for the database here,
+            # so that it doesn't need to be done in the main thread.
+            note_thread = self.__convert_timestamp_r(note_thread)
+
+            # the note comes first, followed by the replies and attachments
+            # in creation order
+            note_thread[1:] = sorted(
+                note_thread[1:],
+                key=lambda entity: (entity.get("created_at") or 0, entity["id"]),
+            )
+
+            note_threads.append(
+                {
+                    "note_id": note_id,
+                    "note_thread": note_thread,
+                    "payload": self._encode_payload(note_thread),
+                }
+            )
+
+        return {"note_threads": note_threads}
 
     def _get_activity_stream(self, sg, data):
         """
@@ -865,11 +1711,16 @@ class ActivityStreamDataHandler(QtCore.QObject):
         any QT UI components.
 
         :param sg: Shotgun instance
-        :param data: data dictionary passed in from _submit()
+        :param data: data dictionary passed in from _submit(). Updates with
+                     ids above highest_id and below lowest_id, if set, are
+                     retrieved, up to limit updates.
         """
         entity_type = data["entity_type"]
         entity_id = data["entity_id"]
         min_id = data["highest_id"]
+        max_id = data.get("lowest_id")
+        if max_id is not None:
+            max_id -= 1
 
         # the additional fields required here are fields which are needed
         # for generic data rendering of the activity stream - e.g.
@@ -900,9 +1751,17 @@ class ActivityStreamDataHandler(QtCore.QObject):
             entity_id,
             entity_fields,
             min_id,
-            limit=self.MAX_ITEMS_TO_GET_FROM_SG,
+            max_id=max_id,
+            limit=data.get("limit", self.MAX_ITEMS_TO_GET_FROM_SG),
         )
 
+        # Convert time stamps and encode the updates for the database here,
+        # so that it doesn't need to be done in the main thread.
+        sg_data = self.__convert_timestamp_r(sg_data)
+        sg_data["payloads"] = [
+            self._encode_payload(update) for update in sg_data["updates"]
+        ]
+
         return sg_data
 
     def __on_worker_failure(self, uid, msg):
@@ -920,14 +1779,24 @@ class ActivityStreamDataHandler(QtCore.QObject):
                 "data from Flow Production Tracking: %s" % msg
             )
 
-        if uid in self._note_map:
+        if self._older_processing_id == uid:
+            # allow the page to be requested again
+            self._older_processing_id = None
+            self._bundle.log_warning(
+                "Could not retrieve older activity stream "
+                "data from Flow Production Tracking: %s" % msg
+            )
+
+        if uid in self._note_map or uid in self._note_batch_map:
             self._bundle.log_warning(
                 "Could not retrieve note "
                 "data from Flow Production Tracking: %s" % msg
             )
 
         if uid in self._thumb_map:
-            # one of the jobs we are tracking
+            # one of the jobs we are tracking, allow it to be requested again
+            thumb_request = self._thumb_map.pop(uid)
+            self._thumb_requests.pop(thumb_request["key"], None)
             self._bundle.log_warning(
                 "Could not retrieve thumbnail "
                 "data from Flow Production Tracking: %s" % msg
@@ -962,8 +1831,19 @@ class ActivityStreamDataHandler(QtCore.QObject):
         activity stream data from Shotgun. Once the rescan is complete, the
         requesting_ui_refresh signal will be emitted.
         """
-        if os.path.exists(self._cache_path):
-            os.remove(self._cache_path)
+        # close the connections before removing the database, the schema will
+        # be created again for the new database.
+        self._close_db_connections()
+        self._db_schema_checked = False
+
+        # also remove the sqlite journal files for the database
+        for path in (
+            self._cache_path,
+            self._cache_path + "-wal",
+            self._cache_path + "-shm",
+        ):
+            if os.path.exists(path):
+                os.remove(path)
 
         self.rescan(force_activity_stream_update=True)
         self.requesting_ui_refresh.emit()
@@ -995,11 +1875,15 @@ class ActivityStreamDataHandler(QtCore.QObject):
 
             # save to disk
             self.__db_insert_activity_updates(
-                self._entity_type, self._entity_id, updates
+                self._entity_type,
+                self._entity_id,
+                updates,
+                data["return_value"].get("payloads"),
             )
 
             # now post process the data to fetch all full conversations
             # for note replies that have happened
+            note_updates = []
             for update in updates:
 
                 activity_id = update["id"]
@@ -1010,31 +1894,21 @@ class ActivityStreamDataHandler(QtCore.QObject):
                 # in the case of all note related activity stream items
                 # - both an initial note and a reply -
                 # issue a note fetch call straight away to fetch
-                # the payload of the note data.
-                if (
-                    update["update_type"] == "create"
-                    and update["primary_entity"]["type"] == "Note"
-                ) or update["update_type"] == "create_reply":
-
-                    note_id = update["primary_entity"]["id"]
+                # the payload of the note data. The notes are fetched
+                # together once all the updates have been processed.
+                note_id = self.__get_update_note_id(update)
+                if note_id is not None:
                     self._bundle.log_debug(
                         "Requesting note thread download " "for note %s" % note_id
                     )
-                    # kick off async data request from shotgun
-                    data = {"note_id": note_id}
-                    self._bundle.log_debug(
-                        "Requesting async data for note id %s" % note_id
-                    )
-                    note_uid = self._sg_data_retriever.execute_method(
-                        self._get_note_thread, data
-                    )
+                    note_updates.append((activity_id, note_id))
+
+            self.__request_note_threads(note_updates)
 
-                    # map the unique id with the update id so we can merge the
-                    # two later as the data arrives
-                    self._note_map[note_uid] = {
-                        "update_id": activity_id,
-                        "note_id": note_id,
-                    }
+            # when nothing was cached, older data is paged in below the
+            # updates that just arrived
+            if updates and self._lowest_activity_id is None:
+                self._lowest_activity_id = min(x["id"] for x in updates)
 
             self._bundle.log_debug("Processed %s updates" % len(updates))
 
@@ -1047,6 +1921,61 @@ class ActivityStreamDataHandler(QtCore.QObject):
             )
             self.update_arrived.emit(new_ids)
 
+        if self._older_processing_id == uid:
+
+            # a page of older activity stream data has arrived
+            self._older_processing_id = None
+            updates = data["return_value"]["updates"]
+
+            self._bundle.log_debug(
+                "Received %s older activity stream updates." % len(updates)
+            )
+
+            # save to disk
+            self.__db_insert_activity_updates(
+                self._entity_type,
+                self._entity_id,
+                updates,
+                data["return_value"].get("payloads"),
+            )
+
+            if len(updates) < self._older_processing_limit:
+                # we've reached the start of the activity stream
+                self._older_activity_exhausted = True
+
+            if updates:
+                self._lowest_activity_id = min(
+                    self._lowest_activity_id, min(x["id"] for x in updates)
+                )
+
+            # only keep the most recent update for each note, skipping the
+            # notes that are already loaded, like when loading from the cache
+            note_ids = self.__get_activity_note_ids()
+            note_updates = []
+            new_ids = []
+            for update in sorted(updates, key=lambda x: x["id"], reverse=True):
+                activity_id = update["id"]
+                if activity_id in self._activity_data:
+                    continue
+
+                note_id = self.__get_update_note_id(update)
+                if note_id is not None:
+                    if note_id in note_ids:
+                        continue
+                    note_ids.add(note_id)
+                    note_updates.append((activity_id, note_id))
+
+                self._activity_data[activity_id] = update
+                new_ids.append(activity_id)
+
+            self.__request_note_threads(note_updates)
+
+            if not new_ids and not self._older_activity_exhausted:
+                # the whole page was skipped, carry on with the next one
+                self.__request_older_activity_data(self._older_processing_limit)
+
+            self.older_update_arrived.emit(sorted(new_ids))
+
         if uid in self._note_map:
 
             # we got a note id back!
@@ -1058,17 +1987,36 @@ class ActivityStreamDataHandler(QtCore.QObject):
             )
 
             # data is a list of entities, stored inside a "return_value" key
-            note_thread_list = data["return_value"]
-            self.__db_insert_note_update(update_id, note_id, note_thread_list)
+            # along with its encoded data for the database
+            self.__process_note_thread(
+                update_id,
+                note_id,
+                data["return_value"]["note_thread"],
+                data["return_value"]["payload"],
+            )
 
-            # and update our dictionary of note conversations
-            self._note_threads[note_id] = note_thread_list
+        if uid in self._note_batch_map:
 
-            # emit signal
-            self.note_arrived.emit(update_id, note_id)
+            # we got a batch of note conversations back!
+            update_ids_by_note = self._note_batch_map[uid]
+            for note_data in data["return_value"]["note_threads"]:
+                note_id = note_data["note_id"]
+                for update_id in update_ids_by_note.get(note_id, []):
+                    self._bundle.log_debug(
+                        "Received note reply info for note id %s, update %s"
+                        % (note_id, update_id)
+                    )
+                    self.__process_note_thread(
+                        update_id,
+                        note_id,
+                        note_data["note_thread"],
+                        note_data["payload"],
+                    )
 
         if uid in self._thumb_map:
             # we got a thumbnail back!
+            thumb_request = self._thumb_map.pop(uid)
+            self._thumb_requests.pop(thumb_request["key"], None)
             image = data["image"]
 
             # If we have a thumbnail image, we need to check to see if it's a
@@ -1089,8 +2037,13 @@ class ActivityStreamDataHandler(QtCore.QObject):
                         "Placeholder thumbnail detected. Triggering a cache dump and rescan..."
                     )
                     self._rescan_timer.start()
+                else:
+                    # placeholders are not cached, so that the actual
+                    # thumbnail is requested after the rescan
+                    self.__cache_thumbnail(
+                        thumb_request["key"], image, data["thumb_path"]
+                    )
 
-                signal_payload = copy.copy(self._thumb_map[uid])
-                signal_payload["image"] = image
-                signal_payload["thumb_path"] = data["thumb_path"]
-                self.thumbnail_arrived.emit(signal_payload)
+                # let everyone waiting for this thumbnail know
+                for thumb_info in thumb_request["requesters"]:
+                    self.__emit_thumbnail(thumb_info, image, data["thumb_path"])
@@ -0,0 +1,288 @@
+# Copyright (c) 2021 Autodesk Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the ShotGrid Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the ShotGrid Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk Inc.
+
+"""
+Codecs to serialize the activity stream payloads stored in the cache database.
+
+Encoded payloads start with a format marker, which identifies the codec used to encode
+them, so that payloads encoded with different codecs can be stored in the same database.
+Payloads without a format marker were pickled before codecs were introduced, and are
+decoded with the pickle codec.
+"""
+
+import datetime
+import json
+import zlib
+
+import sgtk
+
+
+class PayloadCodec(object):
+    """
+    Base class for payload codecs.
+
+    Derived classes must define a unique name and a unique single byte marker, and implement
+    the :meth:`encode` and :meth:`decode` methods. Register a codec with :func:`register_codec`
+    to make it available to decode payloads.
+    """
+
+    # The name used to look up the codec.
+    name = None
+    # The single byte that identifies payloads encoded with the codec.
+    marker = None
+
+    def encode(self, data):
+        """
+        Encode the data.
+
+        :param data: The data to encode.
+        :type data: any
+
+        :return: The encoded data, without the format marker.
+        :rtype: bytes
+        """
+        raise NotImplementedError("PayloadCodec.encode() must be overridden")
+
+    def decode(self, payload):
+        """
+        Decode the data.
+
+        :param payload: The encoded data, without the format marker.
+        :type payload: bytes
+
+        :return: The decoded data.
+        :rtype: any
+        """
+        raise NotImplementedError("PayloadCodec.decode() must be overridden")
+
+
+class PicklePayloadCodec(PayloadCodec):
+    """
+    Codec that pickles the data. This can encode any data, but is slower to decode and
+    larger than the other codecs.
+    """
+
+    name = "pickle"
+    marker = b"P"
+
+    def encode(self, data):
+        """Pickle the data."""
+
+        payload = sgtk.util.pickle.dumps(data)
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        return payload
+
+    def decode(self, payload):
+        """Unpickle the data."""
+
+        return sgtk.util.pickle.loads(payload)
+
+
+class JsonPayloadCodec(PayloadCodec):
+    """
+    Codec that encodes the data as JSON. Datetimes are supported, but other types that are
+    not supported by JSON will fail to encode. Data that JSON does not round-trip exactly,
+    i.e. tuples and dictionaries with non-string keys, also fails to encode.
+    """
+
+    name = "json"
+    marker = b"J"
+
+    # The key used to identify encoded datetime objects.
+    DATETIME_KEY = "__datetime__"
+
+    def encode(self, data):
+        """Encode the data as compact JSON."""
+
+        self._check_value(data)
+        return json.dumps(
+            data, default=self._encode_object, separators=(",", ":")
+        ).encode("utf-8")
+
+    def decode(self, payload):
+        """Decode the JSON data."""
+
+        return json.loads(payload.decode("utf-8"), object_hook=self._decode_object)
+
+    def _check_value(self, value):
+        """
+        Check that the value is decoded to the same value once encoded as JSON.
+
+        :raises TypeError: If the value contains tuples, or dictionaries with non-string keys
+            or with a key that is reserved to encode datetimes.
+        """
+
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if not isinstance(key, str) or key == self.DATETIME_KEY:
+                    raise TypeError(
+                        "Dictionary key %r cannot be encoded as JSON" % (key,)
+                    )
+                self._check_value(item)
+
+        elif isinstance(value, list):
+            for item in value:
+                self._check_value(item)
+
+        elif isinstance(value, tuple):
+            raise TypeError("Tuples are decoded as lists from JSON")
+
+    def _encode_object(self, value):
+        """
+        Return a JSON serializable object for values that are not supported by JSON.
+
+        :raises TypeError: If the value is not supported.
+        """
+
+        if isinstance(value, datetime.datetime):
+            return {self.DATETIME_KEY: value.isoformat()}
+
+        raise TypeError(
+            "Object of type %s is not JSON serializable" % type(value).__name__
+        )
+
+    def _decode_object(self, value):
+        """
+        Convert the decoded JSON object back to the value it was encoded from.
+        """
+
+        if len(value) == 1 and self.DATETIME_KEY in value:
+            return datetime.datetime.fromisoformat(value[self.DATETIME_KEY])
+
+        return value
+
+
+class ZlibJsonPayloadCodec(JsonPayloadCodec):
+    """
+    Codec that encodes the data as zlib compressed JSON.
+    """
+
+    name = "zlib_json"
+    marker = b"Z"
+
+    # The zlib compression level, faster compression is favored since the payloads are small.
+    COMPRESSION_LEVEL = 1
+
+    def encode(self, data):
+        """Encode the data as compressed JSON."""
+
+        return zlib.compress(super().encode(data), self.COMPRESSION_LEVEL)
+
+    def decode(self, payload):
+        """Decode the compressed JSON data."""
+
+        return super().decode(zlib.decompress(payload))
+
+
+# Prefix of the format marker. Payloads pickled before codecs were introduced never start
+# with a null byte: protocol 0 pickles start with a printable opcode, and later protocols
+# start with the PROTO opcode (0x80).
+MARKER_PREFIX = b"\x00"
+
+_codecs_by_name = {}
+_codecs_by_marker = {}
+
+
+def register_codec(codec):
+    """
+    Register a codec, so that it can be looked up by name and used to decode payloads.
+
+    :param codec: The codec to register.
+    :type codec: :class:`PayloadCodec`
+
+    :raises ValueError: If the codec marker is not a single byte, or a different codec is
+        already registered with the same name or marker.
+    """
+
+    if not isinstance(codec.marker, bytes) or len(codec.marker) != 1:
+        raise ValueError("Codec marker must be a single byte: %r" % codec.marker)
+
+    for registered, key in (
+        (_codecs_by_name, codec.name),
+        (_codecs_by_marker, codec.marker),
+    ):
+        existing = registered.get(key)
+        if existing is not None and existing is not codec:
+            raise ValueError(
+                "Codec '%s' conflicts with registered codec '%s'"
+                % (codec.name, existing.name)
+            )
+
+    _codecs_by_name[codec.name] = codec
+    _codecs_by_marker[codec.marker] = codec
+
+
+def get_codec(name):
+    """
+    Return the registered codec with the given name.
+
+    :param name: The codec name.
+    :type name: str
+
+    :return: The codec.
+    :rtype: :class:`PayloadCodec`
+
+    :raises KeyError: If no codec is registered with the name.
+    """
+
+    return _codecs_by_name[name]
+
+
+def encode_payload(data, codec):
+    """
+    Encode the data with the codec, prefixed with the codec's format marker.
+
+    If the codec cannot encode the data (e.g. it contains types that JSON does not support),
+    the data is encoded with the pickle codec instead.
+
+    :param data: The data to encode.
+    :type data: any
+    :param codec: The codec to encode the data with.
+    :type codec: :class:`PayloadCodec`
+
+    :return: The encoded payload.
+    :rtype: bytes
+    """
+
+    try:
+        payload = codec.encode(data)
+    except (TypeError, ValueError):
+        codec = _codecs_by_name[PicklePayloadCodec.name]
+        payload = codec.encode(data)
+
+    return MARKER_PREFIX + codec.marker + payload
+
+
+def decode_payload(payload):
+    """
+    Decode the payload, using the codec identified by its format marker. Payloads without a
+    format marker are unpickled.
+
+    :param payload: The encoded payload.
+    :type payload: bytes
+
+    :return: The decoded data.
+    :rtype: any
+
+    :raises KeyError: If the payload was encoded with a codec that is not registered.
+    """
+
+    payload = bytes(payload)
+    if not payload.startswith(MARKER_PREFIX):
+        return _codecs_by_name[PicklePayloadCodec.name].decode(payload)
+
+    codec = _codecs_by_marker[payload[1:2]]
+    return codec.decode(payload[2:])
+
+
+register_codec(PicklePayloadCodec())
+register_codec(JsonPayloadCodec())
+register_codec(ZlibJsonPayloadCodec())
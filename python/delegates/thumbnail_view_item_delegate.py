@@ -34,7 +34,7 @@ class ThumbnailViewItemDelegate(ViewItemDelegate):
         self._thumbnail_size = QtCore.QSize(164, 128)
         self.thumbnail_position = (self.TOP,)
 
-    def sizeHint(self, option, index):
+    def _get_size_hint(self, option, index):
         """
         Override the base ViewItemDelegate method.
 
@@ -80,6 +80,18 @@ class ThumbnailViewItemDelegate(ViewItemDelegate):
 
         return QtCore.QSize(width, height)
 
+    def _is_size_hint_uniform(self):
+        """
+        Override the base ViewItemDelegate method.
+
+        The size hint is based on the height of the item text, which may differ per item.
+
+        :return: False, the size hint is not uniform across items.
+        :rtype: bool
+        """
+
+        return False
+
     def _get_loading_rect(self, option, index):
         """
         Override the base ViewItemDelegate method.
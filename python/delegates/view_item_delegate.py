@@ -8,6 +8,7 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Autodesk, Inc.
 
+import collections
 from time import time
 
 import sgtk
@@ -182,6 +183,36 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
         # Font to set on the QTextDocument. If None, the font from the QStyleOptionViewItem will be used.
         self._font = None
 
+        # Size hints, cached per item and option size when enabled, see `sizeHint`. The items are
+        # keyed by row and column under their parent, and cleared when the model data changes.
+        self._cache_size_hints = False
+        self._size_hint_cache = {}
+        self._size_hint_cache_width_bucket = 1
+        # The size hint shared by all items, when the item size does not depend on the item data.
+        self._uniform_size_hint = None
+
+        # Laid out text documents, least recently used first. Documents are keyed by their html text,
+        # text width and document style, see `_get_cached_text_document`.
+        self._text_document_cache = collections.OrderedDict()
+        self._text_document_cache_size = 500
+
+        # Item renders, least recently used first, cached per item when enabled, see `paint`. The
+        # items are keyed the same as the size hints, and mapped to the item state and pixmap.
+        self._cache_item_renders = False
+        self._render_cache = collections.OrderedDict()
+        self._render_cache_size = 200
+
+        # The model that item size hints and renders are cached for, see `_set_item_cache_model`.
+        self._item_cache_model = None
+
+        # The actions and their rects laid out for the item last painted, sized or hit-tested, keyed
+        # by the option rect and state, see `_get_action_and_rects`. This is cleared on each paint.
+        self._action_layout_item_key = None
+        self._action_layouts = {}
+
+        # The fallback thumbnail for items that have empty thumbnail data, loaded on first use.
+        self._default_thumbnail = None
+
         # Radius values for rounding item and thumbnail rects.
         self._item_x_radius = 4.0
         self._item_y_radius = 4.0
@@ -228,6 +259,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @thumbnail_role.setter
     def thumbnail_role(self, role):
         self._thumbnail_role = role
+        self.clear_size_hint_cache()
 
     @property
     def header_role(self):
@@ -240,6 +272,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @header_role.setter
     def header_role(self, role):
         self._header_role = role
+        self.clear_size_hint_cache()
 
     @property
     def subtitle_role(self):
@@ -252,6 +285,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @subtitle_role.setter
     def subtitle_role(self, role):
         self._subtitle_role = role
+        self.clear_size_hint_cache()
 
     @property
     def text_role(self):
@@ -264,6 +298,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @text_role.setter
     def text_role(self, role):
         self._text_role = role
+        self.clear_size_hint_cache()
 
     @property
     def short_text_role(self):
@@ -278,6 +313,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @short_text_role.setter
     def short_text_role(self, role):
         self._short_text_role = role
+        self.clear_render_cache()
 
     @property
     def icon_role(self):
@@ -291,6 +327,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @icon_role.setter
     def icon_role(self, role):
         self._icon_role = role
+        self.clear_render_cache()
 
     @property
     def width_role(self):
@@ -302,6 +339,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @width_role.setter
     def width_role(self, role):
         self._width_role = role
+        self.clear_size_hint_cache()
 
     @property
     def height_role(self):
@@ -313,6 +351,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @height_role.setter
     def height_role(self, role):
         self._height_role = role
+        self.clear_size_hint_cache()
 
     @property
     def expand_role(self):
@@ -327,6 +366,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @expand_role.setter
     def expand_role(self, role):
         self._expand_role = role
+        self.clear_size_hint_cache()
 
     @property
     def loading_role(self):
@@ -339,6 +379,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @loading_role.setter
     def loading_role(self, role):
         self._loading_role = role
+        self.clear_render_cache()
 
     @property
     def separator_role(self):
@@ -351,6 +392,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @separator_role.setter
     def separator_role(self, role):
         self._separator_role = role
+        self.clear_render_cache()
 
     @property
     def visible_lines(self):
@@ -363,6 +405,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @visible_lines.setter
     def visible_lines(self, lines):
         self._visible_lines = lines
+        self.clear_size_hint_cache()
 
     @property
     def document_style_sheet(self):
@@ -374,6 +417,8 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @document_style_sheet.setter
     def document_style_sheet(self, qss):
         self._document_style_sheet = qss
+        self.clear_text_document_cache()
+        self.clear_size_hint_cache()
 
     @property
     def elide_text(self):
@@ -385,6 +430,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @elide_text.setter
     def elide_text(self, on):
         self._elide_text = on
+        self.clear_size_hint_cache()
 
     @property
     def elide_header(self):
@@ -396,6 +442,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @elide_header.setter
     def elide_header(self, on):
         self._elide_header = on
+        self.clear_size_hint_cache()
 
     @property
     def item_width(self):
@@ -407,6 +454,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @item_width.setter
     def item_width(self, width):
         self._item_width = width
+        self.clear_size_hint_cache()
 
     @property
     def item_height(self):
@@ -418,6 +466,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @item_height.setter
     def item_height(self, height):
         self._item_height = height
+        self.clear_size_hint_cache()
 
         if (
             self._thumbnail_scale_value is not None
@@ -437,6 +486,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @min_width.setter
     def min_width(self, width):
         self._min_width = width
+        self.clear_size_hint_cache()
 
     @property
     def min_height(self):
@@ -448,6 +498,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @min_height.setter
     def min_height(self, height):
         self._min_height = height
+        self.clear_size_hint_cache()
 
     @property
     def thumbnail_uniform(self):
@@ -462,6 +513,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @thumbnail_uniform.setter
     def thumbnail_uniform(self, uniform):
         self._thumbnail_uniform = uniform
+        self.clear_render_cache()
 
     @property
     def thumbnail_size(self):
@@ -475,6 +527,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @thumbnail_size.setter
     def thumbnail_size(self, size):
         self._thumbnail_size = size
+        self.clear_size_hint_cache()
 
     @property
     def thumbnail_width(self):
@@ -487,6 +540,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @thumbnail_width.setter
     def thumbnail_width(self, width):
         self._thumbnail_size.setWidth(width)
+        self.clear_size_hint_cache()
 
     @property
     def thumbnail_height(self):
@@ -499,6 +553,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @thumbnail_height.setter
     def thumbnail_height(self, height):
         self._thumbnail_size.setHeight(height)
+        self.clear_size_hint_cache()
 
     @property
     def pixmap_extent(self):
@@ -511,6 +566,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @pixmap_extent.setter
     def pixmap_extent(self, extent):
         self._pixmap_extent = extent
+        self.clear_render_cache()
 
     @property
     def icon_size(self):
@@ -522,6 +578,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @icon_size.setter
     def icon_size(self, size):
         self._icon_size = size
+        self.clear_size_hint_cache()
 
     @property
     def badge_height_pct(self):
@@ -536,6 +593,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @badge_height_pct.setter
     def badge_height_pct(self, pct):
         self._badge_height_pct = pct
+        self.clear_render_cache()
 
     @property
     def action_item_margin(self):
@@ -547,6 +605,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @action_item_margin.setter
     def action_item_margin(self, margin):
         self._action_item_margin = margin
+        self.clear_size_hint_cache()
 
     @property
     def button_padding(self):
@@ -558,6 +617,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @button_padding.setter
     def button_padding(self, padding):
         self._button_padding = padding
+        self.clear_size_hint_cache()
 
     @property
     def text_document_margin(self):
@@ -570,6 +630,8 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @text_document_margin.setter
     def text_document_margin(self, margin):
         self._text_document_margin = margin
+        self.clear_text_document_cache()
+        self.clear_size_hint_cache()
 
     @property
     def item_padding(self):
@@ -587,6 +649,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
             self._item_padding = self.Padding.new(padding)
         else:
             raise ValueError("Invalid padding value {}".format(padding))
+        self.clear_size_hint_cache()
 
     @property
     def thumbnail_padding(self):
@@ -604,6 +667,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
             self._thumbnail_padding = self.Padding.new(padding)
         else:
             raise ValueError("Invalid padding value {}".format(padding))
+        self.clear_size_hint_cache()
 
     @property
     def text_padding(self):
@@ -621,6 +685,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
             self._text_padding = self.Padding.new(padding)
         else:
             raise ValueError("Invalid padding value {}".format(padding))
+        self.clear_size_hint_cache()
 
     @property
     def text_rect_halign(self):
@@ -641,6 +706,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
                 )
             )
         self._text_rect_halign = alignment
+        self.clear_render_cache()
 
     @property
     def text_rect_valign(self):
@@ -658,6 +724,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
                 )
             )
         self._text_rect_valign = alignment
+        self.clear_render_cache()
 
     @property
     def font(self):
@@ -670,6 +737,85 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @font.setter
     def font(self, value):
         self._font = value
+        self.clear_text_document_cache()
+        self.clear_size_hint_cache()
+
+    @property
+    def cache_size_hints(self):
+        """
+        Get or set whether the item size hints are cached. Views request the size hint of every item
+        whenever their layout changes, e.g. when the view is resized, which can be slow for items
+        that expand to fit their text. Cached size hints are cleared when the model data changes,
+        or when a delegate property affecting the item size is set.
+        """
+        return self._cache_size_hints
+
+    @cache_size_hints.setter
+    def cache_size_hints(self, cache):
+        self._cache_size_hints = cache
+        self.clear_size_hint_cache()
+
+    @property
+    def size_hint_cache_width_bucket(self):
+        """
+        Get or set the width range, in pixels, that a cached size hint is reused for. Increasing
+        this reduces the number of size hints calculated while a view is resized, at the cost of
+        the item size lagging behind the view width by less than the bucket width. By default,
+        size hints are cached per exact width.
+        """
+        return self._size_hint_cache_width_bucket
+
+    @size_hint_cache_width_bucket.setter
+    def size_hint_cache_width_bucket(self, width):
+        self._size_hint_cache_width_bucket = max(1, width)
+        self.clear_size_hint_cache()
+
+    @property
+    def text_document_cache_size(self):
+        """
+        Get or set the maximum number of laid out text documents to keep in memory. Laying out the item
+        HTML text is expensive, and needs to be done whenever an item is painted or its size is requested.
+        Set to 0 to disable caching the text documents.
+        """
+        return self._text_document_cache_size
+
+    @text_document_cache_size.setter
+    def text_document_cache_size(self, size):
+        self._text_document_cache_size = max(0, size)
+        while len(self._text_document_cache) > self._text_document_cache_size:
+            self._text_document_cache.popitem(last=False)
+
+    @property
+    def cache_item_renders(self):
+        """
+        Get or set whether the rendered items are cached. Each item is painted once into a pixmap,
+        which is drawn on later paints until the item data, state or size changes. Items that are
+        hovered or loading are always painted, since they may be animated or change with the
+        cursor position. Cached renders are cleared when the model data changes, or when a
+        delegate property affecting the item render is set. If actions are shown based on data
+        other than the model data, `clear_render_cache` must be called when that data changes.
+        """
+        return self._cache_item_renders
+
+    @cache_item_renders.setter
+    def cache_item_renders(self, cache):
+        self._cache_item_renders = cache
+        self.clear_render_cache()
+
+    @property
+    def render_cache_size(self):
+        """
+        Get or set the maximum number of rendered items to keep in memory, when the
+        `cache_item_renders` property is set. This should be at least the number of items visible
+        in the view.
+        """
+        return self._render_cache_size
+
+    @render_cache_size.setter
+    def render_cache_size(self, size):
+        self._render_cache_size = max(0, size)
+        while len(self._render_cache) > self._render_cache_size:
+            self._render_cache.popitem(last=False)
 
     @property
     def background_pen(self):
@@ -682,6 +828,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @background_pen.setter
     def background_pen(self, pen):
         self._background_pen = pen
+        self.clear_render_cache()
 
     @property
     def loading_pen(self):
@@ -693,6 +840,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @loading_pen.setter
     def loading_pen(self, pen):
         self._loading_pen = pen
+        self.clear_render_cache()
 
     @property
     def loading_brush(self):
@@ -705,6 +853,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @loading_brush.setter
     def loading_brush(self, brush):
         self._loading_brush = brush
+        self.clear_render_cache()
 
     @property
     def selection_brush(self):
@@ -716,6 +865,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @selection_brush.setter
     def selection_brush(self, brush):
         self._selection_brush = brush
+        self.clear_render_cache()
 
     @property
     def separator_brush(self):
@@ -727,6 +877,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @separator_brush.setter
     def separator_brush(self, brush):
         self._separator_brush = brush
+        self.clear_render_cache()
 
     @property
     def show_hover_selection(self):
@@ -738,6 +889,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     @show_hover_selection.setter
     def show_hover_selection(self, show):
         self._show_hover_selection = show
+        self.clear_render_cache()
 
     @property
     def show_text_tooltip(self):
@@ -1001,6 +1153,8 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
             item_action = ViewItemAction(action)
             self._actions.setdefault(position, []).append(item_action)
 
+        self.clear_size_hint_cache()
+
     def add_action(self, action, position=FLOAT_BOTTOM_RIGHT):
         """
         Convenience method to add an action. See `add_actions`.
@@ -1030,6 +1184,42 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
             for position in positions:
                 self._actions[position].clear()
 
+        self.clear_size_hint_cache()
+
+    def clear_size_hint_cache(self):
+        """
+        Clear the cached item size hints. This is called when a delegate property affecting the
+        item size is set, and should be called by subclasses when anything else they use to
+        calculate the item size changes.
+        """
+
+        self._size_hint_cache = {}
+        self._uniform_size_hint = None
+        # The item size affects how items are rendered.
+        self.clear_render_cache()
+
+    def clear_render_cache(self):
+        """
+        Clear the cached item renders. This is called when a delegate property affecting the item
+        render is set, and should be called by subclasses when anything else they use to draw the
+        items changes. This also clears the action layout cached for the last item drawn.
+        """
+
+        self._render_cache.clear()
+        # The actions are laid out based on the same properties as the item render.
+        self._clear_action_layouts()
+
+    def clear_text_document_cache(self):
+        """
+        Clear the laid out text documents kept in memory.
+
+        Documents are keyed by their text and style, so that they do not need to be cleared when the
+        model data changes. This is called when the delegate document style changes, and should be
+        called by subclasses that override `_create_text_document` when the style it applies changes.
+        """
+
+        self._text_document_cache.clear()
+
     def scale_thumbnail_to_item_height(self, scale_value):
         """
         If scale_value is not None, the thumbnail width will scale with the row height by a factor
@@ -1180,7 +1370,8 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
         """
         Overrides :class:`sgtk.platform.qt.QtGui.QStyledItemDelegate` method.
 
-        Returns the size hint for the view item.
+        Returns the size hint for the view item. The size hint is calculated by `_get_size_hint`,
+        and cached if the `cache_size_hints` property is set.
 
         :param option: The option used for rendering the item.
         :type option: :class:`sgtk.platform.qt.QtGui.QStyleOptionViewItem`
@@ -1191,6 +1382,51 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
         if not index.isValid():
             return QtCore.QSize()
 
+        if not self.cache_size_hints:
+            return self._get_size_hint(option, index)
+
+        option_key = (
+            option.rect.width() // self.size_hint_cache_width_bucket,
+            option.rect.height(),
+        )
+
+        if self._is_size_hint_uniform():
+            # Fast path for items that all have the same size, there is no need to cache the size
+            # per item.
+            if (
+                self._uniform_size_hint is None
+                or self._uniform_size_hint[0] != option_key
+            ):
+                self._uniform_size_hint = (
+                    option_key,
+                    self._get_size_hint(option, index),
+                )
+            return QtCore.QSize(self._uniform_size_hint[1])
+
+        self._set_item_cache_model(index.model())
+        item_size_hints = self._size_hint_cache.setdefault(
+            self._get_item_cache_key(index), {}
+        )
+        size_hint = item_size_hints.get(option_key)
+        if size_hint is None:
+            size_hint = self._get_size_hint(option, index)
+            item_size_hints[option_key] = size_hint
+
+        return QtCore.QSize(size_hint)
+
+    def _get_size_hint(self, option, index):
+        """
+        Calculate the size hint for the view item.
+
+        :param option: The option used for rendering the item.
+        :type option: :class:`sgtk.platform.qt.QtGui.QStyleOptionViewItem`
+        :param index: The index of the item.
+        :type index: :class:`sgtk.platform.qt.QtCore.QModelIndex`
+
+        :return: The size hint for the item.
+        :rtype: :class:`sgtk.platform.qt.QtCore.QSize`
+        """
+
         # Initialize the view option
         view_option = QtGui.QStyleOptionViewItem(option)
         self.initStyleOption(view_option, index)
@@ -1273,6 +1509,147 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
 
         return QtCore.QSize(width, height)
 
+    def _is_size_hint_uniform(self):
+        """
+        Return True if the size hint is the same for all items, for a given option rect size.
+
+        This is the case when the item height is fixed, and no other item data affects the size
+        of the item. Override this method if the size hint calculation is customized.
+
+        :return: True if all items have the same size hint, else False.
+        :rtype: bool
+        """
+
+        return (
+            self.item_height is not None
+            and self.item_height >= 0
+            and self.width_role is None
+            and self.height_role is None
+            and self.expand_role is None
+            and (self.thumbnail_role is None or self.thumbnail_height <= 0)
+            and not self._actions
+        )
+
+    def _is_render_cacheable(self, option, index):
+        """
+        Return True if the item render can be cached. Items that are hovered or loading are not
+        cached, since they may be animated or drawn based on the cursor position.
+
+        :param option: The option used for rendering the item.
+        :type option: :class:`sgtk.platform.qt.QtGui.QStyleOptionViewItem`
+        :param index: The index of the item.
+        :type index: :class:`sgtk.platform.qt.QtCore.QModelIndex`
+
+        :return: True if the item render can be cached, else False.
+        :rtype: bool
+        """
+
+        if self.is_hover(option):
+            return False
+
+        if self.get_value(index, self.loading_role):
+            return False
+
+        return option.rect.isValid()
+
+    def _get_item_cache_key(self, index):
+        """
+        Return the key used to look up the cached size hints and renders for the index.
+
+        :param index: The index of the item.
+        :type index: :class:`sgtk.platform.qt.QtCore.QModelIndex`
+
+        :return: The key (parent key, row, column), where the parent key is the row path of the
+            parent item, see `utils.get_index_row_path`. The item caches are cleared when the
+            model rows change, so the row path stays valid.
+        :rtype: tuple
+        """
+
+        return (utils.get_index_row_path(index.parent()), index.row(), index.column())
+
+    def _set_item_cache_model(self, model):
+        """
+        Set the model that the size hints and renders are cached for. The item caches are cleared
+        when the model changes, and are kept in sync with the model by listening to its signals.
+
+        :param model: The model of the items to cache size hints and renders for.
+        :type model: :class:`sgtk.platform.qt.QtCore.QAbstractItemModel`
+        """
+
+        if model is self._item_cache_model:
+            return
+
+        if self._item_cache_model:
+            try:
+                self._item_cache_model.dataChanged.disconnect(
+                    self._on_item_cache_data_changed
+                )
+                self._item_cache_model.rowsInserted.disconnect(self._clear_item_caches)
+                self._item_cache_model.rowsRemoved.disconnect(self._clear_item_caches)
+                self._item_cache_model.rowsMoved.disconnect(self._clear_item_caches)
+                self._item_cache_model.layoutChanged.disconnect(self._clear_item_caches)
+                self._item_cache_model.modelReset.disconnect(self._clear_item_caches)
+            except RuntimeError:
+                # Signals were never connected, or the model has been deleted
+                pass
+
+        self._clear_item_caches()
+        self._item_cache_model = model
+
+        if model:
+            model.dataChanged.connect(self._on_item_cache_data_changed)
+            model.rowsInserted.connect(self._clear_item_caches)
+            model.rowsRemoved.connect(self._clear_item_caches)
+            model.rowsMoved.connect(self._clear_item_caches)
+            model.layoutChanged.connect(self._clear_item_caches)
+            model.modelReset.connect(self._clear_item_caches)
+
+    def _clear_item_caches(self, *args):
+        """
+        Slot triggered when the model rows change. The cached size hints and renders are keyed by
+        row, so clear all cached item size hints and renders.
+        """
+
+        self._size_hint_cache = {}
+        self._render_cache.clear()
+        self._clear_action_layouts()
+
+    def _clear_action_layouts(self):
+        """
+        Clear the action layouts cached for the last item laid out.
+        """
+
+        self._action_layout_item_key = None
+        self._action_layouts = {}
+
+    def _on_item_cache_data_changed(self, top_left, bottom_right, roles=None):
+        """
+        Slot triggered when the model data changes. Remove the cached size hints and renders for
+        the changed items.
+        """
+
+        # The action visibility and layout may depend on the item data.
+        self._clear_action_layouts()
+
+        if not self._size_hint_cache and not self._render_cache:
+            return
+
+        if not top_left.isValid() or not bottom_right.isValid():
+            self._clear_item_caches()
+            return
+
+        parent = top_left.parent()
+        if parent != bottom_right.parent():
+            # This should never happen but just in case, clear the whole cache.
+            self._clear_item_caches()
+            return
+
+        parent_key = utils.get_index_row_path(parent)
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            for column in range(top_left.column(), bottom_right.column() + 1):
+                self._size_hint_cache.pop((parent_key, row, column), None)
+                self._render_cache.pop((parent_key, row, column), None)
+
     def paint(self, painter, option, index):
         """
         Overrides :class:`sgtk.platform.qt.QtGui.QStyledItemDelegate` method.
@@ -1291,6 +1668,10 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
         if not index.isValid():
             return
 
+        # Lay out the actions again on each paint, so that the cached layout is only reused within
+        # this paint (and by any hit-testing until the next paint) and is never stale.
+        self._clear_action_layouts()
+
         # Initialize the view option
         view_option = QtGui.QStyleOptionViewItem(option)
         self.initStyleOption(view_option, index)
@@ -1309,26 +1690,10 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
         # model data to render the correct row height for the index.
         self._update_index_expand_state(view_option, index)
 
-        painter.save()
-        painter.setRenderHints(
-            QtGui.QPainter.Antialiasing | QtGui.QPainter.TextAntialiasing
-        )
-
-        self._draw_background(painter, view_option)
-        thumbnail_rect = self._draw_thumbnail(painter, view_option, index)
-        self._draw_text(painter, view_option, index)
-        self._draw_actions(painter, view_option, index)
-        self._draw_separator(painter, view_option, index)
-
-        if self.is_selected(view_option) or (
-            self.show_hover_selection and self.is_hover(view_option)
-        ):
-            self._draw_selection(painter, view_option)
-
-        self._draw_icon_badges(painter, view_option, thumbnail_rect, index)
-        self._draw_loading(painter, view_option, index)
-
-        painter.restore()
+        if self.cache_item_renders and self._is_render_cacheable(view_option, index):
+            self._draw_cached_item(painter, view_option, index)
+        else:
+            self._draw_item(painter, view_option, index)
 
         if DEBUG_PAINT:
             painter.save()
@@ -1342,6 +1707,97 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
     # Draw Methods
     # Override any of these draw methods to customize how that particular aspect of the item is rendered.
 
+    def _draw_item(self, painter, option, index):
+        """
+        Draw the view item. This calls the draw methods for each aspect of the item.
+
+        :param painter: the object used for painting.
+        :type painter: :class:`sgkt.platform.qt.QtGui.QPainter`
+        :param option: The option used for rendering the item.
+        :type option: :class:`sgtk.platform.qt.QtGui.QStyleOptionViewItem`
+        :param index: The index of the item.
+        :type index: :class:`sgtk.platform.qt.QtCore.QModelIndex`
+        """
+
+        painter.save()
+        painter.setRenderHints(
+            QtGui.QPainter.Antialiasing | QtGui.QPainter.TextAntialiasing
+        )
+
+        self._draw_background(painter, option)
+        thumbnail_rect = self._draw_thumbnail(painter, option, index)
+        self._draw_text(painter, option, index)
+        self._draw_actions(painter, option, index)
+        self._draw_separator(painter, option, index)
+
+        if self.is_selected(option) or (
+            self.show_hover_selection and self.is_hover(option)
+        ):
+            self._draw_selection(painter, option)
+
+        self._draw_icon_badges(painter, option, thumbnail_rect, index)
+        self._draw_loading(painter, option, index)
+
+        painter.restore()
+
+    def _draw_cached_item(self, painter, option, index):
+        """
+        Draw the view item from the render cache. If the item has not been rendered for its
+        current state and size, the item is first drawn into a pixmap, which is cached until the
+        item data changes.
+
+        :param painter: the object used for painting.
+        :type painter: :class:`sgkt.platform.qt.QtGui.QPainter`
+        :param option: The option used for rendering the item.
+        :type option: :class:`sgtk.platform.qt.QtGui.QStyleOptionViewItem`
+        :param index: The index of the item.
+        :type index: :class:`sgtk.platform.qt.QtCore.QModelIndex`
+        """
+
+        try:
+            pixel_ratio = painter.device().devicePixelRatio()
+        except AttributeError:
+            # Qt versions without high dpi support
+            pixel_ratio = 1
+
+        size = option.rect.size()
+        state_key = (int(option.state), size.width(), size.height(), pixel_ratio)
+
+        self._set_item_cache_model(index.model())
+        item_key = self._get_item_cache_key(index)
+        cached = self._render_cache.get(item_key)
+
+        if cached is not None and cached[0] == state_key:
+            self._render_cache.move_to_end(item_key)
+            pixmap = cached[1]
+        else:
+            pixmap = QtGui.QPixmap(size * pixel_ratio)
+            try:
+                pixmap.setDevicePixelRatio(pixel_ratio)
+            except AttributeError:
+                # Qt versions without high dpi support
+                pass
+            pixmap.fill(QtCore.Qt.transparent)
+
+            # Draw the item at the origin of the pixmap.
+            pixmap_option = QtGui.QStyleOptionViewItem(option)
+            pixmap_option.rect = QtCore.QRect(QtCore.QPoint(0, 0), size)
+            pixmap_painter = QtGui.QPainter(pixmap)
+            pixmap_painter.setFont(painter.font())
+            pixmap_painter.setPen(painter.pen())
+            try:
+                self._draw_item(pixmap_painter, pixmap_option, index)
+            finally:
+                pixmap_painter.end()
+
+            if self._render_cache_size > 0:
+                self._render_cache[item_key] = (state_key, pixmap)
+                self._render_cache.move_to_end(item_key)
+                if len(self._render_cache) > self._render_cache_size:
+                    self._render_cache.popitem(last=False)
+
+        painter.drawPixmap(option.rect.topLeft(), pixmap)
+
     def _draw_background(self, painter, option):
         """
         Draw the view item background. This default implementation will fill the option rect using the
@@ -1526,33 +1982,18 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
         available_size = available_rect.size()
         thumbnail_rect = QtCore.QRect(available_rect)
 
-        if self.thumbnail_uniform:
-            # Scale the thumbnail to fill the available space. The thumbnail size may be
-            # bigger than the available space. If it is, the thumbnail will be cropped
-            # later to center the thumbnail within the available rect.
-            thumbnail = thumbnail.scaled(
-                available_size.width(),
-                available_size.height(),
-                QtCore.Qt.KeepAspectRatioByExpanding,
-                QtCore.Qt.SmoothTransformation,
-            )
-        else:
-            # Scale the thumbnail to fit the available space.
-            if thumbnail.height() > available_size.height():
-                thumbnail = thumbnail.scaledToHeight(available_size.height())
-            if thumbnail.width() > available_size.width():
-                thumbnail = thumbnail.scaledToWidth(available_size.width())
+        # Scale (and crop) the thumbnail to the available space.
+        thumbnail = self._get_scaled_thumbnail(thumbnail, available_size)
+        if not self.thumbnail_uniform:
             # Set the thumbnail rect to the size of the thumbnail after scaling
             thumbnail_rect.setSize(thumbnail.size())
 
-        # Adjust the thumbnail and the rect used to draw the thumbnail such that the thumbnail
-        # fits and is centered within the draw rect
+        # Adjust the rect used to draw the thumbnail such that the thumbnail is centered within
+        # the draw rect
         thumbnail_width = thumbnail.size().width()
         thumbnail_height = thumbnail.size().height()
         available_width = available_size.width()
         available_height = available_size.height()
-        x = 0
-        y = 0
         dx = 0
         dy = 0
 
@@ -1565,9 +2006,6 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
             else:
                 # Default to center horizontally
                 dx = (available_width - thumbnail_width) / 2
-        elif thumbnail_width > available_width:
-            # Calculate the horizontal offset to crop the thumbnail
-            x = (thumbnail_width - available_width) / 2
 
         if thumbnail_height < available_height:
             # Calculate vertical offset to move the thumbnail rect
@@ -1578,19 +2016,11 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
             else:
                 # Default to center vertically
                 dy = (available_height - thumbnail_height) / 2
-        elif thumbnail_height > available_height:
-            # Calculate the vertical offset to crop the thumbnail
-            y = (thumbnail_height - available_height) / 2
 
         # Adjust the rect to be centered
         top_left = thumbnail_rect.topLeft()
         thumbnail_rect.moveTo(top_left.x() + dx, top_left.y() + dy)
 
-        # Adjust the thumbnail to be centered within the rect
-        if x or y:
-            crop_rect = QtCore.QRect(x, y, available_width, available_height)
-            thumbnail = thumbnail.copy(crop_rect)
-
         # Create a brush with the thumbnail as a texture, so that the painter can draw the pixmap
         # as a rounded rect.
         pixmap = QtGui.QBrush(thumbnail)
@@ -2348,9 +2778,11 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
 
         if not thumbnail:
             # Default to empty pixmap
-            thumbnail = QtGui.QPixmap(
-                ":/tk-framework-qtwidgets/shotgun_widget/rect_512x400.png"
-            )
+            if self._default_thumbnail is None:
+                self._default_thumbnail = QtGui.QPixmap(
+                    ":/tk-framework-qtwidgets/shotgun_widget/rect_512x400.png"
+                )
+            thumbnail = self._default_thumbnail
 
         if hasattr(thumbnail, "pixmap"):
             thumbnail = self._convert_icon_to_pixmap(thumbnail)
@@ -2554,11 +2986,12 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
         text = self._get_text(index, option, rect)
         html, elided = self._format_html_text(option, index, rect, text, clip)
 
-        doc = self._create_text_document(option)
         if rect.isValid() and rect.width() > 0:
-            doc.setTextWidth(rect.width())
+            text_width = rect.width()
+        else:
+            text_width = -1
 
-        doc.setHtml(html)
+        doc = self._get_cached_text_document(option, html, text_width)
 
         return (doc, elided)
 
@@ -2621,21 +3054,51 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
         :rtype: list<tuple<action, bouding_rect>>
         """
 
-        rects = []
-        item_action_data = self._get_actions(option, index, return_all, positions)
+        # The actions are laid out many times for the same item while it is painted, sized and
+        # hit-tested, so the layouts are cached for the item until a different item is laid out or
+        # the next item paint starts.
+        item_key = self._get_item_cache_key(index)
+        if item_key != self._action_layout_item_key:
+            if index.model():
+                self._set_item_cache_model(index.model())
+            self._action_layouts = {}
+            self._action_layout_item_key = item_key
+
+        rect = option.rect
+        layout_key = (
+            (rect.x(), rect.y(), rect.width(), rect.height()),
+            option.font.key(),
+            tuple(positions) if positions else None,
+            # The item state only affects which actions are shown when not returning all
+            (
+                True
+                if return_all
+                else (bool(self.is_selected(option)), bool(self.is_hover(option)))
+            ),
+        )
+
+        rects = self._action_layouts.get(layout_key)
+        if rects is None:
+            rects = []
+            item_action_data = self._get_actions(option, index, return_all, positions)
+
+            for position, actions in item_action_data.items():
+                # The offset will indicate where the next action bounding rect should start.
+                offset = self.action_item_margin
 
-        for position, actions in item_action_data.items():
-            # The offset will indicate where the next action bounding rect should start.
-            offset = self.action_item_margin
+                for action in actions:
+                    # Get the bounding rect for this action
+                    action_rect = self._get_action_rect(
+                        option, index, position, offset, action
+                    )
+                    # Increment the offset to get the next action boudning rect.
+                    offset += action_rect.width() + self.action_item_margin
+                    rects.append((action, action_rect))
 
-            for action in actions:
-                # Get the bounding rect for this action
-                rect = self._get_action_rect(option, index, position, offset, action)
-                # Increment the offset to get the next action boudning rect.
-                offset += rect.width() + self.action_item_margin
-                rects.append((action, rect))
+            self._action_layouts[layout_key] = rects
 
-        return rects
+        # Return copies of the rects, so that the cached layout cannot be modified.
+        return [(action, QtCore.QRect(action_rect)) for action, action_rect in rects]
 
     ######################################################################################################
     # Getter methods for bounding rects for item data. Override any of these methods to customize the size
@@ -2697,12 +3160,12 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
         rect = QtCore.QRect(option.rect)
 
         # Set the thumbnail rect size to the size of the thumbnail, after it has been scaled
-        # to fit to the option rect height.
+        # to fit to the option rect height. The scaled width is calculated from the thumbnail
+        # aspect ratio, to avoid scaling the thumbnail pixmap.
         height = option.rect.height()
-        thumbnail = thumbnail.scaledToHeight(height)
 
         if self.thumbnail_width < 0:
-            width = thumbnail.width()
+            width = round(thumbnail.width() * height / float(thumbnail.height()))
         else:
             width = self.thumbnail_width
 
@@ -3029,7 +3492,76 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
         :rtype: :class:`sgtk.platform.qt.QtGui.QPixmap`
         """
 
-        return icon.pixmap(self.pixmap_extent) if icon else None
+        if not icon:
+            return None
+
+        # Icons may scale their pixmap each time one is requested, so cache the converted pixmap
+        # to avoid the scaling, and to return the same pixmap (with the same cache key) each time.
+        key = "ViewItemDelegate_icon_%s_%s" % (icon.cacheKey(), self.pixmap_extent)
+        pixmap = QtGui.QPixmapCache.find(key)
+        if not pixmap:
+            pixmap = icon.pixmap(self.pixmap_extent)
+            QtGui.QPixmapCache.insert(key, pixmap)
+
+        return pixmap
+
+    def _get_scaled_thumbnail(self, thumbnail, size):
+        """
+        Return the thumbnail scaled to the given size. If the `thumbnail_uniform` property is
+        set, the thumbnail is scaled to fill the size, keeping the aspect ratio, and cropped to
+        be centered within the size. Otherwise, the thumbnail is scaled down to fit the size, if
+        larger, keeping the aspect ratio.
+
+        Scaled thumbnails are kept in the global pixmap cache, keyed by the thumbnail cache key
+        and the size, so that repainting an item does not scale its thumbnail again.
+
+        :param thumbnail: The thumbnail to scale.
+        :type thumbnail: :class:`sgtk.platform.qt.QtGui.QPixmap`
+        :param size: The size to scale the thumbnail to.
+        :type size: :class:`sgtk.platform.qt.QtCore.QSize`
+
+        :return: The scaled thumbnail.
+        :rtype: :class:`sgtk.platform.qt.QtGui.QPixmap`
+        """
+
+        width = size.width()
+        height = size.height()
+        key = "ViewItemDelegate_thumbnail_%s_%s_%s_%s" % (
+            thumbnail.cacheKey(),
+            width,
+            height,
+            int(bool(self.thumbnail_uniform)),
+        )
+        scaled_thumbnail = QtGui.QPixmapCache.find(key)
+        if scaled_thumbnail:
+            return scaled_thumbnail
+
+        if self.thumbnail_uniform:
+            # Scale the thumbnail to fill the available space. The thumbnail size may be
+            # bigger than the available space. If it is, crop the thumbnail to center it
+            # within the available space.
+            scaled_thumbnail = thumbnail.scaled(
+                width,
+                height,
+                QtCore.Qt.KeepAspectRatioByExpanding,
+                QtCore.Qt.SmoothTransformation,
+            )
+            x = max(0, (scaled_thumbnail.width() - width) // 2)
+            y = max(0, (scaled_thumbnail.height() - height) // 2)
+            if x or y:
+                scaled_thumbnail = scaled_thumbnail.copy(
+                    QtCore.QRect(x, y, width, height)
+                )
+        else:
+            # Scale the thumbnail to fit the available space.
+            scaled_thumbnail = thumbnail
+            if scaled_thumbnail.height() > height:
+                scaled_thumbnail = scaled_thumbnail.scaledToHeight(height)
+            if scaled_thumbnail.width() > width:
+                scaled_thumbnail = scaled_thumbnail.scaledToWidth(width)
+
+        QtGui.QPixmapCache.insert(key, scaled_thumbnail)
+        return scaled_thumbnail
 
     def _update_index_expand_state(self, option, index):
         """
@@ -3093,6 +3625,9 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
             expand_flag = not self.get_value(index, self.expand_role)
 
         index.model().setData(index, expand_flag, self.expand_role)
+        item_key = self._get_item_cache_key(index)
+        self._size_hint_cache.pop(item_key, None)
+        self._render_cache.pop(item_key, None)
         self.sizeHintChanged.emit(index)
 
     def _is_expanded(self, index):
@@ -3135,6 +3670,43 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
 
         return doc
 
+    def _get_cached_text_document(self, option, html, text_width=-1):
+        """
+        Return a QTextDocument with the HTML text laid out, created by `_create_text_document`.
+
+        Documents are cached, so that the same text is only laid out once while it is displayed. The
+        returned document is shared, and must not be modified.
+
+        :param option: The option used for rendering the item.
+        :type option: :class:`sgtk.platform.qt.QtGui.QStyleOptionViewItem`
+        :param html: The HTML text to set on the document.
+        :type html: str
+        :param text_width: The width to lay out the text within. The text is not wrapped if less than 0.
+        :type text_width: int
+
+        :return: The laid out QTextDocument object.
+        :rtype: :class:`sgtk.platform.qt.QtGui.QTextDocument`
+        """
+
+        key = (html, text_width, (self.font or option.font).key())
+
+        doc = self._text_document_cache.get(key)
+        if doc is not None:
+            self._text_document_cache.move_to_end(key)
+            return doc
+
+        doc = self._create_text_document(option)
+        if text_width >= 0:
+            doc.setTextWidth(text_width)
+        doc.setHtml(html)
+
+        if self._text_document_cache_size > 0:
+            self._text_document_cache[key] = doc
+            if len(self._text_document_cache) > self._text_document_cache_size:
+                self._text_document_cache.popitem(last=False)
+
+        return doc
+
     def _get_visible_lines_height(self, option, line_text="placeholder"):
         """
         Return the height based on the number of visible lines. A placeholder text is used
@@ -3153,13 +3725,11 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
         if self.visible_lines <= 0:
             return 0
 
-        # A QTextDocument is created to calculate an accurate height to what would be rendered.
-        doc = self._create_text_document(option)
-
         # Create an HTML text string that is the number of `visible_lines`
         html_lines = "<br/>".join([line_text] * self.visible_lines)
 
-        doc.setHtml(html_lines)
+        # A QTextDocument is used to calculate an accurate height to what would be rendered.
+        doc = self._get_cached_text_document(option, html_lines)
         return doc.size().height()
 
     def _html_text_width(self, option, text):
@@ -3177,8 +3747,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
 
         # To calculate the width of the HTML text, a QTextDocument is reuired to ensure
         # that any formatting on the text is applied when getting the text width.
-        doc = self._create_text_document(option)
-        doc.setHtml(text)
+        doc = self._get_cached_text_document(option, text)
 
         return doc.idealWidth()
 
@@ -3223,8 +3792,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
                     continue
 
                 # No need to elide the text, the text line height will remain the same.
-                text_line_doc = self._create_text_document(option)
-                text_line_doc.setHtml(text)
+                text_line_doc = self._get_cached_text_document(option, text)
 
                 # Append the text line height and substract the text doc margin since when the text
                 # is actually rendered, it will be rendered in one text document, instead of a
@@ -3318,8 +3886,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
                 else:
                     # Even though the text is not elided, still need to get the text document
                     # to measure the text height for clipping
-                    doc = self._create_text_document(option)
-                    doc.setHtml(text)
+                    doc = self._get_cached_text_document(option, text)
                     elided_text = None
 
                 if clip:
@@ -3378,8 +3945,7 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
         """
 
         # Use a QTextDocument to measure html/rich text width
-        doc = self._create_text_document(option)
-        doc.setHtml(text)
+        doc = self._get_cached_text_document(option, text)
 
         if target_width < 0 or text.startswith("<table"):
             # Just return the doc and text unaltered if the target_width is invalid or the text contains
@@ -3393,6 +3959,18 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
             # Nothing more to do, the text fits within the target_width
             return (doc, text)
 
+        # The elided text is cached with the document used to elide it, next to the laid out documents.
+        font_key = (self.font or option.font).key()
+        cache_key = ("elided", text, target_width, elide_mode, font_key)
+        elided = self._text_document_cache.get(cache_key)
+        if elided is not None:
+            self._text_document_cache.move_to_end(cache_key)
+            return elided
+
+        # The cached document is shared, elide the text in a new document.
+        doc = self._create_text_document(option)
+        doc.setHtml(text)
+
         # Depending on the elide mode, insert ellipses in the correct place
         cursor = QtGui.QTextCursor(doc)
         ellipses = ""
@@ -3441,7 +4019,13 @@ class ViewItemDelegate(QtGui.QStyledItemDelegate):
             if line_width == start_line_width:
                 break
 
-        return (doc, doc.toHtml())
+        elided = (doc, doc.toHtml())
+        if self._text_document_cache_size > 0:
+            self._text_document_cache[cache_key] = elided
+            if len(self._text_document_cache) > self._text_document_cache_size:
+                self._text_document_cache.popitem(last=False)
+
+        return elided
 
 
 class ViewItemAction(object):
@@ -0,0 +1,217 @@
+# Copyright (c) 2021 Autodesk Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the ShotGrid Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the ShotGrid Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk Inc.
+
+import sgtk
+
+utils = sgtk.platform.current_bundle().import_module("utils")
+
+
+class FilterDataCache(object):
+    """
+    Cache of model item data used by the filter proxy models to filter.
+
+    The data is stored per role, in column lists indexed by source row, for each parent in the
+    source model. A role column is built the first time data is requested for any row of the
+    parent, by pulling the data for all of the parent's rows at once. Filtering again (e.g. after
+    the filter value changes) then only reads from the column lists, instead of calling the
+    model's data method for every row.
+
+    The cache is kept in sync with the source model by listening to its signals: changed data
+    is updated in place, inserted and removed rows are added to and removed from the columns,
+    and the whole cache is cleared when the model is reset or its layout changes. Parents are
+    keyed by their row path, so the columns of the children of rows that shift when rows are
+    inserted or removed are dropped, and built again when next requested.
+    """
+
+    def __init__(self, model=None):
+        """
+        Constructor.
+
+        :param model: The source model to cache data for.
+        :type model: :class:`sgtk.platform.qt.QtCore.QAbstractItemModel`
+        """
+
+        # Mapping of parent row path to a dictionary of role to data column list:
+        #   parent_key -> {role -> [row 0 data, row 1 data, ...]}
+        self._columns = {}
+        self._model = None
+        self.set_model(model)
+
+    @property
+    def model(self):
+        """Get the model that the data is cached for."""
+        return self._model
+
+    def set_model(self, model):
+        """
+        Set the model to cache data for. This clears any data currently cached.
+
+        :param model: The source model to cache data for.
+        :type model: :class:`sgtk.platform.qt.QtCore.QAbstractItemModel`
+        """
+
+        if self._model:
+            try:
+                self._model.dataChanged.disconnect(self._on_data_changed)
+                self._model.rowsInserted.disconnect(self._on_rows_inserted)
+                self._model.rowsRemoved.disconnect(self._on_rows_removed)
+                self._model.rowsMoved.disconnect(self.clear)
+                self._model.layoutChanged.disconnect(self.clear)
+                self._model.modelReset.disconnect(self.clear)
+            except RuntimeError:
+                # Signals were never connected
+                pass
+
+        self.clear()
+        self._model = model
+
+        if self._model:
+            self._model.dataChanged.connect(self._on_data_changed)
+            self._model.rowsInserted.connect(self._on_rows_inserted)
+            self._model.rowsRemoved.connect(self._on_rows_removed)
+            self._model.rowsMoved.connect(self.clear)
+            self._model.layoutChanged.connect(self.clear)
+            self._model.modelReset.connect(self.clear)
+
+    def clear(self):
+        """Clear all cached data."""
+
+        self._columns = {}
+
+    def data(self, index, role):
+        """
+        Return the data for the index and role.
+
+        This is a drop-in replacement for `index.data(role)`, that reads the data from the
+        cache, building the role column for the index's parent if it does not exist yet.
+
+        :param index: The source model index to get the data for.
+        :type index: :class:`sgtk.platform.qt.QtCore.QModelIndex`
+        :param role: The item data role to get the data for.
+        :type role: :class:`sgtk.platform.qt.QtCore.Qt.ItemDataRole`
+
+        :return: The index data.
+        :rtype: any
+        """
+
+        parent = index.parent()
+        columns = self._columns.setdefault(self._get_parent_key(parent), {})
+        column = columns.get(role)
+        if column is None:
+            column = self._build_column(parent, role, 0, self._model.rowCount(parent))
+            columns[role] = column
+
+        return column[index.row()]
+
+    def _get_parent_key(self, parent):
+        """
+        Return the key used to look up the columns for the parent index.
+
+        :param parent: The parent index.
+        :type parent: :class:`sgtk.platform.qt.QtCore.QModelIndex`
+
+        :return: The row path of the parent, see `utils.get_index_row_path`.
+        :rtype: tuple
+        """
+
+        return utils.get_index_row_path(parent)
+
+    def _remove_shifted_columns(self, parent_key, start):
+        """
+        Remove the columns for all descendants of the parent's rows from `start` onwards. The
+        row paths of these descendants change when rows are inserted or removed at `start`.
+
+        :param parent_key: The key of the parent that rows were inserted into or removed from.
+        :type parent_key: tuple
+        :param start: The first row inserted or removed.
+        :type start: int
+        """
+
+        depth = len(parent_key)
+        self._columns = {
+            key: value
+            for key, value in self._columns.items()
+            if len(key) <= depth or key[:depth] != parent_key or key[depth] < start
+        }
+
+    def _build_column(self, parent, role, start, end):
+        """
+        Return the list of data for the role, for the rows of the parent in the range [start, end).
+
+        :param parent: The parent index of the rows.
+        :type parent: :class:`sgtk.platform.qt.QtCore.QModelIndex`
+        :param role: The item data role to get the data for.
+        :type role: :class:`sgtk.platform.qt.QtCore.Qt.ItemDataRole`
+        :param start: The first row.
+        :type start: int
+        :param end: The row after the last row.
+        :type end: int
+
+        :return: The data for the rows.
+        :rtype: list
+        """
+
+        model = self._model
+        return [model.index(row, 0, parent).data(role) for row in range(start, end)]
+
+    def _on_data_changed(self, top_left, bottom_right, roles=None):
+        """
+        Slot triggered when the model data changes. Update the cached data for the changed rows.
+        """
+
+        if not top_left.isValid() or not bottom_right.isValid():
+            self.clear()
+            return
+
+        parent = top_left.parent()
+        if parent != bottom_right.parent():
+            # This should never happen but just in case, clear the whole cache.
+            self.clear()
+            return
+
+        columns = self._columns.get(self._get_parent_key(parent))
+        if not columns:
+            return
+
+        start = top_left.row()
+        end = bottom_right.row() + 1
+        for role, column in columns.items():
+            if roles and role not in roles:
+                continue
+            column[start:end] = self._build_column(parent, role, start, end)
+
+    def _on_rows_inserted(self, parent, start, end):
+        """
+        Slot triggered when rows are inserted into the model. Add the new rows to the columns.
+        """
+
+        parent_key = self._get_parent_key(parent)
+        self._remove_shifted_columns(parent_key, start)
+
+        columns = self._columns.get(parent_key)
+        if not columns:
+            return
+
+        for role, column in columns.items():
+            column[start:start] = self._build_column(parent, role, start, end + 1)
+
+    def _on_rows_removed(self, parent, start, end):
+        """
+        Slot triggered when rows are removed from the model. Remove the rows from the columns.
+        """
+
+        parent_key = self._get_parent_key(parent)
+        # Removes the columns of the removed rows' children too.
+        self._remove_shifted_columns(parent_key, start)
+
+        columns = self._columns.get(parent_key)
+        if columns:
+            for column in columns.values():
+                del column[start : end + 1]
@@ -100,6 +100,17 @@ class FilterDefinition(object):
         # guaranteed to be loaded in the model at time of building the filters.
         self._tree_level = None
 
+        # The function used to get datetime buckets while building the filters. This is set
+        # on each build, so that the datetime bucket boundaries are only computed once per build.
+        self.__datetime_bucketer = None
+
+        # Flag indicating that all filter groups have been found during a groups only build.
+        self.__groups_complete = False
+
+        # Whether or not to create the QIcon objects for the filters. Icons cannot be created
+        # when the filters are built in a background thread.
+        self._create_icons = True
+
     @property
     def filter_roles(self):
         """
@@ -338,14 +349,38 @@ class FilterDefinition(object):
         self._definition = {}
 
     @sgtk.LogManager.log_timing
-    def build(self, groups_only=False):
-        """Build the filter definition based on the model data."""
+    def build(self, groups_only=False, field_ids=None):
+        """
+        Build the filter definition based on the model data.
+
+        The model data is traversed once. If `groups_only` is True and the accepted fields are
+        known, then the filters are only built until all filter groups have been found, except
+        for the filters of the given `field_ids`, which are built from the whole model. This is
+        the same as building the groups only and then updating the given filters, but without
+        traversing the model twice.
+
+        :param groups_only: True to only build the filter groupings, when possible.
+        :type groups_only: bool
+        :param field_ids: The filter group field ids that must have all of their filters built.
+        :type field_ids: List[str]
+        """
 
         # Clear the existing filters definitions before rebuilding it.
         self.clear()
 
+        self.__datetime_bucketer = FilterItem.get_datetime_bucketer()
+        self.__groups_complete = False
+
         # Recursively go through each model item to extract the data to built the filters.
-        self.__build_filters(QtCore.QModelIndex(), groups_only=groups_only)
+        self._begin_model_traversal()
+        try:
+            self.__build_filters(
+                QtCore.QModelIndex(),
+                groups_only=groups_only,
+                field_ids=list(field_ids or []),
+            )
+        finally:
+            self._end_model_traversal()
 
     @sgtk.LogManager.log_timing
     def update_filters(self, field_ids):
@@ -363,6 +398,7 @@ class FilterDefinition(object):
         """
 
         update_ids = []
+        self.__datetime_bucketer = FilterItem.get_datetime_bucketer()
 
         for field_id in field_ids:
             if field_id not in self._definition:
@@ -377,7 +413,11 @@ class FilterDefinition(object):
                 filter_values[value_id]["count"] = 0
 
         # Rebuild the specified filters.
-        self.__build_filters_by_id(update_ids)
+        self._begin_model_traversal()
+        try:
+            self.__build_filters_by_id(update_ids)
+        finally:
+            self._end_model_traversal()
 
         # Remove any filters that have become empty.
         for field_id in update_ids:
@@ -389,6 +429,58 @@ class FilterDefinition(object):
                 if filter_data.get("count", 0) > 0
             }
 
+    def create_snapshot(self, field_ids):
+        """
+        Create a snapshot of the filter definition, and the model data that is needed to update
+        the given filters.
+
+        The snapshot must be created in the main thread, but it does not access the model or
+        any widgets once created, so it can be used to update the filters in a background
+        thread. Once updated, the filters are applied back to this definition with
+        `apply_snapshot` in the main thread, e.g.:
+
+            snapshot = filter_definition.create_snapshot(field_ids)
+            # In a background thread
+            snapshot.update_filters(field_ids)
+            # Back in the main thread
+            filter_definition.apply_snapshot(snapshot, field_ids)
+
+        :param field_ids: The filter group field ids of the filters to update.
+        :type field_ids: List[str]
+
+        :return: The snapshot of this filter definition.
+        :rtype: FilterDefinitionSnapshot
+        """
+
+        return FilterDefinitionSnapshot(self, field_ids)
+
+    def apply_snapshot(self, snapshot, field_ids):
+        """
+        Update the given filters from a snapshot created by `create_snapshot`. This must be
+        called from the main thread.
+
+        :param snapshot: The snapshot with the updated filters.
+        :type snapshot: FilterDefinitionSnapshot
+        :param field_ids: The filter group field ids of the filters to update.
+        :type field_ids: List[str]
+        """
+
+        for field_id in field_ids:
+            if field_id not in self._definition:
+                # The field has been removed since the snapshot was created.
+                continue
+
+            field_data = snapshot.get_field_data(field_id)
+            if field_data is None:
+                continue
+
+            # Create the icons that could not be created in the background thread.
+            for filter_data in field_data.get("values", {}).values():
+                if filter_data.get("icon_path") and not filter_data.get("icon"):
+                    filter_data["icon"] = QtGui.QIcon(filter_data["icon_path"])
+
+            self._definition[field_id] = field_data
+
     ###############################################################################################
     # Private methods
     ###############################################################################################
@@ -492,7 +584,7 @@ class FilterDefinition(object):
 
         return self._filters_accept_index(index, field_id)
 
-    def __build_filters(self, root_index, level=0, groups_only=False):
+    def __build_filters(self, root_index, level=0, groups_only=False, field_ids=None):
         """
         Build the filters definition by starting at the given root index, and recursing through all
         child indexes. For each index traversed, the object's internal `_definition` member will be
@@ -504,6 +596,11 @@ class FilterDefinition(object):
         :type root_index: :class:`sgtk.platform.qt.QtCore.QModelIndex`
         :param level: The level that the root_index is within the model (e.g this is mostly for tree
                       models, for list models all indexes will have level 0).
+        :param groups_only: True to stop building filters once all filter groups are found.
+        :type groups_only: bool
+        :param field_ids: The filter group field ids to keep building filters for, once all
+            filter groups are found.
+        :type field_ids: List[str]
         """
 
         source_model = self.get_source_model()
@@ -511,6 +608,10 @@ class FilterDefinition(object):
             return
 
         for row in range(source_model.rowCount(root_index)):
+            if self.__groups_complete and not field_ids:
+                # Nothing left to build.
+                return
+
             index = source_model.index(row, 0, root_index)
 
             if not self._proxy_filter_accepts_row(index):
@@ -525,11 +626,16 @@ class FilterDefinition(object):
             if (self.tree_level and level == self.tree_level) or (
                 not self.tree_level and source_model.rowCount(index) <= 0
             ):
-                # A filter will be added for each index and for each filter role defined.
-                for role in self.filter_roles:
-                    self.__add_filter_from_index(index, role)
+                if self.__groups_complete:
+                    # All groups have been found, only update the requested filters.
+                    for field_id in field_ids:
+                        self.__add_filter_by_id(field_id, index)
+                else:
+                    # A filter will be added for each index and for each filter role defined.
+                    for role in self.filter_roles:
+                        self.__add_filter_from_index(index, role)
 
-            if groups_only and self.accept_fields:
+            if groups_only and self.accept_fields and not self.__groups_complete:
                 # We only care to build filter definition such that we have the groupings. Individual filters
                 # will be updated once they are visible/active.
                 # We can only do this if we know what filters we want though, e.g. accepted filter are defined.
@@ -537,9 +643,9 @@ class FilterDefinition(object):
                     self.accept_fields.difference(self.ignore_fields)
                 ):
                     # We found them all.
-                    return
+                    self.__groups_complete = True
 
-            self.__build_filters(index, level + 1)
+            self.__build_filters(index, level + 1, groups_only, field_ids)
 
     def __build_filters_by_id(
         self, field_ids, root_index=QtCore.QModelIndex(), level=0
@@ -897,9 +1003,14 @@ class FilterDefinition(object):
                 value_name = val.get("name", str(val))
                 filter_value = val
                 icon_path = val.get("icon", None)
-                icon = QtGui.QIcon(icon_path) if icon_path else None
+                icon = (
+                    QtGui.QIcon(icon_path) if icon_path and self._create_icons else None
+                )
             elif data_type == FilterItem.FilterType.DATETIME:
-                datetime_bucket = FilterItem.get_datetime_bucket(value)
+                if self.__datetime_bucketer:
+                    datetime_bucket = self.__datetime_bucketer(value)
+                else:
+                    datetime_bucket = FilterItem.get_datetime_bucket(value)
                 value_id = datetime_bucket
                 value_name = str(value_id)
                 filter_value = datetime_bucket
@@ -946,6 +1057,109 @@ class FilterDefinition(object):
                     "sg_data": sg_data,
                 }
 
+    def _create_model_snapshot(self):
+        """
+        Create a snapshot of the source model data that the filters are built from.
+
+        :return: The model snapshot.
+        :rtype: _FilterModelSnapshot
+        """
+
+        source_model = self.get_source_model()
+        try:
+            entity_type = source_model.get_entity_type()
+        except AttributeError:
+            entity_type = None
+
+        snapshot = _FilterModelSnapshot(entity_type)
+        if not source_model:
+            return snapshot
+
+        self._begin_model_traversal()
+        try:
+            self.__snapshot_rows(
+                source_model, QtCore.QModelIndex(), None, snapshot.rows
+            )
+        finally:
+            self._end_model_traversal()
+
+        return snapshot
+
+    def __snapshot_rows(self, source_model, root_index, root_row, rows, level=0):
+        """
+        Recurse through the model data to snapshot the rows of the given root index.
+
+        The snapshot follows the same rules as building the filters: the children of rows
+        that are not accepted by the proxy model are not traversed, and data is only
+        extracted from the leaf rows.
+
+        :param source_model: The model to snapshot.
+        :type source_model: :class:`sgtk.platform.qt.QtGui.QAbstractItemModel`
+        :param root_index: The index to snapshot the child rows of.
+        :type root_index: :class:`sgtk.platform.qt.QtCore.QModelIndex`
+        :param root_row: The snapshot row for the root index.
+        :type root_row: _FilterModelSnapshotRow
+        :param rows: The list to add the snapshot rows to.
+        :type rows: list
+        :param level: The level that the root_index is within the model.
+        :type level: int
+        """
+
+        for row in range(source_model.rowCount(root_index)):
+            index = source_model.index(row, 0, root_index)
+            snapshot_row = _FilterModelSnapshotRow(row, root_row)
+            rows.append(snapshot_row)
+
+            snapshot_row.accepted = self._proxy_filter_accepts_row(index)
+            if not snapshot_row.accepted:
+                continue
+
+            if (self.tree_level and level == self.tree_level) or (
+                not self.tree_level and source_model.rowCount(index) <= 0
+            ):
+                snapshot_row.role_data = {
+                    role: index.data(role) for role in self.filter_roles
+                }
+
+            self.__snapshot_rows(
+                source_model, index, snapshot_row, snapshot_row.children, level + 1
+            )
+
+    def _get_filters_accept_func(self, field_id):
+        """
+        Return a function that checks if an index associated with the field is accepted, the
+        same as `_filters_accept_index`. This is used to check acceptance when the filters are
+        updated from a snapshot in a background thread, so the function returned must be safe
+        to call from a background thread.
+
+        Default implementation returns None, to accept all indexes.
+
+        :param field_id: The filter field (group) associated with the index.
+        :type field_id: str
+
+        :return: The function that takes an index and returns True if it is accepted, or None
+            to accept all indexes.
+        :rtype: function | None
+        """
+
+        return None
+
+    def _begin_model_traversal(self):
+        """
+        Called before the model data is traversed to build the filters.
+
+        Default implementation does nothing. Override this method to set up any state that is
+        needed for the whole traversal, instead of for each index (e.g. in `_proxy_filter_accepts_row`).
+        """
+
+    def _end_model_traversal(self):
+        """
+        Called after the model data has been traversed to build the filters.
+
+        Default implementation does nothing. Override this method to restore any state set up
+        in `_begin_model_traversal`.
+        """
+
     def _proxy_filter_accepts_row(self, index):
         """
         Return True if the proxy filter model accepts this index row.
@@ -1032,6 +1246,9 @@ class FilterMenuFiltersDefinition(FilterDefinition):
         # _filters_accept_index method.
         self.__current_menu_filters_by_field = {}
 
+        # The proxy model filter items that are disabled while the model is traversed.
+        self.__disabled_proxy_filter_items = None
+
     def clear(self):
         """Override the base method."""
 
@@ -1044,6 +1261,42 @@ class FilterMenuFiltersDefinition(FilterDefinition):
         self.__current_menu_filters_by_field = {}
         super().update_filters(field_ids)
 
+    def create_snapshot(self, field_ids):
+        """Override the base method."""
+
+        # Ensure the snapshot captures the current menu filters.
+        self.__current_menu_filters_by_field = {}
+        return super().create_snapshot(field_ids)
+
+    def _begin_model_traversal(self):
+        """
+        Override the base method.
+
+        Disable the proxy model filter items for the whole traversal, instead of disabling and
+        restoring them for each index checked in `_proxy_filter_accepts_row`.
+        """
+
+        if not self._proxy_model:
+            return
+
+        self.__disabled_proxy_filter_items = self._proxy_model.filter_items
+        self._proxy_model.set_filter_items([], emit_signal=False)
+
+    def _end_model_traversal(self):
+        """
+        Override the base method.
+
+        Restore the proxy model filter items disabled in `_begin_model_traversal`.
+        """
+
+        if self.__disabled_proxy_filter_items is None:
+            return
+
+        self._proxy_model.set_filter_items(
+            self.__disabled_proxy_filter_items, emit_signal=False
+        )
+        self.__disabled_proxy_filter_items = None
+
     def _proxy_filter_accepts_row(self, index):
         """
         Return True if the proxy filter model accepts this index row.
@@ -1062,6 +1315,10 @@ class FilterMenuFiltersDefinition(FilterDefinition):
         assert hasattr(self._proxy_model, "filter_items"), "Invalid proxy model"
         assert hasattr(self._proxy_model, "set_filter_items"), "Invalid proxy model"
 
+        if self.__disabled_proxy_filter_items is not None:
+            # The filters have already been disabled for the model traversal.
+            return self._proxy_model.filterAcceptsRow(index.row(), index.parent())
+
         # Temporarily disable the filters, so that when the index is checked against the proxy model
         # for acceptance, that the filtrs defined from this menu are not applied. This is because
         # there may be other filters applied outside of this menu, and we only want to check those
@@ -1092,16 +1349,221 @@ class FilterMenuFiltersDefinition(FilterDefinition):
         :rtype: bool
         """
 
+        accepts = self._get_filters_accept_func(field_id)
+        if accepts:
+            if not accepts(index):
+                return False
+
+        return True
+
+    def _get_filters_accept_func(self, field_id):
+        """
+        Override the base method.
+
+        Return the current menu filters, omitting the filters from the given field, compiled
+        into a single function. The compiled filters do not access the menu, so they are safe
+        to call from a background thread.
+
+        :param field_id: Filters that belong to the field_id group are ignored when checking
+                         acceptance.
+        :type field_id: str
+
+        :return: The function that takes an index and returns True if it is accepted, or None
+            if there are no filters to apply.
+        :rtype: function | None
+        """
+
         if field_id in self.__current_menu_filters_by_field:
-            filters = self.__current_menu_filters_by_field.get(field_id)
-        else:
-            filters = self._filter_menu.get_current_filters(
-                exclude_choices_from_fields=[field_id]
-            )
-            self.__current_menu_filters_by_field[field_id] = filters
+            return self.__current_menu_filters_by_field[field_id]
 
-        if filters:
-            if not FilterItem.do_filter(index, filters):
-                return False
+        filters = self._filter_menu.get_current_filters(
+            exclude_choices_from_fields=[field_id]
+        )
+        # Compile the filters once, since they will be applied to every index for the field.
+        accepts = FilterItem.compile_filter(filters) if filters else None
+        self.__current_menu_filters_by_field[field_id] = accepts
+        return accepts
 
+
+class FilterDefinitionSnapshot(FilterDefinition):
+    """
+    A snapshot of a FilterDefinition, that can update its filters in a background thread.
+
+    On creation (in the main thread), the definition settings, the definition data for the
+    filters to update, the filters used to check acceptance and the source model data that the
+    filters are built from, are all copied. Updating the snapshot filters only accesses this
+    copied data, and not the model or the filter menu widgets.
+
+    Use `FilterDefinition.create_snapshot` to create a snapshot.
+    """
+
+    def __init__(self, filter_definition, field_ids):
+        """
+        Constructor.
+
+        :param filter_definition: The filter definition to create the snapshot from.
+        :type filter_definition: FilterDefinition
+        :param field_ids: The filter group field ids of the filters that will be updated.
+        :type field_ids: List[str]
+        """
+
+        super().__init__()
+
+        self.filter_roles = list(filter_definition.filter_roles)
+        self.accept_fields = set(filter_definition.accept_fields)
+        self.ignore_fields = set(filter_definition.ignore_fields)
+        self.use_fully_qualified_name = filter_definition.use_fully_qualified_name
+        self.default_sg_project_id = filter_definition.default_sg_project_id
+        self.tree_level = filter_definition.tree_level
+        self._create_icons = False
+
+        # Copy the field data so that the filter definition is not modified in the background.
+        for field_id in field_ids:
+            field_data = filter_definition.get_field_data(field_id)
+            if field_data is None:
+                continue
+
+            field_data = dict(field_data)
+            field_data["values"] = {
+                value_id: dict(filter_data)
+                for value_id, filter_data in field_data.get("values", {}).items()
+            }
+            self._definition[field_id] = field_data
+
+        self._filters_accept_funcs = {
+            field_id: filter_definition._get_filters_accept_func(field_id)
+            for field_id in self._definition
+        }
+        self._model_snapshot = filter_definition._create_model_snapshot()
+
+    def get_source_model(self):
+        """
+        Override the base method to return the model snapshot.
+
+        :return: The snapshot of the source model data.
+        :rtype: _FilterModelSnapshot
+        """
+
+        return self._model_snapshot
+
+    def _proxy_filter_accepts_row(self, index):
+        """
+        Override the base method to return the acceptance captured in the model snapshot.
+
+        :param index: The model snapshot row to check acceptance on.
+        :type index: _FilterModelSnapshotRow
+        :return: True if accepted, else False
+        :rtype: bool
+        """
+
+        return index.accepted
+
+    def _filters_accept_index(self, index, field_id):
+        """
+        Override the base method to use the filters captured when creating the snapshot.
+
+        :param index: The model snapshot row to check acceptance on.
+        :type index: _FilterModelSnapshotRow
+        :param field_id: The filter field (group) associated with the index.
+        :type field_id: str
+
+        :return: True if the index is accepted, else False
+        :rtype: bool
+        """
+
+        accepts = self._filters_accept_funcs.get(field_id)
+        if accepts:
+            return accepts(index)
+
+        return True
+
+
+class _FilterModelSnapshotRow(object):
+    """
+    A row of model data captured by a _FilterModelSnapshot. This provides the subset of the
+    QModelIndex interface that is used to build the filters.
+    """
+
+    __slots__ = ("_row", "_parent", "accepted", "role_data", "children")
+
+    def __init__(self, row, parent):
+        """
+        Constructor.
+
+        :param row: The row in the model.
+        :type row: int
+        :param parent: The parent row, or None for top level rows.
+        :type parent: _FilterModelSnapshotRow
+        """
+
+        self._row = row
+        self._parent = parent
+        # True if the row is accepted by the proxy model.
+        self.accepted = False
+        # Mapping of filter role to the row data for the role.
+        self.role_data = None
+        # The child rows.
+        self.children = []
+
+    def row(self):
+        """Return the row in the model."""
+        return self._row
+
+    def parent(self):
+        """Return the parent row, or None for top level rows."""
+        return self._parent
+
+    def isValid(self):
+        """Return True, snapshot rows are always valid."""
         return True
+
+    def data(self, role):
+        """Return the row data for the role."""
+        if self.role_data is None:
+            return None
+        return self.role_data.get(role)
+
+
+class _FilterModelSnapshot(object):
+    """
+    A snapshot of the model data used to build the filters. This provides the subset of the
+    QAbstractItemModel interface that is used to build the filters.
+    """
+
+    def __init__(self, entity_type=None):
+        """
+        Constructor.
+
+        :param entity_type: The PTR entity type of the model, if the model has one.
+        :type entity_type: str
+        """
+
+        self._entity_type = entity_type
+        # The top level rows.
+        self.rows = []
+
+    def get_entity_type(self):
+        """
+        Return the PTR entity type of the model.
+
+        :raises AttributeError: If the model does not have an entity type, the same as if the
+            model did not have this method.
+        """
+
+        if self._entity_type is None:
+            raise AttributeError("Model snapshot has no entity type")
+        return self._entity_type
+
+    def rowCount(self, parent):
+        """Return the number of child rows of the parent."""
+        return len(self.__get_rows(parent))
+
+    def index(self, row, column, parent):
+        """Return the child row of the parent."""
+        return self.__get_rows(parent)[row]
+
+    def __get_rows(self, parent):
+        """Return the child rows of the parent. An invalid index gives the top level rows."""
+        if isinstance(parent, _FilterModelSnapshotRow):
+            return parent.children
+        return self.rows
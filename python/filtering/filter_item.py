@@ -7,7 +7,9 @@
 # By accessing, using, copying or modifying this work you indicate your
 # agreement to the ShotGrid Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Autodesk Inc.
+import bisect
 from datetime import datetime, timedelta
+import functools
 import numbers
 
 import sgtk
@@ -476,6 +478,65 @@ class FilterItem(object):
         # been accepted immediately if any filters accepted it.
         return False
 
+    @classmethod
+    def compile_filter(cls, filter_items, op=FilterOp.AND, data_getter=None):
+        """
+        Compile the list of filter items into a single predicate function.
+
+        The returned function takes an index and returns True if the index is accepted, in the
+        same way as `do_filter`. Compiling the filters up front resolves the filter function for
+        each filter item, and pre-processes the filter values (e.g. lowercasing search strings),
+        so that this work is not repeated for every index that is filtered.
+
+        The compiled filter is a snapshot of the filter items at the time of compiling; if any
+        of the filter items are modified, the filter must be compiled again.
+
+        :param filter_items: The list of filter items used to check acceptance.
+        :type filter_items: list<FilterItem>
+        :param op: The filter operation to apply with checking acceptance.
+        :type op: FilterOp
+        :param data_getter: Optional function that takes an index and a role, and returns the
+            index data for the role. This is used instead of the index's data method to extract
+            the data for filter items that have a filter role (e.g. to read from a cache).
+        :type data_getter: function
+
+        :return: A function that takes an index and returns True if it is accepted, else False.
+        :rtype: function
+        """
+
+        if not cls.is_group_op(op):
+            raise ValueError("Invalid filter group operation {}".format(op))
+
+        predicates = [
+            filter_item.compile(data_getter=data_getter) for filter_item in filter_items
+        ]
+
+        if not predicates:
+            # Accept if the operation is AND, reject if the operation is OR, same as do_filter
+            accepted = op == cls.FilterOp.AND
+            return lambda index: accepted
+
+        if len(predicates) == 1:
+            return predicates[0]
+
+        if op == cls.FilterOp.AND:
+
+            def _accepts_all(index):
+                for predicate in predicates:
+                    if not predicate(index):
+                        return False
+                return True
+
+            return _accepts_all
+
+        def _accepts_any(index):
+            for predicate in predicates:
+                if predicate(index):
+                    return True
+            return False
+
+        return _accepts_any
+
     @classmethod
     def map_from_sg_data_type(cls, sg_data_type):
         """
@@ -500,6 +561,9 @@ class FilterItem(object):
         This attempts to get the datetime bucket for the given datetime passed. Datetime buckets
         follow the same logic as the ShotGrid Web UI.
 
+        To get the buckets for many datetime values, use `get_datetime_buckets` or
+        `get_datetime_bucketer` instead, which only compute the current time once.
+
         NOTE should we move this to shotgun_globals.date_time module?
 
         :param dt: The datetime value to process
@@ -509,40 +573,128 @@ class FilterItem(object):
         :rtype: str
         """
 
-        if dt is None:
-            return "No Date"
+        return FilterItem.get_datetime_bucketer()(dt)
 
-        if isinstance(dt, str):
-            if dt in FilterItem.DATETIME_BUCKETS:
-                return dt
+    @staticmethod
+    def get_datetime_buckets(values, now=None):
+        """
+        Get the datetime bucket for each of the given datetime values. See `get_datetime_bucket`.
 
-            dt = datetime.strptime(dt, "%Y-%m-%d")
-            dt.replace(tzinfo=sg_timezone.LocalTimezone())
+        :param values: The datetime values to process
+        :type values: Iterable[str | float | datetime.datetime]
+        :param now: The current datetime to bucket the values relative to. Defaults to now.
+        :type now: datetime.datetime
 
-        if isinstance(dt, float):
-            dt = datetime.fromtimestamp(dt, tz=sg_timezone.LocalTimezone())
+        :return: The datetime bucket for each value, in the same order as the values.
+        :rtype: List[str]
+        """
 
-        if not isinstance(dt, datetime):
-            raise TypeError(
-                "Cannot convert value type '{}' to datetime".format(type(dt))
-            )
+        bucketer = FilterItem.get_datetime_bucketer(now)
+        return [bucketer(dt) for dt in values]
+
+    @staticmethod
+    def get_datetime_bucketer(now=None):
+        """
+        Return a function that gets the datetime bucket for a datetime value, relative to the
+        given current datetime. See `get_datetime_bucket`.
+
+        The bucket boundaries are computed once (and cached per day), so the returned function
+        can be used to efficiently classify many values; each value is classified by a binary
+        search over the bucket boundaries.
+
+        :param now: The current datetime to bucket the values relative to. Defaults to now.
+        :type now: datetime.datetime
+
+        :return: A function that takes a datetime value and returns its datetime bucket.
+        :rtype: function
+        """
+
+        if now is None:
+            now = datetime.now(sg_timezone.LocalTimezone())
+
+        edges, buckets = FilterItem._get_datetime_bucket_edges(now.date())
+
+        def _get_bucket(dt):
+            if dt is None:
+                return "No Date"
+
+            if isinstance(dt, str):
+                if dt in FilterItem.DATETIME_BUCKETS:
+                    return dt
+
+                dt = datetime.strptime(dt, "%Y-%m-%d")
+                dt.replace(tzinfo=sg_timezone.LocalTimezone())
+
+            if isinstance(dt, float):
+                dt = datetime.fromtimestamp(dt, tz=sg_timezone.LocalTimezone())
+
+            if not isinstance(dt, datetime):
+                raise TypeError(
+                    "Cannot convert value type '{}' to datetime".format(type(dt))
+                )
+
+            return buckets[bisect.bisect_right(edges, dt.toordinal())]
+
+        return _get_bucket
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4)
+    def _get_datetime_bucket_edges(today):
+        """
+        Compute the datetime bucket boundaries relative to the given day.
+
+        The result is a tuple of the sorted boundary day ordinals and the buckets, such that
+        a day with ordinal `d` falls into the bucket `buckets[bisect_right(edges, d)]`.
+
+        :param today: The current day.
+        :type today: datetime.date
+
+        :return: The bucket boundaries and the buckets.
+        :rtype: tuple<list<int>, list<str>>
+        """
+
+        # Buckets only change within the Long Ago and Far Future boundaries, classify every
+        # day in between and record each day that the bucket changes.
+        days_range = 30 * 4 + 1
+        first_day = today - timedelta(days=days_range)
+        edges = []
+        buckets = [FilterItem._get_date_bucket(first_day, today)]
+        for offset in range(-days_range + 1, days_range + 1):
+            day = today + timedelta(days=offset)
+            bucket = FilterItem._get_date_bucket(day, today)
+            if bucket != buckets[-1]:
+                edges.append(day.toordinal())
+                buckets.append(bucket)
+
+        return (edges, buckets)
+
+    @staticmethod
+    def _get_date_bucket(date_value, today):
+        """
+        Return the datetime bucket that the date falls into, relative to the given day.
+
+        :param date_value: The date to get the bucket for.
+        :type date_value: datetime.date
+        :param today: The current day.
+        :type today: datetime.date
+
+        :return: The datetime bucket.
+        :rtype: str
+        """
 
         # NOTE
         # Date comparisons - the ordering of the comparisons affect the result
         # The return value must be one of the values defined in DATETIME_BUCKETS
         #
-        now = datetime.now(sg_timezone.LocalTimezone())
-        today = now.date()
-        date_value = dt.date()
         if date_value == today:
             return "Today"
 
-        yesterday = now - timedelta(days=1)
-        if date_value == yesterday.date():
+        yesterday = today - timedelta(days=1)
+        if date_value == yesterday:
             return "Yesterday"
 
-        tomorrow = now + timedelta(days=1)
-        if date_value == tomorrow.date():
+        tomorrow = today + timedelta(days=1)
+        if date_value == tomorrow:
             return "Tomorrow"
 
         # ShotGrid Web UI calculates Far Future as more than 120 days (30 days times 4, roughly 4 months)
@@ -590,7 +742,7 @@ class FilterItem(object):
         assert (
             False
         ), "Datetime value was not able to be converted to bucket, will default to plain datetime string"
-        return dt.strftime("%x")
+        return date_value.strftime("%x")
 
     def is_group(self):
         """
@@ -602,6 +754,179 @@ class FilterItem(object):
             self.filter_op
         )
 
+    def get_structure_key(self):
+        """
+        Return a hashable key that represents the structure of this filter item; its id, type,
+        operation, role and value. For group filter items, the key includes the keys of the
+        group filters. Two filter items with the same key will filter data the same way, so
+        the key can be used to check if filtering has changed.
+
+        :return: The structure key for this filter item.
+        :rtype: tuple
+        """
+
+        if self.is_group():
+            value_key = tuple(
+                filter_item.get_structure_key() for filter_item in self.filters or []
+            )
+        else:
+            value_key = self._get_hashable_value(self.filter_value)
+
+        return (
+            self.id,
+            self.filter_type,
+            self.filter_op,
+            self.filter_role,
+            value_key,
+        )
+
+    @classmethod
+    def get_filters_structure_key(cls, filter_items, op=FilterOp.AND):
+        """
+        Return a hashable key that represents the structure of the list of filter items, when
+        combined with the given operation. The key has the same form as the key of a group
+        filter item, see :meth:`get_structure_key`.
+
+        :param filter_items: The filter items.
+        :type filter_items: list<FilterItem>
+        :param op: The operation used to combine the filter items.
+        :type op: FilterItem.FilterOp
+
+        :return: The structure key for the filter items.
+        :rtype: tuple
+        """
+
+        return (
+            None,
+            cls.FilterType.GROUP,
+            op,
+            None,
+            tuple(
+                filter_item.get_structure_key() for filter_item in filter_items or []
+            ),
+        )
+
+    @classmethod
+    def is_structure_refinement(cls, structure_key, other_structure_key):
+        """
+        Return True if the filter with the given structure key is a refinement of the other
+        filter; that is, any data accepted by the filter is also accepted by the other filter.
+
+        This can be used to avoid re-filtering data when the filter changes, for example when
+        more characters are typed into a search filter, only the data accepted by the previous
+        filter needs to be checked again.
+
+        This check is conservative: False is returned if the relationship between the filters
+        cannot be determined. Empty groups are considered to accept everything.
+
+        :param structure_key: The structure key of the filter, see :meth:`get_structure_key`.
+        :type structure_key: tuple
+        :param other_structure_key: The structure key of the other filter.
+        :type other_structure_key: tuple
+
+        :return: True if the filter is known to be a refinement of the other filter.
+        :rtype: bool
+        """
+
+        if structure_key == other_structure_key:
+            return True
+
+        filter_id, filter_type, filter_op, filter_role, value = structure_key
+        other_id, other_type, other_op, other_role, other_value = other_structure_key
+
+        if other_type == cls.FilterType.GROUP and not other_value:
+            # The other filter accepts everything.
+            return True
+
+        if (filter_type, filter_op, filter_role) != (other_type, other_op, other_role):
+            return False
+
+        if filter_type == cls.FilterType.GROUP:
+            if not value:
+                # The filter accepts everything, but the other filter does not.
+                return False
+
+            if filter_op == cls.FilterOp.AND:
+                # Each of the other filters must be refined by one of the filters.
+                return all(
+                    any(cls.is_structure_refinement(key, other_key) for key in value)
+                    for other_key in other_value
+                )
+
+            if filter_op == cls.FilterOp.OR:
+                # Each of the filters must refine one of the other filters.
+                return all(
+                    any(
+                        cls.is_structure_refinement(key, other_key)
+                        for other_key in other_value
+                    )
+                    for key in value
+                )
+
+            return False
+
+        if filter_id != other_id:
+            # The filters may filter different data, e.g. filters that extract the data
+            # with a data_func do not have a role to compare.
+            return False
+
+        if filter_type == cls.FilterType.STR and filter_op in (
+            cls.FilterOp.IN,
+            cls.FilterOp.NOT_IN,
+        ):
+            value = "" if value is None else value
+            other_value = "" if other_value is None else other_value
+            if not isinstance(value, str) or not isinstance(other_value, str):
+                return False
+
+            # String matching is case insensitive.
+            value = value.lower()
+            other_value = other_value.lower()
+
+            if filter_op == cls.FilterOp.IN:
+                # Any string that contains the value also contains the other value.
+                return other_value in value
+
+            # Any string that does not contain the value also does not contain the other value.
+            return value in other_value
+
+        return False
+
+    @classmethod
+    def _get_hashable_value(cls, value):
+        """
+        Convert the value into a hashable value, converting any lists and dictionaries it
+        contains into tuples.
+
+        :param value: The value to convert.
+        :type value: any
+
+        :return: The hashable value.
+        :rtype: any
+        """
+
+        if isinstance(value, dict):
+            return (
+                dict,
+                tuple(
+                    sorted(
+                        ((k, cls._get_hashable_value(v)) for k, v in value.items()),
+                        key=lambda item: str(item[0]),
+                    )
+                ),
+            )
+
+        if isinstance(value, (list, tuple)):
+            return (list, tuple(cls._get_hashable_value(v) for v in value))
+
+        try:
+            hash(value)
+        except TypeError:
+            # Fall back to the string representation for any other unhashable values.
+            return (str, str(value))
+
+        return value
+
     def get_index_data(self, index):
         """
         Return the index's data based on the filter item. The index data will be first
@@ -653,6 +978,70 @@ class FilterItem(object):
 
         return filter_func(self._sanitize_filter_value(data))
 
+    def compile(self, data_getter=None):
+        """
+        Compile this filter item into a predicate function that takes an index and returns True
+        if this filter item accepts it. See `compile_filter` for more details.
+
+        :param data_getter: Optional function that takes an index and a role, and returns the
+            index data for the role. See `compile_filter` for more details.
+        :type data_getter: function
+
+        :return: A function that takes an index and returns True if it is accepted, else False.
+        :rtype: function
+        """
+
+        if self.is_group():
+            if not self.filters:
+                # Just accept empty groups
+                return lambda index: True
+            return self.compile_filter(
+                self.filters, self.filter_op, data_getter=data_getter
+            )
+
+        if self.filter_type not in self._filter_funcs_by_type:
+            # Invalid filter type
+            return lambda index: False
+
+        value_check = self._compile_value_check()
+        if value_check is None:
+            # No optimized check for this filter, fall back to the uncompiled version.
+            return self.accepts
+
+        if self.filter_type == self.FilterType.STR:
+            # Sanitize the incoming string values inline, this avoids the overhead of the
+            # generic sanitize method for the most common filter type.
+            def _sanitize(value):
+                if isinstance(value, dict):
+                    value = value.get("value")
+                if value is None:
+                    return None
+                if not isinstance(value, str):
+                    value = str(value)
+                return value.lower()
+
+        else:
+            _sanitize = self._sanitize_filter_value
+
+        filter_role = self.filter_role
+        if filter_role is not None and data_getter is not None:
+
+            def _accepts(index):
+                return value_check(_sanitize(data_getter(index, filter_role)))
+
+        elif filter_role is not None:
+
+            def _accepts(index):
+                return value_check(_sanitize(index.data(filter_role)))
+
+        else:
+            data_func = self.data_func
+
+            def _accepts(index):
+                return value_check(_sanitize(data_func(index)))
+
+        return _accepts
+
     def is_bool_valid(self, value):
         """
         Filter the incoming boolean value.
@@ -896,9 +1285,127 @@ class FilterItem(object):
             # Nothing has changed, return False.
             return False
 
-        self._filter_value = value
+        self._filter_value = new_value
         return True
 
+    def _compile_value_check(self):
+        """
+        Return a function that checks if a sanitized value is accepted by this filter item. The
+        returned function is equivalent to calling the filter function for this filter item's
+        type, but with the filter value and operation already resolved.
+
+        :return: The value check function, or None if this filter item's type and operation
+            are not supported by a compiled check.
+        :rtype: function | None
+        """
+
+        op = self.filter_op
+        filter_type = self.filter_type
+        filter_value = self.filter_value
+        FilterOp = self.FilterOp
+
+        if op == FilterOp.EQUAL and filter_type != self.FilterType.DATETIME:
+            if filter_type == self.FilterType.NUMBER:
+                return lambda value: self.__get_number(value) == filter_value
+            return lambda value: value == filter_value
+
+        if op == FilterOp.NOT_EQUAL and filter_type != self.FilterType.DATETIME:
+            if filter_type == self.FilterType.NUMBER:
+                return lambda value: self.__get_number(value) != filter_value
+            return lambda value: value != filter_value
+
+        if filter_type == self.FilterType.BOOL:
+            if op == FilterOp.IS_TRUE:
+                return lambda value: value is True
+            if op == FilterOp.IS_FALSE:
+                return lambda value: value is False
+
+        elif filter_type == self.FilterType.STR:
+            if op in (FilterOp.IN, FilterOp.NOT_IN):
+                # The filter value has been lowercased on sanitizing, and incoming values are
+                # lowercased too, so a plain substring test gives a case insensitive match.
+                search = filter_value or ""
+                if op == FilterOp.IN:
+                    return lambda value: search in (value or "")
+                return lambda value: search not in (value or "")
+
+        elif filter_type == self.FilterType.NUMBER:
+            if filter_value is None:
+                # Cannot apply greater/less than operations on None values
+                return lambda value: False
+
+            compare = {
+                FilterOp.GREATER_THAN: lambda a, b: a > b,
+                FilterOp.GREATER_THAN_OR_EQUAL: lambda a, b: a >= b,
+                FilterOp.LESS_THAN: lambda a, b: a < b,
+                FilterOp.LESS_THAN_OR_EQUAL: lambda a, b: a <= b,
+            }.get(op)
+            if compare:
+
+                def _number_check(value):
+                    value = self.__get_number(value)
+                    if value is None:
+                        return False
+                    return compare(value, filter_value)
+
+                return _number_check
+
+        elif filter_type == self.FilterType.DATETIME:
+            if op in (FilterOp.EQUAL, FilterOp.NOT_EQUAL):
+                if isinstance(filter_value, str):
+                    # Get the bucketer on each call, since the buckets are relative to the
+                    # current day. The bucket boundaries are cached per day.
+                    get_value = lambda value: FilterItem.get_datetime_bucketer()(value)
+                else:
+                    get_value = lambda value: value
+
+                if op == FilterOp.EQUAL:
+                    return lambda value: get_value(value) == filter_value
+                return lambda value: get_value(value) != filter_value
+
+        elif filter_type == self.FilterType.LIST:
+            if op in (FilterOp.IN, FilterOp.NOT_IN):
+                if not isinstance(filter_value, list):
+                    filter_values = [filter_value]
+                else:
+                    filter_values = list(filter_value)
+                has_none = None in filter_values
+
+                def _list_in(values_list):
+                    # See is_list_valid for the handling of None/empty lists
+                    if not isinstance(values_list, list):
+                        values_list = [values_list]
+                    if not values_list:
+                        return has_none
+                    if not filter_values:
+                        return None in values_list
+                    for value in values_list:
+                        if value in filter_values:
+                            return True
+                    return False
+
+                if op == FilterOp.IN:
+                    return _list_in
+                return lambda values_list: not _list_in(values_list)
+
+        return None
+
+    @staticmethod
+    def __get_number(value):
+        """
+        Return the number value to compare against, extracting it from a dictionary if necessary.
+
+        :param value: The value to get the number from.
+        :type value: int | float | dict
+
+        :return: The number value.
+        :rtype: int | float
+        """
+
+        if isinstance(value, dict):
+            return value.get("value")
+        return value
+
     def _sanitize_filter_value(self, value):
         """
         Process the raw value and sanitize it for the filter item to use.
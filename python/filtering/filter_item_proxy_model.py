@@ -9,17 +9,25 @@
 # not expressly granted therein are reserved by Autodesk Inc.
 
 import sgtk
-from sgtk.platform.qt import QtCore, QtGui
+from sgtk.platform.qt import QtGui
 
 from .filter_item import FilterItem
+from .filter_item_proxy_model_mixin import FilterItemProxyModelMixin
 
+utils = sgtk.platform.current_bundle().import_module("utils")
 
-class FilterItemProxyModel(QtGui.QSortFilterProxyModel):
+
+class FilterItemProxyModel(FilterItemProxyModelMixin, QtGui.QSortFilterProxyModel):
     """
     A filter proxy model that filters the source model data using a list of
     FilterItem objects.
     """
 
+    # The ways that rows are re-filtered when the filter items change.
+    _REFILTER_NARROWING = "narrowing"
+    _REFILTER_LOOSENING = "loosening"
+    _REFILTER_ALL = "all"
+
     def __init__(self, *args, **kwargs):
         """
         Constructor.
@@ -27,43 +35,95 @@ class FilterItemProxyModel(QtGui.QSortFilterProxyModel):
 
         super().__init__(*args, **kwargs)
 
-        # Default to AND all of the filter items upon filtering.
-        self._group_op = FilterItem.FilterOp.AND
-        # The list of filter items to apply to the model on filtering.
-        self._filter_items = []
+        # Cache of the accepted value of each source row, used to avoid re-testing rows when
+        # the filter items are refined (e.g. typing more characters into a search filter).
+        # Each entry maps the row key to the generation of the filters it was tested with and
+        # the accepted value:
+        #   (parent_key, row) -> (generation, accepted)
+        # The cache is only used for the list of filter items it was created for.
+        self._accepted_cache = {}
+        self._accepted_cache_items = None
+        self._accepted_cache_key = None
+        self._accepted_cache_generation = 0
+        # Set while re-filtering after the filter items were set, to indicate which rows need to
+        # be tested again.
+        self._refilter_mode = None
+
+    @FilterItemProxyModelMixin.filter_group_op.setter
+    def filter_group_op(self, value):
+        self._group_op = value
+        # The accepted rows are no longer valid for the new operation.
+        self._clear_accepted_cache()
 
-    @property
-    def filter_group_op(self):
+    def setSourceModel(self, model):
         """
-        Get or set the operation applied to the list of filter items in this model upon filtering.
+        Override the base method to keep the accepted rows cache in sync with the source model.
+
+        :param model: The source model.
+        :type model: :class:`sgtk.platform.qt.QtCore.QAbstractItemModel`
         """
-        return self._group_op
 
-    @filter_group_op.setter
-    def filter_group_op(self, value):
-        self._group_op = value
+        # Connect to the model's signals before the base proxy model does, to update the
+        # accepted rows before the changed rows are re-filtered.
+        old_model = self.sourceModel()
+        if old_model:
+            try:
+                old_model.dataChanged.disconnect(self._on_source_data_changed)
+                old_model.rowsInserted.disconnect(self._clear_accepted_cache)
+                old_model.rowsRemoved.disconnect(self._clear_accepted_cache)
+                old_model.rowsMoved.disconnect(self._clear_accepted_cache)
+                old_model.layoutChanged.disconnect(self._clear_accepted_cache)
+                old_model.modelReset.disconnect(self._clear_accepted_cache)
+            except RuntimeError:
+                # Signals were never connected
+                pass
+
+        self._clear_accepted_cache()
+
+        if model:
+            model.dataChanged.connect(self._on_source_data_changed)
+            model.rowsInserted.connect(self._clear_accepted_cache)
+            model.rowsRemoved.connect(self._clear_accepted_cache)
+            model.rowsMoved.connect(self._clear_accepted_cache)
+            model.layoutChanged.connect(self._clear_accepted_cache)
+            model.modelReset.connect(self._clear_accepted_cache)
 
-    @property
-    def filter_items(self):
+        super().setSourceModel(model)
+
+    def invalidateFilter(self):
         """
-        Get or set the list of FilterItem objects used to filter the model data.
+        Override the base method to clear the accepted rows cache, since the filter items may
+        have been modified.
         """
-        return self._filter_items
+
+        if self._refilter_mode is None:
+            # The filter items may have changed in any way, the accepted rows must be tested
+            # again.
+            self._clear_accepted_cache()
+        super().invalidateFilter()
 
     def set_filter_items(self, items, emit_signal=True):
         """
         Set the list of FilterItem objects used to filter the model data. If `emit_signal`, then also
         invalidate the filter to immediately trigger re-filtering the model data.
+
+        If the new filter items are a refinement of the previous filter items (e.g. more
+        characters were typed into a search filter), only the rows that are currently accepted
+        are tested again. Likewise, if the new filter items loosen the previous filter items,
+        only the rows that are currently rejected are tested again.
         """
 
         self._filter_items = items
 
         if emit_signal:
+            self._refilter_mode = self._get_refilter_mode()
+
             # Invalidate the filter to apply the new filters to the model.
             self.layoutAboutToBeChanged.emit()
             try:
                 self.invalidateFilter()
             finally:
+                self._refilter_mode = None
                 self.layoutChanged.emit()
 
     def filterAcceptsRow(self, src_row, src_parent_idx):
@@ -92,4 +152,107 @@ class FilterItemProxyModel(QtGui.QSortFilterProxyModel):
         if not self.filter_items:
             return True  # No filters set, accept everything
 
-        return FilterItem.do_filter(src_idx, self.filter_items, self._group_op)
+        if self._filter_items is not self._accepted_cache_items:
+            # The filter items have been temporarily swapped out, do not use the cache.
+            return self._get_compiled_filter()(src_idx)
+
+        row_key = (self._get_parent_key(src_parent_idx), src_row)
+        if self._refilter_mode in (self._REFILTER_NARROWING, self._REFILTER_LOOSENING):
+            # Only rows tested with the previous filter items can be skipped.
+            generation, accepted = self._accepted_cache.get(row_key, (None, None))
+            if generation == self._accepted_cache_generation - 1 and (
+                (self._refilter_mode == self._REFILTER_NARROWING and not accepted)
+                or (self._refilter_mode == self._REFILTER_LOOSENING and accepted)
+            ):
+                self._accepted_cache[row_key] = (
+                    self._accepted_cache_generation,
+                    accepted,
+                )
+                return accepted
+
+        accepted = self._get_compiled_filter()(src_idx)
+        self._accepted_cache[row_key] = (self._accepted_cache_generation, accepted)
+        return accepted
+
+    def _get_refilter_mode(self):
+        """
+        Compare the current filter items to the filter items that the accepted rows were
+        tested with, to determine which rows need to be tested again. This resets the accepted
+        rows cache if the filter items cannot be compared.
+
+        :return: _REFILTER_NARROWING if only accepted rows need to be tested again,
+            _REFILTER_LOOSENING if only rejected rows need to be tested again, or
+            _REFILTER_ALL if all rows need to be tested again.
+        :rtype: str
+        """
+
+        filters_key = FilterItem.get_filters_structure_key(
+            self._filter_items, self._group_op
+        )
+
+        refilter_mode = self._REFILTER_ALL
+        if self._accepted_cache and self._accepted_cache_key is not None:
+            if FilterItem.is_structure_refinement(
+                filters_key, self._accepted_cache_key
+            ):
+                refilter_mode = self._REFILTER_NARROWING
+            elif FilterItem.is_structure_refinement(
+                self._accepted_cache_key, filters_key
+            ):
+                refilter_mode = self._REFILTER_LOOSENING
+
+        if refilter_mode == self._REFILTER_ALL:
+            self._clear_accepted_cache()
+
+        self._accepted_cache_items = self._filter_items
+        self._accepted_cache_key = filters_key
+        self._accepted_cache_generation += 1
+        return refilter_mode
+
+    def _clear_accepted_cache(self, *args):
+        """
+        Clear the cached accepted rows, such that all rows will be tested again on filtering.
+
+        This is also a slot for the source model signals that change the rows, the signal
+        arguments are ignored.
+        """
+
+        self._accepted_cache = {}
+        self._accepted_cache_items = None
+        self._accepted_cache_key = None
+
+    def _get_parent_key(self, parent):
+        """
+        Return the key used to look up the accepted rows for the parent index.
+
+        :param parent: The parent index.
+        :type parent: :class:`sgtk.platform.qt.QtCore.QModelIndex`
+
+        :return: The row path of the parent, see `utils.get_index_row_path`. The accepted rows
+            cache is cleared when the source model rows change, so the row path stays valid.
+        :rtype: tuple
+        """
+
+        return utils.get_index_row_path(parent)
+
+    def _on_source_data_changed(self, top_left, bottom_right, roles=None):
+        """
+        Slot triggered when the source model data changes. Remove the changed rows from the
+        accepted rows cache, so that they are tested again.
+        """
+
+        if not self._accepted_cache:
+            return
+
+        parent = top_left.parent()
+        if (
+            not top_left.isValid()
+            or not bottom_right.isValid()
+            or parent != bottom_right.parent()
+        ):
+            self._clear_accepted_cache()
+            return
+
+        parent_key = self._get_parent_key(parent)
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            self._accepted_cache.pop((parent_key, row), None)
@@ -0,0 +1,139 @@
+# Copyright (c) 2021 Autodesk Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the ShotGrid Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the ShotGrid Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk Inc.
+
+from .filter_data_cache import FilterDataCache
+from .filter_item import FilterItem
+
+
+class FilterItemProxyModelMixin(object):
+    """
+    A mixin class for the filter proxy models that filter the source model data using a list of
+    FilterItem objects. This must be used with a subclass of QSortFilterProxyModel, and come
+    before it in the class bases.
+
+    The mixin holds the filter items and group operation, compiles the filter items lazily on
+    filtering, and manages the optional cache of the source model data used for filtering.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Constructor.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        # Default to AND all of the filter items upon filtering.
+        self._group_op = FilterItem.FilterOp.AND
+        # The list of filter items to apply to the model on filtering.
+        self._filter_items = []
+        # The compiled filter items and the filter items/group op it was compiled from. The
+        # filter is compiled lazily on filtering, and cleared when the filter is invalidated.
+        self._compiled_filter = None
+        self._compiled_filter_key = None
+        # The optional cache of the source model data used for filtering.
+        self._data_cache = None
+
+    @property
+    def filter_group_op(self):
+        """
+        Get or set the operation applied to the list of filter items in this model upon filtering.
+        """
+        return self._group_op
+
+    @filter_group_op.setter
+    def filter_group_op(self, value):
+        self._group_op = value
+
+    @property
+    def filter_items(self):
+        """
+        Get or set the list of FilterItem objects used to filter the model data.
+        """
+        return self._filter_items
+
+    def enable_data_cache(self, enable=True):
+        """
+        Enable or disable caching the source model data that is used for filtering.
+
+        When enabled, the data for each filter role is pulled from the source model once and
+        stored in plain lists, so that re-filtering (e.g. when the filter value changes) does
+        not need to call the model's data method for every row again. The cache is kept in
+        sync with the source model as its data changes.
+
+        The cache must be notified of source model changes before this proxy model re-filters
+        the changed rows, so if a source model is already set, it will be set again.
+
+        :param enable: True to enable the data cache, False to disable it.
+        :type enable: bool
+        """
+
+        if enable == (self._data_cache is not None):
+            return
+
+        source_model = self.sourceModel()
+        if enable:
+            self._data_cache = FilterDataCache()
+        else:
+            self._data_cache.set_model(None)
+            self._data_cache = None
+
+        self._compiled_filter = None
+        if source_model:
+            self.setSourceModel(None)
+            self.setSourceModel(source_model)
+
+    def setSourceModel(self, model):
+        """
+        Override the base method to keep the data cache in sync with the source model.
+
+        :param model: The source model.
+        :type model: :class:`sgtk.platform.qt.QtCore.QAbstractItemModel`
+        """
+
+        if self._data_cache:
+            # Set the model on the cache first so that it receives the model's signals before
+            # the base proxy model does.
+            self._data_cache.set_model(model)
+
+        super().setSourceModel(model)
+
+    def invalidateFilter(self):
+        """
+        Override the base method to clear the compiled filter, since the filter items may
+        have been modified.
+        """
+
+        self._compiled_filter = None
+        super().invalidateFilter()
+
+    def _get_compiled_filter(self):
+        """
+        Return the compiled filter for the current filter items and group operation. The filter
+        items are only compiled again if they have changed since the last time they were compiled.
+
+        :return: The function to check if an index is accepted by the filter items.
+        :rtype: function
+        """
+
+        # Compare the list of filter items by identity since the filter items may be swapped
+        # out temporarily (e.g. by the filter definition) without being modified.
+        if (
+            self._compiled_filter is None
+            or self._compiled_filter_key[0] is not self._filter_items
+            or self._compiled_filter_key[1] != self._group_op
+        ):
+            self._compiled_filter = FilterItem.compile_filter(
+                self._filter_items,
+                self._group_op,
+                data_getter=self._data_cache.data if self._data_cache else None,
+            )
+            self._compiled_filter_key = (self._filter_items, self._group_op)
+
+        return self._compiled_filter
@@ -10,12 +10,14 @@
 
 import sgtk
 
-from .filter_item import FilterItem
+from .filter_item_proxy_model_mixin import FilterItemProxyModelMixin
 
 models = sgtk.platform.current_bundle().import_module("models")
 
 
-class FilterItemTreeProxyModel(models.HierarchicalFilteringProxyModel):
+class FilterItemTreeProxyModel(
+    FilterItemProxyModelMixin, models.HierarchicalFilteringProxyModel
+):
     """
     A filter proxy model that filters the source tree model data using a list of
     FilterItem objects. This provides similar functionality as the
@@ -23,36 +25,6 @@ class FilterItemTreeProxyModel(models.HierarchicalFilteringProxyModel):
     HierarchicalfilteringProxyModel.
     """
 
-    def __init__(self, *args, **kwargs):
-        """
-        Constructor
-        """
-
-        super().__init__(*args, **kwargs)
-
-        # Default to AND all of the filter items upon filtering.
-        self._group_op = FilterItem.FilterOp.AND
-        # The list of filter items to apply to the model on filtering.
-        self._filter_items = []
-
-    @property
-    def filter_group_op(self):
-        """
-        Get or set the operation applied to the list of filter items in this model upon filtering.
-        """
-        return self._group_op
-
-    @filter_group_op.setter
-    def filter_group_op(self, value):
-        self._group_op = value
-
-    @property
-    def filter_items(self):
-        """
-        Get or set the filter items used to filter the model data.
-        """
-        return self._filter_items
-
     def set_filter_items(self, items, emit_signal=True):
         """
         Set the list of FilterItem objects used to filter the model data. If `emit_signal`, then also
@@ -97,4 +69,4 @@ class FilterItemTreeProxyModel(models.HierarchicalFilteringProxyModel):
         if not self.filter_items:
             return True  # No filters set, accept everything
 
-        return FilterItem.do_filter(src_idx, self.filter_items, self._group_op)
+        return self._get_compiled_filter()(src_idx)
@@ -35,6 +35,8 @@ sg_qwidgets = sgtk.platform.current_bundle().import_module("sg_qwidgets")
 SGQPushButton = sg_qwidgets.SGQPushButton
 SGQToolButton = sg_qwidgets.SGQToolButton
 
+logger = sgtk.platform.get_logger(__name__)
+
 
 class NoCloseOnActionTriggerShotgunMenu(ShotgunMenu):
     """ShotgunMenu subclass that prevents the menu from closing when an action is triggered."""
@@ -140,6 +142,9 @@ class FilterMenu(NoCloseOnActionTriggerShotgunMenu):
     # Signal emitted when menu is finished a complete refreshing (e.g. exit refresh method)
     menu_refreshed = QtCore.Signal()
 
+    # The background task group used to update the filters in a background thread.
+    UPDATE_FILTERS_TASK_GROUP = "FilterMenu.update_filters"
+
     def __init__(
         self, parent=None, refresh_on_show=True, bg_task_manager=None, dock_widget=None
     ):
@@ -247,6 +252,21 @@ class FilterMenu(NoCloseOnActionTriggerShotgunMenu):
         # Flag indicating the menu is currently being refreshed
         self._is_refreshing = False
 
+        # Flag indicating that the filter counts are updated in a background thread, and the
+        # data for the current background task to update the filters.
+        self.__update_filters_async = False
+        self.__update_filters_task = None
+
+        # The structure key of the filters last applied to the proxy model, used to skip
+        # updating the model when the filters have not changed.
+        self.__applied_filters_key = None
+        # Timer used to coalesce rapid filter changes into a single model update. The
+        # interval is 0 by default, which applies filter changes immediately.
+        self.__apply_filters_timer = QtCore.QTimer(self)
+        self.__apply_filters_timer.setSingleShot(True)
+        self.__apply_filters_timer.setInterval(0)
+        self.__apply_filters_timer.timeout.connect(self.__apply_filters)
+
         # Flag indicating that the menu is restoring its filter state. This is used to avoid
         # menu refreshes for each filter state restored, and instead having a single refresh at
         # the end.
@@ -291,6 +311,56 @@ class FilterMenu(NoCloseOnActionTriggerShotgunMenu):
             or self._active_preset_filter_name
         )
 
+    @property
+    def filters_changed_delay(self):
+        """
+        Get or set the time (in milliseconds) to wait for further filter changes, before the
+        filters are applied to the model and the `filters_changed` signal is emitted.
+
+        Each filter change restarts the wait, so rapid changes (e.g. typing in a search filter
+        or toggling several filter options) are coalesced into a single model update. Set to
+        0 (the default) to apply filter changes immediately.
+        """
+        return self.__apply_filters_timer.interval()
+
+    @filters_changed_delay.setter
+    def filters_changed_delay(self, value):
+        self.__apply_filters_timer.setInterval(max(0, value))
+
+    @property
+    def update_filters_async(self):
+        """
+        Get or set whether or not the filter counts are updated in a background thread.
+
+        When set, `update_filters` snapshots the model data needed in the main thread, and
+        then computes the filter counts in a background thread, using the background task
+        manager that the menu was created with. The menu widgets are updated once the counts
+        have been computed. If the filters are updated again before a background update
+        finishes, the pending update is stopped, and its filters are updated by the new one.
+
+        This requires the menu to have been created with a background task manager.
+        """
+        return self.__update_filters_async
+
+    @update_filters_async.setter
+    def update_filters_async(self, value):
+        if value == self.__update_filters_async:
+            return
+
+        if value and not self._task_manager:
+            raise ValueError(
+                "FilterMenu requires a background task manager to update filters asynchronously"
+            )
+
+        self.__update_filters_async = value
+        if value:
+            self._task_manager.task_completed.connect(self._on_task_completed)
+            self._task_manager.task_failed.connect(self._on_task_failed)
+        else:
+            self.__stop_update_filters_task()
+            self._task_manager.task_completed.disconnect(self._on_task_completed)
+            self._task_manager.task_failed.disconnect(self._on_task_failed)
+
     @property
     def more_filters_menu(self):
         """Get the 'More Filters' submenu in the filter menu."""
@@ -625,6 +695,8 @@ class FilterMenu(NoCloseOnActionTriggerShotgunMenu):
 
         self._proxy_model = filter_model
         self._source_model = filter_model.sourceModel()
+        # The new model does not have any filters applied yet.
+        self.__applied_filters_key = None
         self._filters_def.proxy_model = self._proxy_model
 
         try:
@@ -668,13 +740,10 @@ class FilterMenu(NoCloseOnActionTriggerShotgunMenu):
             state = self.save_state()
             self.clear_menu()
 
-            # First build only the filter groupings. Individual filters will only be built
-            # once it is known they are visible, as it will be a wasted effor to build any
-            # filters that are hidden.
-            self._filters_def.build(groups_only=True)
-
-            # Now update the necessary individual filters
-            self._filters_def.update_filters(state.keys())
+            # Build the filter groupings and the necessary individual filters in a single pass
+            # over the model. Other individual filters will only be built once it is known they
+            # are visible, as it will be a wasted effor to build any filters that are hidden.
+            self._filters_def.build(groups_only=True, field_ids=state.keys())
 
             # The menu widgets are built from the filter definition and state, so restore the
             # menu state before rebuilding the widgets
@@ -707,6 +776,10 @@ class FilterMenu(NoCloseOnActionTriggerShotgunMenu):
             ]
             fields_to_refresh = None
 
+        if self.__update_filters_async:
+            self.__start_update_filters_task(filter_group_ids, fields_to_refresh)
+            return
+
         self._filters_def.update_filters(filter_group_ids)
         self._refresh_menu_widgets(field_ids=fields_to_refresh)
 
@@ -716,6 +789,9 @@ class FilterMenu(NoCloseOnActionTriggerShotgunMenu):
         remove all items from the menu.
         """
 
+        # Any pending filter updates are no longer valid.
+        self.__stop_update_filters_task()
+
         # Clear any filter values set by the menu.
         self.clear_filters()
         # Clear the widgets from the dock. Delete the widgets else widgets will not be cleaned
@@ -1348,14 +1424,23 @@ class FilterMenu(NoCloseOnActionTriggerShotgunMenu):
             self.__more_filters_menu.insertAction(insert_before_action, action)
 
     def _emit_filters_changed(self):
-        """Update the active filter and emit a signal that the filters have changed."""
+        """
+        Update the active filter and emit a signal that the filters have changed.
+
+        If the `filters_changed_delay` is set, the filters will be applied once no further
+        changes have been made within the delay.
+        """
 
         if self._block_signals:
             return
 
         self._active_filter.filters = self.get_current_filters()
-        self._update_model_filters()
-        self.filters_changed.emit()
+
+        if self.__apply_filters_timer.interval() > 0:
+            # Restart the timer to wait for any further changes.
+            self.__apply_filters_timer.start()
+        else:
+            self.__apply_filters()
 
     def _get_search_filter_item_id(self, field_id):
         """
@@ -1492,6 +1577,62 @@ class FilterMenu(NoCloseOnActionTriggerShotgunMenu):
         action.setChecked(checked)
         self._emit_filters_changed()
 
+    def _on_task_completed(self, task_id, group, result):
+        """
+        Slot triggered when a background task has completed.
+
+        If the task is the current background task to update the filters, then apply the
+        updated filters and refresh the menu widgets.
+
+        :param task_id: The id of the task that completed.
+        :type task_id: int
+        :param group: The group the task belongs to.
+        :type group: str
+        :param result: The task result.
+        :type result: any
+        """
+
+        if group != self.UPDATE_FILTERS_TASK_GROUP or not self.__update_filters_task:
+            return
+
+        current_task_id, snapshot, field_ids, fields_to_refresh = (
+            self.__update_filters_task
+        )
+        if task_id != current_task_id:
+            # Stale task, a newer update has been started.
+            return
+
+        self.__update_filters_task = None
+        self._filters_def.apply_snapshot(snapshot, field_ids)
+        self._refresh_menu_widgets(field_ids=fields_to_refresh)
+
+    def _on_task_failed(self, task_id, group, message, traceback_str):
+        """
+        Slot triggered when a background task has failed.
+
+        :param task_id: The id of the task that failed.
+        :type task_id: int
+        :param group: The group the task belongs to.
+        :type group: str
+        :param message: The error message.
+        :type message: str
+        :param traceback_str: The error traceback.
+        :type traceback_str: str
+        """
+
+        if group != self.UPDATE_FILTERS_TASK_GROUP or not self.__update_filters_task:
+            return
+
+        if task_id != self.__update_filters_task[0]:
+            return
+
+        self.__update_filters_task = None
+        logger.warning(
+            "Failed to update the filter menu filters: {}\n{}".format(
+                message, traceback_str
+            )
+        )
+
     def _filter_widget_value_changed(self, filter_item, search):
         """
         Callback triggered when a FilterItemWidget `value_changed` signal emitted.
@@ -1527,6 +1668,71 @@ class FilterMenu(NoCloseOnActionTriggerShotgunMenu):
     # ----------------------------------------------------------------------------------------
     # Private methods
 
+    def __apply_filters(self):
+        """
+        Apply the active filter to the model and emit a signal that the filters have changed.
+
+        The model filters are only updated if the active filter has changed since it was last
+        applied, but the signal is always emitted.
+        """
+
+        self.__apply_filters_timer.stop()
+
+        filters_key = self._active_filter.get_structure_key()
+        if filters_key != self.__applied_filters_key:
+            self.__applied_filters_key = filters_key
+            self._update_model_filters()
+
+        self.filters_changed.emit()
+
+    def __start_update_filters_task(self, field_ids, fields_to_refresh):
+        """
+        Start a background task to update the filters, stopping any pending update.
+
+        :param field_ids: The filter group field ids of the filters to update.
+        :type field_ids: List[str]
+        :param fields_to_refresh: The menu group fields to refresh once the filters are updated.
+        :type fields_to_refresh: List[str]
+        """
+
+        if self.__update_filters_task:
+            # Include the filters from the pending update, since it will be stopped.
+            _, _, pending_field_ids, pending_fields_to_refresh = (
+                self.__update_filters_task
+            )
+            field_ids = list(field_ids) + [
+                field_id for field_id in pending_field_ids if field_id not in field_ids
+            ]
+            if fields_to_refresh is not None:
+                if pending_fields_to_refresh is None:
+                    fields_to_refresh = None
+                else:
+                    fields_to_refresh = list(fields_to_refresh) + [
+                        field_id
+                        for field_id in pending_fields_to_refresh
+                        if field_id not in fields_to_refresh
+                    ]
+
+            self.__stop_update_filters_task()
+
+        # Snapshot the data in the main thread, the snapshot is updated in the background.
+        snapshot = self._filters_def.create_snapshot(field_ids)
+        task_id = self._task_manager.add_task(
+            snapshot.update_filters,
+            group=self.UPDATE_FILTERS_TASK_GROUP,
+            task_args=[field_ids],
+        )
+        self.__update_filters_task = (task_id, snapshot, field_ids, fields_to_refresh)
+
+    def __stop_update_filters_task(self):
+        """Stop the current background task to update the filters, if there is one."""
+
+        if not self.__update_filters_task:
+            return
+
+        self._task_manager.stop_task(self.__update_filters_task[0])
+        self.__update_filters_task = None
+
     def __set_docked(self, docked):
         """
         Set the docked state and show/hide the dock widget accordingly.
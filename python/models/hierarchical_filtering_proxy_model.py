@@ -12,6 +12,8 @@
 Proxy model that provides efficient hierarhcical filtering of a tree-based source model
 """
 
+from collections import OrderedDict
+
 import sgtk
 from sgtk.platform.qt import QtCore, QtGui
 
@@ -38,16 +40,26 @@ class HierarchicalFilteringProxyModel(QtGui.QSortFilterProxyModel):
         as QPersistentModelIndex isn't hashable so instead a tuple of the row hierarchy is used
         and then when looking up the cached value, the persistent model index is used to ensure
         that the cache entry is still valid.
+
+        The cache can optionally be bounded by setting a capacity.  When bounded, entries are
+        kept in least-recently-used order and the least recently used entry is evicted each
+        time a new entry would take the cache over capacity.
         """
 
-        def __init__(self):
+        def __init__(self, capacity=None):
             """
             Construction
+
+            :param capacity:    The maximum number of entries to keep in the cache or None
+                                if the cache should be unbounded.
             """
-            self._cache = {}
+            self._cache = OrderedDict()
             self.enabled = True
+            self._capacity = None
             self._cache_hits = 0
             self._cache_misses = 0
+            self._cache_evictions = 0
+            self.capacity = capacity
 
             # ideally we'd use QPersistentModelIndexes to key into the cache but these
             # aren't hashable in earlier versions of PySide!
@@ -70,6 +82,53 @@ class HierarchicalFilteringProxyModel(QtGui.QSortFilterProxyModel):
             else:
                 return 0
 
+        @property
+        def cache_hits(self):
+            """
+            The number of cache queries that returned a valid cached value
+            """
+            return self._cache_hits
+
+        @property
+        def cache_misses(self):
+            """
+            The number of cache queries that didn't find a valid cached value
+            """
+            return self._cache_misses
+
+        @property
+        def cache_evictions(self):
+            """
+            The number of entries that have been evicted because the cache was full
+            """
+            return self._cache_evictions
+
+        def _get_capacity(self):
+            """
+            The maximum number of entries held by the cache, or None if it is unbounded
+            """
+            return self._capacity
+
+        def _set_capacity(self, capacity):
+            """
+            Set the maximum number of entries held by the cache, evicting the least recently
+            used entries if the cache is currently larger than the new capacity.
+            """
+            if capacity is not None and capacity < 1:
+                raise ValueError("Cache capacity must be at least 1 or None")
+            self._capacity = capacity
+            self._evict()
+
+        capacity = property(_get_capacity, _set_capacity)
+
+        def reset_stats(self):
+            """
+            Reset the hit, miss and eviction counters
+            """
+            self._cache_hits = 0
+            self._cache_misses = 0
+            self._cache_evictions = 0
+
         @property
         def size(self):
             """
@@ -94,6 +153,10 @@ class HierarchicalFilteringProxyModel(QtGui.QSortFilterProxyModel):
                 else QtCore.QPersistentModelIndex(index)
             )
             self._cache[cache_key] = (p_index, accepted)
+            if self._capacity is not None:
+                # mark the entry as most recently used and make sure we stay within capacity:
+                self._cache.move_to_end(cache_key)
+                self._evict()
 
         def remove(self, index):
             """
@@ -128,6 +191,8 @@ class HierarchicalFilteringProxyModel(QtGui.QSortFilterProxyModel):
             if p_index and p_index == index:
                 # index and cached value are still valid!
                 self._cache_hits += 1
+                if self._capacity is not None:
+                    self._cache.move_to_end(cache_key)
                 return accepted
             else:
                 # row has changed so results are bad!
@@ -141,7 +206,7 @@ class HierarchicalFilteringProxyModel(QtGui.QSortFilterProxyModel):
             if not self.enabled:
                 return
 
-            self._cache = dict(
+            self._cache = OrderedDict(
                 [(k, v) for k, v in self._cache.items() if v[0].isValid()]
             )
 
@@ -152,7 +217,18 @@ class HierarchicalFilteringProxyModel(QtGui.QSortFilterProxyModel):
             if not self.enabled:
                 return
 
-            self._cache = {}
+            self._cache = OrderedDict()
+
+        def _evict(self):
+            """
+            Evict the least recently used entries until the cache is within capacity
+            """
+            if self._capacity is None:
+                return
+
+            while len(self._cache) > self._capacity:
+                self._cache.popitem(last=False)
+                self._cache_evictions += 1
 
         def _gen_cache_key(self, index):
             """
@@ -188,20 +264,69 @@ class HierarchicalFilteringProxyModel(QtGui.QSortFilterProxyModel):
         self._child_accepted_cache = (
             HierarchicalFilteringProxyModel._IndexAcceptedCache()
         )
+        self._incremental_filtering = False
 
-    def enable_caching(self, enable=True):
+    def enable_caching(self, enable=True, capacity=None):
         """
         Allow control over enabling/disabling of the accepted cache used to accelerate
         filtering.  Can be used for debug purposes to ensure the caching isn't the cause
         of incorrect filtering/sorting or instability!
 
-        :param enable:    True if caching should be enabled, False if it should be disabled.
+        The caches can also be bounded so that memory usage stays flat for very large
+        models.  When a capacity is specified, each cache holds at most that many entries
+        and the least recently used entries are evicted first.
+
+        :param enable:      True if caching should be enabled, False if it should be disabled.
+        :param capacity:    The maximum number of entries to hold in each of the accepted
+                            caches, or None if the caches should be unbounded.
         """
         # clear the accepted cache - this will make sure we don't use out-of-date
         # information from the cache
         self._dirty_all_accepted()
         self._accepted_cache.enabled = enable
         self._child_accepted_cache.enabled = enable
+        self._accepted_cache.capacity = capacity
+        self._child_accepted_cache.capacity = capacity
+
+    def enable_incremental_filtering(self, enable=True):
+        """
+        Allow control over how the accepted caches are updated when data changes in the
+        source model.
+
+        By default, changed rows and their entire parent hierarchy are removed from the
+        accepted caches and re-computed lazily.  When incremental filtering is enabled,
+        only the changed rows are re-evaluated straight away and the 'child accepted'
+        state of their ancestors is updated in place rather than being cleared.  This
+        keeps refreshes that touch a small number of rows in a large tree cheap.
+
+        :param enable:    True if incremental filtering should be enabled, False if it
+                          should be disabled.
+        """
+        self._incremental_filtering = enable
+
+    @property
+    def cache_stats(self):
+        """
+        Statistics for the accepted caches, useful for debugging and tuning the cache
+        capacity.
+
+        :returns: A dictionary containing the size, capacity, hits, misses, evictions and
+                  hit/miss ratio for both the ``accepted`` and ``child_accepted`` caches.
+        """
+        stats = {}
+        for name, cache in (
+            ("accepted", self._accepted_cache),
+            ("child_accepted", self._child_accepted_cache),
+        ):
+            stats[name] = {
+                "size": cache.size,
+                "capacity": cache.capacity,
+                "hits": cache.cache_hits,
+                "misses": cache.cache_misses,
+                "evictions": cache.cache_evictions,
+                "hit_miss_ratio": cache.cache_hit_miss_ratio,
+            }
+        return stats
 
     def _is_row_accepted(self, src_row, src_parent_idx, parent_accepted):
         """
@@ -297,27 +422,8 @@ class HierarchicalFilteringProxyModel(QtGui.QSortFilterProxyModel):
             # child is accepted so this item must also be accepted
             return True
 
-        # next, we need to determine if the parent item has been accepted.  To do this,
-        # search up the hierarchy stopping at the first parent that we know for sure if
-        # it has been accepted or not.
-        upstream_indexes = []
-        current_idx = src_idx
-        parent_accepted = False
-        while current_idx and current_idx.isValid():
-            accepted = self._accepted_cache.get(current_idx)
-            if accepted != None:
-                parent_accepted = accepted
-                break
-            upstream_indexes.append(current_idx)
-            current_idx = current_idx.parent()
-
-        # now update the accepted status for items that we don't know
-        # for sure, working from top to bottom in the hierarchy ending
-        # on the index we are checking for:
-        for idx in reversed(upstream_indexes):
-            accepted = self._is_row_accepted(idx.row(), idx.parent(), parent_accepted)
-            self._accepted_cache.add(idx, accepted)
-            parent_accepted = accepted
+        # next, we need to determine if this item, or its parent hierarchy, has been accepted:
+        parent_accepted = self._get_accepted(src_idx)
 
         if parent_accepted:
             # the index we are testing was accepted!
@@ -357,18 +463,56 @@ class HierarchicalFilteringProxyModel(QtGui.QSortFilterProxyModel):
         # clear out the various caches:
         self._dirty_all_accepted()
 
+        # connect to data changes before calling the base implementation so that our slot is
+        # called before the base class re-filters the changed rows - this ensures the base class
+        # never sees stale values in the accepted caches:
+        if model:
+            model.dataChanged.connect(self._on_source_model_data_changed)
+
         # call base implementation:
         QtGui.QSortFilterProxyModel.setSourceModel(self, model)
 
         # connect to the new model:
         if model:
             model.rowsInserted.connect(self._on_source_model_rows_inserted)
-            model.dataChanged.connect(self._on_source_model_data_changed)
             model.modelAboutToBeReset.connect(self._on_source_model_about_to_be_reset)
 
     # -------------------------------------------------------------------------------
     # Private methods
 
+    def _get_accepted(self, src_idx):
+        """
+        Determine if the specified index is accepted by the filter, ignoring its children.
+
+        The parent hierarchy is searched, stopping at the first item that we know for sure
+        has been accepted or not, and the accepted state of every item below it is then
+        computed and cached, working down to the specified index.
+
+        :param src_idx: The source model index to check
+        :returns:       True if the index is accepted, otherwise False.  False is also
+                        returned for an invalid index.
+        """
+        upstream_indexes = []
+        current_idx = src_idx
+        parent_accepted = False
+        while current_idx and current_idx.isValid():
+            accepted = self._accepted_cache.get(current_idx)
+            if accepted != None:
+                parent_accepted = accepted
+                break
+            upstream_indexes.append(current_idx)
+            current_idx = current_idx.parent()
+
+        # now update the accepted status for items that we don't know
+        # for sure, working from top to bottom in the hierarchy ending
+        # on the index we are checking for:
+        for idx in reversed(upstream_indexes):
+            accepted = self._is_row_accepted(idx.row(), idx.parent(), parent_accepted)
+            self._accepted_cache.add(idx, accepted)
+            parent_accepted = accepted
+
+        return parent_accepted
+
     def _is_child_accepted_r(self, idx, parent_accepted):
         """
         Recursively check children to see if any of them have been accepted.
@@ -468,10 +612,109 @@ class HierarchicalFilteringProxyModel(QtGui.QSortFilterProxyModel):
         if parent_idx != end_idx.parent():
             # this should never happen but just in case, dirty the entire cache:
             self._dirty_all_accepted()
+        elif self._incremental_filtering and self._accepted_cache.enabled:
+            # re-evaluate just the changed rows and update the caches in place:
+            self._refilter_rows(parent_idx, start_idx.row(), end_idx.row())
+            return
 
         # dirty specific rows in the caches:
         self._dirty_accepted_rows(parent_idx, start_idx.row(), end_idx.row())
 
+    def _refilter_rows(self, parent_idx, start, end):
+        """
+        Incrementally re-evaluate the accepted state of the specified rows.
+
+        The changed rows are re-filtered straight away.  If the accepted state of a row
+        changes then the cached state of its descendants is dirtied, as their filtering
+        depends on whether their parent is accepted.  The 'child accepted' state of the
+        parent hierarchy is then updated in place rather than being cleared.
+
+        The base class only re-filters the rows that changed so if the visibility of any
+        item in the parent hierarchy changes as a result, or the accepted state of a row
+        with children changes (which may change the visibility of its descendants even if
+        the row itself stays visible), the filter is invalidated.  The accepted caches are
+        kept when this happens so re-filtering the rest of the tree only hits the cache.
+
+        :param parent_idx:  The parent model index of the changed rows
+        :param start:       The first row that changed
+        :param end:         The last row that changed
+        """
+        src_model = self.sourceModel()
+
+        # find the parent hierarchy and whether each item in it is currently visible:
+        ancestors = []
+        current_idx = parent_idx
+        while current_idx.isValid():
+            ancestors.append(current_idx)
+            current_idx = current_idx.parent()
+        ancestors_visible = [
+            self.filterAcceptsRow(a.row(), a.parent()) for a in ancestors
+        ]
+
+        parent_accepted = self._get_accepted(parent_idx)
+
+        any_changed = False
+        any_parent_changed = False
+        any_accepted = False
+        for row in range(start, end + 1):
+            idx = src_model.index(row, 0, parent_idx)
+            prev_accepted = self._accepted_cache.get(idx)
+            accepted = self._is_row_accepted(row, parent_idx, parent_accepted)
+            self._accepted_cache.add(idx, accepted)
+
+            if accepted != prev_accepted:
+                # descendants are filtered using the accepted state of this row so
+                # they need to be re-evaluated:
+                any_changed = True
+                self._child_accepted_cache.remove(idx)
+                if src_model.hasChildren(idx):
+                    any_parent_changed = True
+                    self._dirty_descendants_r(idx)
+
+            if accepted or self._child_accepted_cache.get(idx):
+                any_accepted = True
+
+        # update the child accepted state of the parent hierarchy:
+        if any_accepted:
+            # at least one of the rows is accepted so all ancestors have an accepted child:
+            for ancestor_idx in ancestors:
+                self._child_accepted_cache.add(ancestor_idx, True)
+        elif any_changed:
+            # the rows that were accepted may have been the only accepted children, so
+            # the ancestors need to be checked again when they are next filtered:
+            for ancestor_idx in ancestors:
+                self._child_accepted_cache.remove(ancestor_idx)
+
+        if not any_changed:
+            return
+
+        if any_parent_changed:
+            # the base class won't re-filter the children of the changed rows so their
+            # visibility may be stale:
+            QtGui.QSortFilterProxyModel.invalidateFilter(self)
+            return
+
+        new_ancestors_visible = [
+            self.filterAcceptsRow(a.row(), a.parent()) for a in ancestors
+        ]
+        if new_ancestors_visible != ancestors_visible:
+            # call the base class directly so that the accepted caches are kept:
+            QtGui.QSortFilterProxyModel.invalidateFilter(self)
+
+    def _dirty_descendants_r(self, idx):
+        """
+        Recursively remove all descendants of the specified index from the accepted caches.
+
+        :param idx: The source model index whose descendants should be dirtied
+        """
+        src_model = self.sourceModel()
+        for row in range(src_model.rowCount(idx)):
+            child_idx = src_model.index(row, 0, idx)
+            self._accepted_cache.remove(child_idx)
+            self._child_accepted_cache.remove(child_idx)
+            if src_model.hasChildren(child_idx):
+                self._dirty_descendants_r(child_idx)
+
     def _on_source_model_rows_inserted(self, parent_idx, start, end):
         """
         Slot triggered when rows are inserted into the source model.
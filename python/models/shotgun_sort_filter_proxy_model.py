@@ -20,6 +20,8 @@ shotgun_globals = sgtk.platform.import_framework(
     "tk-framework-shotgunutils", "shotgun_globals"
 )
 
+utils = sgtk.platform.current_bundle().import_module("utils")
+
 
 class ShotgunSortFilterProxyModel(QtGui.QSortFilterProxyModel):
     """
@@ -28,6 +30,10 @@ class ShotgunSortFilterProxyModel(QtGui.QSortFilterProxyModel):
     stored therein.
     """
 
+    # Placeholder in a sort key for a field that is missing from the
+    # item's data.
+    _MISSING_FIELD = object()
+
     def __init__(self, parent):
         """
         Initializes a new ShotgunSortFilterProxyModel.
@@ -40,6 +46,23 @@ class ShotgunSortFilterProxyModel(QtGui.QSortFilterProxyModel):
         self._sort_by_fields = ["id"]
         self._primary_sort_field = "id"
 
+        # Precomputed sort keys for source rows, used when sort key caching is enabled:
+        #   (parent_key, row) -> (sort key tuple, has missing fields) or None
+        self._sort_key_caching = False
+        self._sort_keys = {}
+        self._sort_fields = None
+
+        # The function used to match the filter against the searchable text
+        # of the rows. This is built from the filter regular expression when
+        # first needed after the filter changes.
+        self._filter_matcher = None
+
+        # Cached searchable text for source rows, used when search text
+        # caching is enabled:
+        #   (parent_key, row) -> tuple of lower case strings or None
+        self._search_text_caching = False
+        self._search_texts = {}
+
     ##########################################################################
     # properties
 
@@ -51,6 +74,7 @@ class ShotgunSortFilterProxyModel(QtGui.QSortFilterProxyModel):
 
     def _set_filter_by_fields(self, fields):
         self._filter_by_fields = list(fields)
+        self._search_texts = {}
 
     filter_by_fields = property(_get_filter_by_fields, _set_filter_by_fields)
 
@@ -62,6 +86,7 @@ class ShotgunSortFilterProxyModel(QtGui.QSortFilterProxyModel):
 
     def _set_sort_by_fields(self, fields):
         self._sort_by_fields = list(fields)
+        self._clear_sort_keys()
 
     sort_by_fields = property(_get_sort_by_fields, _set_sort_by_fields)
 
@@ -73,12 +98,137 @@ class ShotgunSortFilterProxyModel(QtGui.QSortFilterProxyModel):
 
     def _set_primary_sort_field(self, field):
         self._primary_sort_field = field
+        self._clear_sort_keys()
 
     primary_sort_field = property(_get_primary_sort_field, _set_primary_sort_field)
 
+    @property
+    def sort_key_caching_enabled(self):
+        """
+        Whether the sort keys of the source rows are precomputed and cached.
+        """
+        return self._sort_key_caching
+
+    @property
+    def search_text_caching_enabled(self):
+        """
+        Whether the searchable text of the source rows is cached.
+        """
+        return self._search_text_caching
+
     ##########################################################################
     # methods
 
+    def enable_search_text_caching(self, enable=True):
+        """
+        Enable or disable caching of the searchable text of each row.
+
+        When enabled, the data for the filter fields is extracted from the
+        Shotgun data and converted to searchable text once for each source
+        row, instead of each time the row is filtered. The cached text for
+        a row is discarded when its data changes.
+
+        :param enable:  True to enable search text caching, False to disable it.
+        """
+        self._search_text_caching = enable
+        self._search_texts = {}
+
+    def enable_sort_key_caching(self, enable=True):
+        """
+        Enable or disable caching of sort keys.
+
+        When enabled, a tuple of the sortable data for the sort fields is
+        computed once for each source row, and rows are then compared by
+        comparing their sort keys. This avoids extracting and processing the
+        Shotgun data of both rows for every comparison, which makes sorting
+        large models much faster.
+
+        Sort keys are computed again for each call to :meth:`sort`, when the
+        sort fields change, and for source rows whose data changes.
+
+        :param enable:  True to enable sort key caching, False to disable it.
+        """
+        self._sort_key_caching = enable
+        self._clear_sort_keys()
+
+    def setSourceModel(self, model):
+        """
+        Overrides the base QSortFilterProxyModel implementation to keep the
+        cached sort keys in sync with the source model.
+
+        :param model:   The source model.
+        """
+        old_model = self.sourceModel()
+        if old_model:
+            try:
+                old_model.dataChanged.disconnect(self._on_source_data_changed)
+                old_model.rowsInserted.disconnect(self._clear_row_caches)
+                old_model.rowsRemoved.disconnect(self._clear_row_caches)
+                old_model.rowsMoved.disconnect(self._clear_row_caches)
+                old_model.layoutChanged.disconnect(self._clear_row_caches)
+                old_model.modelReset.disconnect(self._clear_row_caches)
+            except RuntimeError:
+                # Signals were never connected
+                pass
+
+        self._clear_sort_keys()
+
+        # Connect to the model signals before the base model does, so that
+        # the sort keys are updated before the base model sorts the changed
+        # rows.
+        if model:
+            model.dataChanged.connect(self._on_source_data_changed)
+            model.rowsInserted.connect(self._clear_row_caches)
+            model.rowsRemoved.connect(self._clear_row_caches)
+            model.rowsMoved.connect(self._clear_row_caches)
+            model.layoutChanged.connect(self._clear_row_caches)
+            model.modelReset.connect(self._clear_row_caches)
+
+        super().setSourceModel(model)
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        """
+        Overrides the base QSortFilterProxyModel implementation to compute
+        the sort keys again for each sort.
+
+        :param column:  The column to sort by.
+        :param order:   The sort order.
+        """
+        self._clear_sort_keys()
+        super().sort(column, order)
+
+    def setFilterRegExp(self, reg_exp):
+        """
+        Overrides the base QSortFilterProxyModel implementation to rebuild
+        the filter matcher.
+        """
+        self._filter_matcher = None
+        super().setFilterRegExp(reg_exp)
+
+    def setFilterWildcard(self, pattern):
+        """
+        Overrides the base QSortFilterProxyModel implementation to rebuild
+        the filter matcher.
+        """
+        self._filter_matcher = None
+        super().setFilterWildcard(pattern)
+
+    def setFilterFixedString(self, pattern):
+        """
+        Overrides the base QSortFilterProxyModel implementation to rebuild
+        the filter matcher.
+        """
+        self._filter_matcher = None
+        super().setFilterFixedString(pattern)
+
+    def setFilterCaseSensitivity(self, cs):
+        """
+        Overrides the base QSortFilterProxyModel implementation to rebuild
+        the filter matcher.
+        """
+        self._filter_matcher = None
+        super().setFilterCaseSensitivity(cs)
+
     def lessThan(self, left, right):
         """
         Returns True if "left" is less than "right", otherwise
@@ -94,6 +244,9 @@ class ShotgunSortFilterProxyModel(QtGui.QSortFilterProxyModel):
         :returns:       Whether "left" is less than "right".
         :rtype:         bool
         """
+        if self._sort_key_caching:
+            return self._sort_keys_less_than(left, right)
+
         sg_left = shotgun_model.get_sg_data(left)
         sg_right = shotgun_model.get_sg_data(right)
 
@@ -106,27 +259,7 @@ class ShotgunSortFilterProxyModel(QtGui.QSortFilterProxyModel):
         # and right in the list, and we have no way to tell Qt that they're
         # equal. That's going to be consistent across Qt, though, so nothing
         # we can/should do about it.
-        #
-        # We push the primary sort field to the beginning of the list of
-        # fields that we're going to sort on, then least the rest in their
-        # existing order to act as secondary sort fields.
-        secondary_sort_fields = [
-            f for f in self.sort_by_fields if f != self.primary_sort_field
-        ]
-
-        # We are also going to shove "id" to the end of the secondary list
-        # if it is present. This is because it will never be equal between
-        # two entities, and thus will act as a wall to any secondary fields
-        # we might want to sort by lower in the list. As such, we'll treat
-        # it as the lowest priority.
-        if "id" in secondary_sort_fields:
-            secondary_sort_fields = [f for f in secondary_sort_fields if f != "id"] + [
-                "id"
-            ]
-
-        sort_fields = [self.primary_sort_field] + secondary_sort_fields
-
-        for sort_by_field in sort_fields:
+        for sort_by_field in self._get_sort_fields():
             try:
                 left_data = self._get_processable_field_data(
                     sg_left, sort_by_field, sortable=True
@@ -151,6 +284,169 @@ class ShotgunSortFilterProxyModel(QtGui.QSortFilterProxyModel):
 
         return False
 
+    def _get_sort_fields(self):
+        """
+        Returns the list of fields to sort on, in order of priority.
+
+        :returns:       A list of string Shotgun field names.
+        :rtype:         list
+        """
+        # We push the primary sort field to the beginning of the list of
+        # fields that we're going to sort on, then least the rest in their
+        # existing order to act as secondary sort fields.
+        secondary_sort_fields = [
+            f for f in self.sort_by_fields if f != self.primary_sort_field
+        ]
+
+        # We are also going to shove "id" to the end of the secondary list
+        # if it is present. This is because it will never be equal between
+        # two entities, and thus will act as a wall to any secondary fields
+        # we might want to sort by lower in the list. As such, we'll treat
+        # it as the lowest priority.
+        if "id" in secondary_sort_fields:
+            secondary_sort_fields = [f for f in secondary_sort_fields if f != "id"] + [
+                "id"
+            ]
+
+        return [self.primary_sort_field] + secondary_sort_fields
+
+    def _sort_keys_less_than(self, left, right):
+        """
+        Returns True if "left" is less than "right", comparing the cached
+        sort keys of the two items. This gives the same result as comparing
+        the items field by field in lessThan.
+
+        :param left:    The QModelIndex of the left-hand item to
+                        compare.
+        :param right:   The QModelIndex of the right-hand item to
+                        compare against.
+
+        :returns:       Whether "left" is less than "right".
+        :rtype:         bool
+        """
+        left_key = self._get_sort_key(left)
+        right_key = self._get_sort_key(right)
+
+        if left_key is None or right_key is None:
+            return False
+
+        left_data, left_missing = left_key
+        right_data, right_missing = right_key
+
+        if not left_missing and not right_missing:
+            # The tuple comparison skips equal fields and compares the
+            # first fields that differ, just as the field by field
+            # comparison does.
+            return left_data < right_data
+
+        # Fields missing from either item can't be compared and are
+        # skipped.
+        for left_value, right_value in zip(left_data, right_data):
+            if left_value is self._MISSING_FIELD or right_value is self._MISSING_FIELD:
+                continue
+
+            if left_value != right_value:
+                return left_value < right_value
+
+        return False
+
+    def _get_sort_key(self, index):
+        """
+        Returns the cached sort key for the given source index, computing
+        and caching it if needed.
+
+        :param index:   The source QModelIndex to get the sort key for.
+
+        :returns:       A tuple containing the tuple of sortable data for
+                        each sort field and whether any of the fields were
+                        missing from the item's data, or None if the item
+                        has no Shotgun data.
+        """
+        cache_key = self._get_row_cache_key(index)
+
+        try:
+            return self._sort_keys[cache_key]
+        except KeyError:
+            pass
+
+        sg_data = shotgun_model.get_sg_data(index)
+        if not sg_data:
+            sort_key = None
+        else:
+            if self._sort_fields is None:
+                self._sort_fields = self._get_sort_fields()
+
+            sort_data = []
+            for sort_by_field in self._sort_fields:
+                try:
+                    sort_data.append(
+                        self._get_processable_field_data(
+                            sg_data, sort_by_field, sortable=True
+                        )
+                    )
+                except KeyError:
+                    # The data for the field doesn't exist, see lessThan.
+                    sort_data.append(self._MISSING_FIELD)
+
+            sort_key = (
+                tuple(sort_data),
+                any(value is self._MISSING_FIELD for value in sort_data),
+            )
+
+        self._sort_keys[cache_key] = sort_key
+        return sort_key
+
+    def _clear_sort_keys(self):
+        """
+        Clears all cached sort keys.
+        """
+        self._sort_keys = {}
+        self._sort_fields = None
+
+    def _clear_row_caches(self, *args):
+        """
+        Clears all cached sort keys and search text. This is connected to
+        the source model signals that change its rows, the signal arguments
+        are ignored.
+        """
+        self._clear_sort_keys()
+        self._search_texts = {}
+
+    def _get_row_cache_key(self, index):
+        """
+        Returns the key used to cache data for the row of the given source
+        index.
+
+        :param index:   The source QModelIndex.
+
+        :returns:       The row path of the index, see
+                        utils.get_index_row_path. The row caches are
+                        cleared when the source model rows change, so
+                        the row path stays valid.
+        """
+        return utils.get_index_row_path(index)
+
+    def _on_source_data_changed(self, top_left, bottom_right, roles=None):
+        """
+        Slot triggered when the source model data changes. Removes the
+        cached sort keys and search text for the changed rows.
+        """
+        if not self._sort_keys and not self._search_texts:
+            return
+
+        if (
+            not top_left.isValid()
+            or not bottom_right.isValid()
+            or top_left.parent() != bottom_right.parent()
+        ):
+            self._clear_row_caches()
+            return
+
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            cache_key = self._get_row_cache_key(top_left.sibling(row, 0))
+            self._sort_keys.pop(cache_key, None)
+            self._search_texts.pop(cache_key, None)
+
     def filterAcceptsRow(self, row, source_parent):
         """
         Returns True if the model index should be shown, and False
@@ -170,13 +466,45 @@ class ShotgunSortFilterProxyModel(QtGui.QSortFilterProxyModel):
 
         # We only have one column, so column 0 is what we're
         # after.
-        sg_data = shotgun_model.get_sg_data(
-            self.sourceModel().index(row, 0, source_parent)
-        )
+        index = self.sourceModel().index(row, 0, source_parent)
 
-        if not sg_data:
+        if self._search_text_caching:
+            cache_key = self._get_row_cache_key(index)
+            try:
+                search_text = self._search_texts[cache_key]
+            except KeyError:
+                search_text = self._get_search_text(shotgun_model.get_sg_data(index))
+                self._search_texts[cache_key] = search_text
+        else:
+            search_text = self._get_search_text(shotgun_model.get_sg_data(index))
+
+        if search_text is None:
             return True
 
+        if self._filter_matcher is None:
+            self._filter_matcher = self._create_filter_matcher()
+
+        for text in search_text:
+            if self._filter_matcher(text):
+                return True
+
+        return False
+
+    def _get_search_text(self, sg_data):
+        """
+        Returns the searchable text for the filter fields of the given
+        entity dictionary.
+
+        :param sg_data:     An entity dictionary.
+
+        :returns:           A tuple of lower case strings for the filter
+                            fields that can be searched, or None if there
+                            is no data to search.
+        """
+        if not sg_data:
+            return None
+
+        search_text = []
         for field in self.filter_by_fields:
             try:
                 match_data = self._get_processable_field_data(sg_data, field)
@@ -187,18 +515,43 @@ class ShotgunSortFilterProxyModel(QtGui.QSortFilterProxyModel):
             if isinstance(match_data, bool):
                 continue
 
-            # We'll make this a looser match by making it case insensitive
-            # and bounding it with wildcards. This makes using the search
-            # feature much more like a "search" and less like a regex
-            # experiment.
-            regex = self.filterRegExp()
-            regex.setCaseSensitivity(QtCore.Qt.CaseInsensitive)
-            regex.setPattern("*%s*" % regex.pattern())
+            # The filter matching is case insensitive, so the text can be
+            # lower cased once here.
+            search_text.append(str(match_data).lower())
 
-            if regex.exactMatch(str(match_data)):
-                return True
+        return tuple(search_text)
 
-        return False
+    def _create_filter_matcher(self):
+        """
+        Creates the function used to match the filter against the lower
+        case searchable text of a row.
+
+        We'll make this a looser match by making it case insensitive
+        and bounding it with wildcards. This makes using the search
+        feature much more like a "search" and less like a regex
+        experiment.
+
+        :returns:           A function that takes a lower case string and
+                            returns True if it matches the filter.
+        """
+        regex = self.filterRegExp()
+        pattern = regex.pattern()
+
+        if regex.patternSyntax() in (
+            QtCore.QRegExp.Wildcard,
+            QtCore.QRegExp.WildcardUnix,
+        ):
+            # The pattern is bounded by wildcards, so any leading or
+            # trailing wildcards are redundant. If there are no other
+            # wildcard characters, the pattern is a plain substring.
+            substring = pattern.strip("*")
+            if not any(c in substring for c in "*?[]\\"):
+                substring = substring.lower()
+                return lambda text: substring in text
+
+        regex.setCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        regex.setPattern("*%s*" % pattern)
+        return regex.exactMatch
 
     def _get_processable_field_data(self, sg_data, field, sortable=False):
         """
@@ -512,3 +512,29 @@ def create_human_readable_timestamp(datetime_value, timestamp_format):
             time_str = datetime_obj.strftime("%H:%M")
 
     return time_str, full_time_str
+
+
+def get_index_row_path(index):
+    """
+    Return the row path of a model index, to use as a hashable key for the index.
+
+    QPersistentModelIndex is not hashable in older versions of PySide, so caches keyed by
+    model index use the rows of the index and its parent hierarchy instead. Unlike a
+    persistent index, the row path of an item changes when rows are inserted, removed or
+    moved before it, so caches keyed by row path must be updated or cleared when the model
+    rows change.
+
+    :param index: The model index to get the row path for.
+    :type index: :class:`sgtk.platform.qt.QtCore.QModelIndex`
+
+    :return: The rows of the index hierarchy, from the top level row down to the index
+        row. This is an empty tuple for an invalid (root) index.
+    :rtype: tuple
+    """
+
+    rows = []
+    while index.isValid():
+        rows.append(index.row())
+        index = index.parent()
+
+    return tuple(reversed(rows))
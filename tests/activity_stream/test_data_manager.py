@@ -0,0 +1,253 @@
+# Copyright (c) 2021 Autodesk Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk Inc.
+
+from datetime import datetime
+import os
+import shutil
+import sqlite3
+import tempfile
+
+import sgtk
+
+try:
+    from sgtk.platform.qt import QtGui
+except:
+    # components also use PySide, so make sure  we have this loaded up correctly
+    # before starting auto-doc.
+    from tank.util.qt_importer import QtImporter
+
+    importer = QtImporter()
+    sgtk.platform.qt.QtCore = importer.QtCore
+    sgtk.platform.qt.QtGui = importer.QtGui
+    from sgtk.platform.qt import QtGui
+
+from tank_test.tank_test_base import TankTestBase
+from tank_test.tank_test_base import setUpModule  # noqa
+
+
+class TestActivityStreamDataHandler(TankTestBase):
+    """
+    Test the activity stream ActivityStreamDataHandler cache database.
+    """
+
+    # The schema of the cache databases created before the schema was versioned.
+    DATABASE_SCHEMA_V0 = """
+        CREATE TABLE entity (entity_type text, entity_id integer, activity_id integer, created_at datetime);
+
+        CREATE TABLE activity (activity_id integer, note_id integer default null, payload blob, created_at datetime);
+
+        CREATE TABLE note (note_id integer, payload blob, created_at datetime);
+
+        CREATE INDEX entity_1 ON entity(entity_type, entity_id, created_at);
+        CREATE INDEX entity_2 ON entity(entity_type, entity_id, activity_id, created_at);
+
+        CREATE INDEX activity_1 ON activity(activity_id);
+        CREATE INDEX activity_2 ON activity(activity_id, note_id);
+
+        CREATE INDEX note_1 ON activity(note_id);
+    """
+
+    def setUp(self):
+        """
+        Start the test engine, import the necessary frameworks for testing, and create a data
+        handler with its cache database in a temporary folder.
+        """
+
+        super().setUp()
+        self.setup_fixtures()
+        context = sgtk.Context(self.tk, project=self.project)
+        self.engine = sgtk.platform.start_engine("tk-testengine", self.tk, context)
+        self._app = QtGui.QApplication.instance() or QtGui.QApplication([])
+
+        # We can't load modules from a test because load_framework can only be called
+        # from within a Toolkit bundle or hook, so we'll do it from a hook.
+        qt_fw = self.engine.apps["tk-testapp"].frameworks["tk-framework-qtwidgets"]
+        activity_stream = qt_fw.import_module("activity_stream")
+        self.ActivityStreamDataHandler = (
+            activity_stream.data_manager.ActivityStreamDataHandler
+        )
+
+        self.cache_dir = tempfile.mkdtemp()
+        self.data_handler = self.ActivityStreamDataHandler(None)
+        self.data_handler._cache_path = os.path.join(self.cache_dir, "cache.sqlite")
+
+    def tearDown(self):
+        """
+        Destroy the data handler, the engine and call the base test class to do the rest of
+        the tear down.
+        """
+
+        self.data_handler.destroy()
+        self.ActivityStreamDataHandler._cache_eviction_times.pop(
+            self.data_handler._cache_path, None
+        )
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.engine.destroy()
+        super().tearDown()
+
+    def _pickle(self, data):
+        """
+        Pickle the data the same way as the cache databases created before the payloads were
+        encoded with a codec.
+        """
+
+        payload = sgtk.util.pickle.dumps(data)
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        return sqlite3.Binary(payload)
+
+    def test_migrate_v0_database(self):
+        """
+        Test a cache database with the schema and pickled payloads used before the schema was
+        versioned is migrated to the current schema version, and its data can still be read.
+        """
+
+        created_at = datetime(2021, 6, 16, 12)
+        note_activity = {
+            "id": 10,
+            "update_type": "create",
+            "created_at": created_at,
+            "primary_entity": {"type": "Note", "id": 100},
+        }
+        activity = {
+            "id": 11,
+            "update_type": "update",
+            "created_at": created_at,
+            "primary_entity": {"type": "Shot", "id": 1},
+        }
+        note_thread = [{"type": "Note", "id": 100, "content": "Hello, World"}]
+
+        connection = sqlite3.connect(self.data_handler._cache_path)
+        connection.executescript(self.DATABASE_SCHEMA_V0)
+        # Version 0 databases may contain duplicate rows, and the note id may only be set on
+        # some of the duplicate activity rows.
+        connection.executemany(
+            "INSERT INTO entity VALUES (?, ?, ?, datetime('now'))",
+            [("Shot", 1, 10), ("Shot", 1, 10), ("Shot", 1, 11)],
+        )
+        connection.executemany(
+            "INSERT INTO activity VALUES (?, ?, ?, datetime('now'))",
+            [
+                (10, 100, self._pickle(note_activity)),
+                (10, None, self._pickle(note_activity)),
+                (11, None, self._pickle(activity)),
+            ],
+        )
+        connection.execute(
+            "INSERT INTO note VALUES (?, ?, datetime('now'))",
+            (100, self._pickle(note_thread)),
+        )
+        connection.commit()
+        connection.close()
+
+        assert self.data_handler.load_activity_data("Shot", 1) == [10, 11]
+        assert self.data_handler.get_activity_data(10) == note_activity
+        assert self.data_handler.get_activity_data(11) == activity
+        assert self.data_handler.note_threads == {100: note_thread}
+
+        self.data_handler.load_note_data(100)
+        assert self.data_handler.note_threads == {100: note_thread}
+
+        self.data_handler.destroy()
+        connection = sqlite3.connect(self.data_handler._cache_path)
+        try:
+            version = connection.execute("PRAGMA user_version;").fetchone()[0]
+            assert version == self.ActivityStreamDataHandler.DATABASE_SCHEMA_VERSION
+            assert connection.execute("SELECT count(*) FROM entity").fetchone() == (2,)
+            assert connection.execute(
+                "SELECT activity_id, note_id FROM activity ORDER BY activity_id"
+            ).fetchall() == [(10, 100), (11, None)]
+            assert set(
+                connection.execute("SELECT entity_type, entity_id FROM entity_access")
+            ) == {("Shot", 1), ("Note", 100)}
+        finally:
+            connection.close()
+
+    def test_evict_cache(self):
+        """
+        Test the cache eviction removes the entities that were not accessed recently, the
+        oldest activities of entities with too many activities, and the activities and notes
+        that are no longer used, and that the pages they used are freed by the incremental
+        vacuum.
+        """
+
+        # Create the cache database, then fill it directly with entities with large payloads.
+        # The Shot is recorded as accessed now, so it is kept.
+        self.data_handler.load_activity_data("Shot", 1)
+        self.data_handler.CACHE_MAX_ACTIVITIES_PER_ENTITY = 5
+        # Free the pages in several steps, and only with the incremental vacuum.
+        self.data_handler.CACHE_VACUUM_PAGES = 10
+        self.data_handler.CACHE_VACUUM_CONVERT_MAX_SIZE_MB = 0
+
+        payload = sqlite3.Binary(os.urandom(4096))
+        connection = sqlite3.connect(self.data_handler._cache_path)
+        try:
+            for entity_id in range(10):
+                # The entities with an even id were not accessed recently.
+                connection.execute(
+                    "INSERT INTO entity_access VALUES ('Asset', ?, datetime('now', ?))",
+                    (entity_id, "-365 days" if entity_id % 2 == 0 else "-1 days"),
+                )
+                for i in range(10):
+                    activity_id = entity_id * 10 + i
+                    connection.execute(
+                        "INSERT INTO entity VALUES ('Asset', ?, ?, datetime('now'))",
+                        (entity_id, activity_id),
+                    )
+                    connection.execute(
+                        "INSERT INTO activity VALUES (?, ?, ?, datetime('now'))",
+                        (activity_id, activity_id, payload),
+                    )
+                    connection.execute(
+                        "INSERT INTO note VALUES (?, ?, datetime('now'))",
+                        (activity_id, payload),
+                    )
+            connection.commit()
+            assert connection.execute("PRAGMA auto_vacuum;").fetchone()[0] == 2
+            page_count = connection.execute("PRAGMA page_count;").fetchone()[0]
+        finally:
+            connection.close()
+
+        assert self.data_handler._evict_cache(None, {}) == 5
+
+        # The most recent activities of the entities accessed recently are kept.
+        activity_ids = [
+            entity_id * 10 + i for entity_id in range(1, 10, 2) for i in range(5, 10)
+        ]
+        connection = sqlite3.connect(self.data_handler._cache_path)
+        try:
+            assert set(
+                connection.execute("SELECT entity_type, entity_id FROM entity_access")
+            ) == {("Shot", 1)} | {("Asset", entity_id) for entity_id in range(1, 10, 2)}
+            assert [
+                row[0]
+                for row in connection.execute(
+                    "SELECT activity_id FROM entity ORDER BY activity_id"
+                )
+            ] == activity_ids
+            assert [
+                row[0]
+                for row in connection.execute(
+                    "SELECT activity_id FROM activity ORDER BY activity_id"
+                )
+            ] == activity_ids
+            assert [
+                row[0]
+                for row in connection.execute(
+                    "SELECT note_id FROM note ORDER BY note_id"
+                )
+            ] == activity_ids
+
+            assert connection.execute("PRAGMA freelist_count;").fetchone()[0] == 0
+            assert (
+                connection.execute("PRAGMA page_count;").fetchone()[0] < page_count / 2
+            )
+        finally:
+            connection.close()
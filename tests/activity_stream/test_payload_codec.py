@@ -0,0 +1,139 @@
+# Copyright (c) 2021 Autodesk Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the ShotGrid Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the ShotGrid Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk Inc.
+
+import datetime
+import os
+import sys
+
+import pytest
+
+import sgtk
+
+# Manually add the app modules to the path in order to import them here.
+base_dir = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "python")
+)
+activity_stream_dir = os.path.abspath(os.path.join(base_dir, "activity_stream"))
+sys.path.extend([base_dir, activity_stream_dir])
+import payload_codec
+
+####################################################################################################
+# payload_codec Fixtures
+####################################################################################################
+
+
+@pytest.fixture
+def note_payload():
+    """
+    An activity stream payload for a note.
+    """
+
+    return {
+        "id": 6040,
+        "update_type": "create",
+        "created_at": 1466477744.0,
+        "created_by": {"id": 39, "name": "Jeff Beeland", "type": "HumanUser"},
+        "primary_entity": {
+            "id": 6040,
+            "type": "Note",
+            "content": "This is a tést note.",
+            "note_links": [{"id": 1167, "name": "123", "type": "Shot"}],
+            "read_by_current_user": "read",
+            "client_note": False,
+            "image": None,
+        },
+    }
+
+
+####################################################################################################
+# payload_codec Test Cases
+####################################################################################################
+
+
+@pytest.mark.parametrize("codec_name", ["pickle", "json", "zlib_json"])
+def test_payload_codec_encode_decode(codec_name, note_payload):
+    """
+    Test that payloads encoded with each codec are decoded to the original data.
+    """
+
+    codec = payload_codec.get_codec(codec_name)
+    payload = payload_codec.encode_payload(note_payload, codec)
+
+    assert payload[:2] == payload_codec.MARKER_PREFIX + codec.marker
+    assert payload_codec.decode_payload(payload) == note_payload
+
+
+def test_payload_codec_decode_legacy_pickle(note_payload):
+    """
+    Test that payloads pickled without a format marker are decoded.
+    """
+
+    payload = sgtk.util.pickle.dumps(note_payload)
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+
+    assert payload_codec.decode_payload(payload) == note_payload
+
+
+def test_payload_codec_json_datetime():
+    """
+    Test that the json codec encodes datetimes.
+    """
+
+    data = {"created_at": datetime.datetime(2021, 6, 16, 12, 30)}
+    codec = payload_codec.get_codec("json")
+
+    assert (
+        payload_codec.decode_payload(payload_codec.encode_payload(data, codec)) == data
+    )
+
+
+def test_payload_codec_json_fallback():
+    """
+    Test that data which cannot be encoded as json is pickled instead.
+    """
+
+    data = {"value": {1, 2, 3}}
+    payload = payload_codec.encode_payload(data, payload_codec.get_codec("json"))
+
+    assert payload[1:2] == payload_codec.PicklePayloadCodec.marker
+    assert payload_codec.decode_payload(payload) == data
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"value": (1, 2)},
+        {"value": [{1: "one"}]},
+        {"value": {"__datetime__": "2021-06-16T12:30:00"}},
+    ],
+)
+def test_payload_codec_json_fallback_round_trip(data):
+    """
+    Test that data which json does not decode to the same value is pickled instead.
+    """
+
+    payload = payload_codec.encode_payload(data, payload_codec.get_codec("zlib_json"))
+
+    assert payload[1:2] == payload_codec.PicklePayloadCodec.marker
+    assert payload_codec.decode_payload(payload) == data
+
+
+def test_payload_codec_register_codec_conflict():
+    """
+    Test that codecs cannot be registered with a marker that is already in use.
+    """
+
+    class _Codec(payload_codec.PayloadCodec):
+        name = "conflict"
+        marker = payload_codec.JsonPayloadCodec.marker
+
+    with pytest.raises(ValueError):
+        payload_codec.register_codec(_Codec())
@@ -0,0 +1,169 @@
+# Copyright (c) 2021 Autodesk Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk Inc.
+
+import sgtk
+
+try:
+    from sgtk.platform.qt import QtCore, QtGui
+except:
+    # components also use PySide, so make sure  we have this loaded up correctly
+    # before starting auto-doc.
+    from tank.util.qt_importer import QtImporter
+
+    importer = QtImporter()
+    sgtk.platform.qt.QtCore = importer.QtCore
+    sgtk.platform.qt.QtGui = importer.QtGui
+    from sgtk.platform.qt import QtCore, QtGui
+
+from tank_test.tank_test_base import TankTestBase
+from tank_test.tank_test_base import setUpModule  # noqa
+
+
+class TestViewItemDelegate(TankTestBase):
+    """
+    Test the delegates ViewItemDelegate class.
+    """
+
+    def setUp(self):
+        """
+        Start the test engine, import the necessary frameworks for testing, and create a view
+        with a delegate that has actions.
+        """
+
+        super().setUp()
+        self.setup_fixtures()
+        context = sgtk.Context(self.tk, project=self.project)
+        self.engine = sgtk.platform.start_engine("tk-testengine", self.tk, context)
+        self._app = QtGui.QApplication.instance() or QtGui.QApplication([])
+
+        # We can't load modules from a test because load_framework can only be called
+        # from within a Toolkit bundle or hook, so we'll do it from a hook.
+        qt_fw = self.engine.apps["tk-testapp"].frameworks["tk-framework-qtwidgets"]
+        delegates = qt_fw.import_module("delegates")
+
+        self.model = QtGui.QStandardItemModel()
+        self.model.appendRow(QtGui.QStandardItem("item"))
+        self.view = QtGui.QListView()
+        self.view.setMouseTracking(True)
+        self.view.setModel(self.model)
+
+        # The action visibility is read from the item data, or from the test when the item has
+        # no data, so that it can change without the delegate being notified.
+        self.action_visible = True
+        self.delegate = delegates.ViewItemDelegate(self.view)
+        self.delegate.add_actions(
+            [
+                {
+                    "name": "always",
+                    "show_always": True,
+                    "get_data": lambda parent, index: {
+                        "visible": (
+                            self.action_visible
+                            if index.data(QtCore.Qt.UserRole) is None
+                            else index.data(QtCore.Qt.UserRole)
+                        )
+                    },
+                },
+                {
+                    "name": "selected",
+                    "show_on_selected": True,
+                    "show_on_hover": False,
+                },
+                {
+                    "name": "hover",
+                    "show_on_selected": False,
+                    "show_on_hover": True,
+                },
+            ]
+        )
+        self.view.setItemDelegate(self.delegate)
+
+        self.index = self.model.index(0, 0)
+        self.option = QtGui.QStyleOptionViewItem()
+        self.option.rect = QtCore.QRect(0, 0, 200, 50)
+        self.option.state = QtGui.QStyle.State_Enabled
+        self.option.styleObject = self.view
+
+    def tearDown(self):
+        """
+        Destroy the view, the engine and call the base test class to do the rest of the tear
+        down.
+        """
+
+        self.view.deleteLater()
+        self.engine.destroy()
+        super().tearDown()
+
+    def _get_action_names(self):
+        """
+        Return the names of the actions laid out for the item.
+        """
+
+        return [
+            action.name
+            for action, _ in self.delegate._get_action_and_rects(
+                self.option, self.index
+            )
+        ]
+
+    def _paint(self):
+        """
+        Paint the item on a pixmap.
+        """
+
+        pixmap = QtGui.QPixmap(self.option.rect.size())
+        painter = QtGui.QPainter(pixmap)
+        try:
+            self.delegate.paint(painter, self.option, self.index)
+        finally:
+            painter.end()
+
+    def test_action_layout_paint(self):
+        """
+        Test the cached action layout is reused until the item is painted again.
+        """
+
+        assert self._get_action_names() == ["always"]
+
+        # The layout is cached, so changing the action visibility has no effect yet.
+        self.action_visible = False
+        assert self._get_action_names() == ["always"]
+
+        self._paint()
+        assert self._get_action_names() == []
+
+    def test_action_layout_data_changed(self):
+        """
+        Test the cached action layout is rebuilt after the item data changes.
+        """
+
+        assert self._get_action_names() == ["always"]
+
+        self.model.item(0).setData(False, QtCore.Qt.UserRole)
+        assert self._get_action_names() == []
+
+        self.model.item(0).setData(True, QtCore.Qt.UserRole)
+        assert self._get_action_names() == ["always"]
+
+    def test_action_layout_state_changed(self):
+        """
+        Test the cached action layout is rebuilt for the item state it is laid out for.
+        """
+
+        assert self._get_action_names() == ["always"]
+
+        self.option.state |= QtGui.QStyle.State_Selected
+        assert self._get_action_names() == ["always", "selected"]
+
+        self.option.state = QtGui.QStyle.State_Enabled | QtGui.QStyle.State_MouseOver
+        assert self._get_action_names() == ["always", "hover"]
+
+        self.option.state = QtGui.QStyle.State_Enabled
+        assert self._get_action_names() == ["always"]
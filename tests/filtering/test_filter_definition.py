@@ -600,3 +600,71 @@ class TestFiltersDefinition(TankTestBase):
                 data_values = fd.get_field_data(field_id)["values"]
                 for value, count in field_value_counts.items():
                     assert data_values[value]["count"] == count
+
+    def _get_value_counts(self, fd):
+        """
+        Return the filter value counts of the definition, mapped by field id and value id.
+        """
+
+        return {
+            field_id: {
+                value_id: value_data["count"]
+                for value_id, value_data in fd.get_field_data(field_id)[
+                    "values"
+                ].items()
+            }
+            for field_id in fd.get_fields()
+        }
+
+    def test_method_apply_snapshot(self):
+        """
+        Test updating the filters from a snapshot, with 'create_snapshot' and 'apply_snapshot',
+        gives the same value counts as building the filter definition.
+        """
+
+        fd = self.FilterDefinition()
+        fd.proxy_model = self.proxy_model
+
+        for data_set, _ in self.data_sets:
+            self.source_model.set_internal_data(data_set)
+            fd.build()
+            expected = self._get_value_counts(fd)
+            field_ids = list(fd.get_fields())
+            assert field_ids
+
+            snapshot = fd.create_snapshot(field_ids)
+            snapshot.update_filters(field_ids)
+            fd.apply_snapshot(snapshot, field_ids)
+
+            assert self._get_value_counts(fd) == expected
+
+    def test_method_apply_snapshot_model_changed(self):
+        """
+        Test updating the filters from a snapshot gives the value counts of the model data when
+        the snapshot was created, when the model data changes before the snapshot is applied.
+        """
+
+        fd = self.FilterDefinition()
+        fd.proxy_model = self.proxy_model
+
+        self.source_model.set_internal_data(self.string_data)
+        fd.build()
+        expected = self._get_value_counts(fd)
+        field_ids = list(fd.get_fields())
+
+        snapshot = fd.create_snapshot(field_ids)
+        # Change the model data after the snapshot was created.
+        self.source_model.set_internal_data(self.string_data[:2])
+        snapshot.update_filters(field_ids)
+        fd.apply_snapshot(snapshot, field_ids)
+
+        assert self._get_value_counts(fd) == expected
+
+        # Building the definition again gives the counts for the new model data.
+        fd.build()
+        assert self._get_value_counts(fd) != expected
+        snapshot = fd.create_snapshot(field_ids)
+        snapshot.update_filters(field_ids)
+        expected = self._get_value_counts(fd)
+        fd.apply_snapshot(snapshot, field_ids)
+        assert self._get_value_counts(fd) == expected
@@ -8,9 +8,10 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Autodesk Inc.
 
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 import sys
+from unittest.mock import patch
 
 import pytest
 
@@ -454,6 +455,373 @@ def test_filter_item_classmethod_is_group_op(input_op, expected):
 
 #     assert False
 
+
+class _IndexData(object):
+    """
+    Mock index object that returns the same data for any role.
+    """
+
+    def __init__(self, data):
+        self._data = data
+
+    def data(self, role):
+        return self._data
+
+
+def _create_filter_item(filter_type, filter_op, filter_value):
+    """
+    Convenience function to create a FilterItem with a filter value.
+    """
+
+    return FilterItem.create(
+        "filter.item.id",
+        {
+            "filter_type": filter_type,
+            "filter_op": filter_op,
+            "filter_value": filter_value,
+            "filter_role": 0,
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    "filter_items,op",
+    [
+        ([], FilterItem.FilterOp.AND),
+        ([], FilterItem.FilterOp.OR),
+        (
+            [
+                _create_filter_item(
+                    FilterItem.FilterType.STR, FilterItem.FilterOp.IN, "Hero"
+                )
+            ],
+            FilterItem.FilterOp.AND,
+        ),
+        (
+            [
+                _create_filter_item(
+                    FilterItem.FilterType.STR, FilterItem.FilterOp.NOT_IN, "her"
+                ),
+                _create_filter_item(
+                    FilterItem.FilterType.STR, FilterItem.FilterOp.EQUAL, "CHAR"
+                ),
+            ],
+            FilterItem.FilterOp.OR,
+        ),
+        (
+            [
+                _create_filter_item(
+                    FilterItem.FilterType.NUMBER, FilterItem.FilterOp.GREATER_THAN, 2
+                ),
+                _create_filter_item(
+                    FilterItem.FilterType.NUMBER,
+                    FilterItem.FilterOp.LESS_THAN_OR_EQUAL,
+                    10,
+                ),
+            ],
+            FilterItem.FilterOp.AND,
+        ),
+        (
+            [
+                FilterItem.create_group(
+                    FilterItem.FilterOp.OR,
+                    group_filters=[
+                        _create_filter_item(
+                            FilterItem.FilterType.NUMBER, FilterItem.FilterOp.EQUAL, 1
+                        ),
+                        _create_filter_item(
+                            FilterItem.FilterType.NUMBER,
+                            FilterItem.FilterOp.NOT_EQUAL,
+                            3,
+                        ),
+                    ],
+                ),
+                FilterItem.create_group(FilterItem.FilterOp.AND),
+            ],
+            FilterItem.FilterOp.AND,
+        ),
+    ],
+)
+@pytest.mark.parametrize(
+    "index_data",
+    [None, "", "hero", "Char_Hero", "char", 0, 1, 3, 5, 11],
+)
+def test_filter_item_classmethod_compile_filter(filter_items, op, index_data):
+    """
+    Test the classmethod 'compile_filter' gives the same results as 'do_filter'.
+    """
+
+    index = _IndexData(index_data)
+    try:
+        expected = FilterItem.do_filter(index, filter_items, op)
+    except TypeError:
+        # The data cannot be sanitized for the filter type, the compiled filter should fail too.
+        with pytest.raises(TypeError):
+            FilterItem.compile_filter(filter_items, op)(index)
+        return
+
+    result = FilterItem.compile_filter(filter_items, op)(index)
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    "filter_value,input_value",
+    [
+        ([1, 2, 3], [2]),
+        ([1, 2, 3], [4]),
+        ([1, 2, 3], []),
+        ([None], []),
+        ([], [None]),
+        ([], [1]),
+        ({"id": 1}, {"id": 1}),
+        ({"id": 1}, [{"id": 2}]),
+    ],
+)
+@pytest.mark.parametrize("op", [FilterItem.FilterOp.IN, FilterItem.FilterOp.NOT_IN])
+def test_filter_item_method_compile_list(filter_value, input_value, op):
+    """
+    Test the instance method 'compile' gives the same results as 'accepts' for list filters.
+    """
+
+    filter_item = _create_filter_item(FilterItem.FilterType.LIST, op, filter_value)
+    index = _IndexData(input_value)
+
+    assert filter_item.compile()(index) == filter_item.accepts(index)
+
+
+@pytest.mark.parametrize(
+    "input_value,expected",
+    [("hero", True), ("Char_HERO", True), ("char", False)],
+)
+@pytest.mark.parametrize("op", [FilterItem.FilterOp.IN, FilterItem.FilterOp.NOT_IN])
+def test_filter_item_method_compile_str_set_filter_value(input_value, expected, op):
+    """
+    Test the instance method 'compile' is case insensitive for string filters with a value
+    set by 'set_filter_value'.
+    """
+
+    filter_item = _create_filter_item(FilterItem.FilterType.STR, op, "")
+    assert filter_item.set_filter_value("Hero")
+    index = _IndexData(input_value)
+
+    if op == FilterItem.FilterOp.NOT_IN:
+        expected = not expected
+    assert filter_item.compile()(index) == expected
+    assert filter_item.accepts(index) == expected
+
+
+@pytest.mark.parametrize(
+    "filter_type,op,value,other_value,expected",
+    [
+        (FilterItem.FilterType.STR, FilterItem.FilterOp.IN, "Hero", "Hero", True),
+        (FilterItem.FilterType.STR, FilterItem.FilterOp.IN, "Hero", "Her", False),
+        (FilterItem.FilterType.LIST, FilterItem.FilterOp.IN, [1, 2], [1, 2], True),
+        (FilterItem.FilterType.LIST, FilterItem.FilterOp.IN, [1, 2], [2, 1], False),
+        (
+            FilterItem.FilterType.DICT,
+            FilterItem.FilterOp.EQUAL,
+            {"id": 1, "type": "Shot"},
+            {"type": "Shot", "id": 1},
+            True,
+        ),
+        (
+            FilterItem.FilterType.DICT,
+            FilterItem.FilterOp.EQUAL,
+            {"id": 1, "type": "Shot"},
+            {"id": 2, "type": "Shot"},
+            False,
+        ),
+    ],
+)
+def test_filter_item_method_get_structure_key(
+    filter_type, op, value, other_value, expected
+):
+    """
+    Test the instance method 'get_structure_key' for filter items and groups.
+    """
+
+    filter_item = _create_filter_item(filter_type, op, value)
+    other_item = _create_filter_item(filter_type, op, other_value)
+
+    # Keys must be hashable.
+    hash(filter_item.get_structure_key())
+    assert (
+        filter_item.get_structure_key() == other_item.get_structure_key()
+    ) == expected
+
+    group = FilterItem.create_group(FilterItem.FilterOp.AND, [filter_item])
+    other_group = FilterItem.create_group(FilterItem.FilterOp.AND, [other_item])
+    assert (group.get_structure_key() == other_group.get_structure_key()) == expected
+
+
+def _create_search_group(op, *values):
+    """
+    Convenience function to create a group of string search filter items.
+    """
+
+    return FilterItem.create_group(
+        op,
+        [
+            _create_filter_item(
+                FilterItem.FilterType.STR, FilterItem.FilterOp.IN, value
+            )
+            for value in values
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    "filter_item,other_item,expected",
+    [
+        (
+            _create_filter_item(
+                FilterItem.FilterType.STR, FilterItem.FilterOp.IN, "Hero"
+            ),
+            _create_filter_item(
+                FilterItem.FilterType.STR, FilterItem.FilterOp.IN, "her"
+            ),
+            True,
+        ),
+        (
+            _create_filter_item(
+                FilterItem.FilterType.STR, FilterItem.FilterOp.IN, "her"
+            ),
+            _create_filter_item(
+                FilterItem.FilterType.STR, FilterItem.FilterOp.IN, "Hero"
+            ),
+            False,
+        ),
+        (
+            _create_filter_item(
+                FilterItem.FilterType.STR, FilterItem.FilterOp.IN, "Hero"
+            ),
+            _create_filter_item(FilterItem.FilterType.STR, FilterItem.FilterOp.IN, ""),
+            True,
+        ),
+        (
+            _create_filter_item(
+                FilterItem.FilterType.STR, FilterItem.FilterOp.NOT_IN, "her"
+            ),
+            _create_filter_item(
+                FilterItem.FilterType.STR, FilterItem.FilterOp.NOT_IN, "hero"
+            ),
+            True,
+        ),
+        (
+            _create_filter_item(
+                FilterItem.FilterType.STR, FilterItem.FilterOp.NOT_IN, "hero"
+            ),
+            _create_filter_item(
+                FilterItem.FilterType.STR, FilterItem.FilterOp.NOT_IN, "her"
+            ),
+            False,
+        ),
+        (
+            _create_filter_item(
+                FilterItem.FilterType.STR, FilterItem.FilterOp.EQUAL, "Hero"
+            ),
+            _create_filter_item(
+                FilterItem.FilterType.STR, FilterItem.FilterOp.EQUAL, "H"
+            ),
+            False,
+        ),
+        (
+            _create_filter_item(
+                FilterItem.FilterType.NUMBER, FilterItem.FilterOp.EQUAL, 1
+            ),
+            _create_filter_item(
+                FilterItem.FilterType.NUMBER, FilterItem.FilterOp.EQUAL, 1
+            ),
+            True,
+        ),
+        (
+            _create_search_group(FilterItem.FilterOp.AND, "hero", "shot"),
+            _create_search_group(FilterItem.FilterOp.AND, "her"),
+            True,
+        ),
+        (
+            _create_search_group(FilterItem.FilterOp.AND, "her"),
+            _create_search_group(FilterItem.FilterOp.AND, "hero", "shot"),
+            False,
+        ),
+        (
+            _create_search_group(FilterItem.FilterOp.OR, "hero"),
+            _create_search_group(FilterItem.FilterOp.OR, "her", "shot"),
+            True,
+        ),
+        (
+            _create_search_group(FilterItem.FilterOp.OR, "hero", "shot"),
+            _create_search_group(FilterItem.FilterOp.OR, "her"),
+            False,
+        ),
+        (
+            _create_search_group(FilterItem.FilterOp.AND, "hero"),
+            _create_search_group(FilterItem.FilterOp.OR),
+            True,
+        ),
+        (
+            _create_search_group(FilterItem.FilterOp.OR),
+            _create_search_group(FilterItem.FilterOp.AND, "hero"),
+            False,
+        ),
+    ],
+)
+def test_filter_item_classmethod_is_structure_refinement(
+    filter_item, other_item, expected
+):
+    """
+    Test the classmethod 'is_structure_refinement'.
+    """
+
+    result = FilterItem.is_structure_refinement(
+        filter_item.get_structure_key(), other_item.get_structure_key()
+    )
+    assert result == expected
+
+    # Lists of filter items are compared the same way as groups.
+    result = FilterItem.is_structure_refinement(
+        FilterItem.get_filters_structure_key([filter_item]),
+        FilterItem.get_filters_structure_key([other_item]),
+    )
+    assert result == expected
+
+
+@pytest.mark.parametrize("op", [FilterItem.FilterOp.IN, FilterItem.FilterOp.NOT_IN])
+def test_filter_item_classmethod_is_structure_refinement_different_fields(op):
+    """
+    Test the classmethod 'is_structure_refinement' for filters of the same type on different
+    fields, that extract their data with a data_func.
+    """
+
+    def _create_field_filter_item(field, value):
+        return FilterItem.create(
+            "filter.{}".format(field),
+            {
+                "filter_type": FilterItem.FilterType.STR,
+                "filter_op": op,
+                "filter_value": value,
+                "data_func": lambda index: index.data(0).get(field),
+            },
+        )
+
+    filter_item = _create_field_filter_item("field_a", "her")
+    other_item = _create_field_filter_item("field_b", "hero")
+
+    for key, other_key in (
+        (filter_item.get_structure_key(), other_item.get_structure_key()),
+        (other_item.get_structure_key(), filter_item.get_structure_key()),
+        (
+            FilterItem.get_filters_structure_key([filter_item]),
+            FilterItem.get_filters_structure_key([other_item]),
+        ),
+        (
+            FilterItem.get_filters_structure_key([other_item]),
+            FilterItem.get_filters_structure_key([filter_item]),
+        ),
+    ):
+        assert not FilterItem.is_structure_refinement(key, other_key)
+
+
 # TODO
 # def test_filter_item_classmethod_get_datetime_bucket(self):
 #     """
@@ -462,6 +830,62 @@ def test_filter_item_classmethod_is_group_op(input_op, expected):
 #     assert False
 
 
+@pytest.mark.parametrize(
+    "days_offset,expected",
+    [
+        (0, "Today"),
+        (-1, "Yesterday"),
+        (1, "Tomorrow"),
+        (121, "Far Future"),
+        (-121, "Long Ago"),
+        (-60, "Last Few Months"),
+        (60, "Next Few Months"),
+        (-14, "Last Few Weeks"),
+        (-5, "Last Week"),
+        (-3, "This Week"),
+        (3, "This Week"),
+        (5, "Next Week"),
+        (20, "Next Few Weeks"),
+    ],
+)
+def test_filter_item_classmethod_get_datetime_buckets(days_offset, expected):
+    """
+    Test the classmethod 'get_datetime_buckets'.
+    """
+
+    # A Wednesday
+    now = datetime(2021, 6, 16, 12)
+    values = [None, "Today", now + timedelta(days=days_offset)]
+
+    result = FilterItem.get_datetime_buckets(values, now=now)
+    assert result == ["No Date", "Today", expected]
+
+
+def test_filter_item_method_compile_datetime_bucket_day_change():
+    """
+    Test the instance method 'compile' gets the datetime buckets relative to the current day
+    when the compiled filter is called, not when it is compiled.
+    """
+
+    filter_item = _create_filter_item(
+        FilterItem.FilterType.DATETIME, FilterItem.FilterOp.EQUAL, "Today"
+    )
+    now = datetime.now()
+    index = _IndexData(now)
+    check = filter_item.compile()
+    assert check(index)
+
+    # The day changes after the filter was compiled.
+    get_datetime_bucketer = FilterItem.get_datetime_bucketer
+    with patch.object(
+        FilterItem,
+        "get_datetime_bucketer",
+        lambda now=None: get_datetime_bucketer(datetime.now() + timedelta(days=1)),
+    ):
+        assert not check(index)
+        assert not filter_item.accepts(index)
+
+
 @pytest.mark.parametrize(
     "filter_item,expected",
     [
@@ -0,0 +1,131 @@
+# Copyright (c) 2021 Autodesk Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk Inc.
+
+import sgtk
+
+try:
+    from sgtk.platform.qt import QtCore
+except:
+    # components also use PySide, so make sure  we have this loaded up correctly
+    # before starting auto-doc.
+    from tank.util.qt_importer import QtImporter
+
+    importer = QtImporter()
+    sgtk.platform.qt.QtCore = importer.QtCore
+    sgtk.platform.qt.QtGui = importer.QtGui
+    from sgtk.platform.qt import QtCore
+
+from tank_test.tank_test_base import TankTestBase
+from tank_test.tank_test_base import setUpModule  # noqa
+
+from list_model import _TestListModel
+
+
+class TestFilterItemProxyModel(TankTestBase):
+    """
+    Test the filtering FilterItemProxyModel class.
+    """
+
+    def setUp(self):
+        """
+        Start the test engine, import the necessary frameworks for testing, and initialize some basic model data.
+        """
+
+        super().setUp()
+        self.setup_fixtures()
+        context = sgtk.Context(self.tk, project=self.project)
+        self.engine = sgtk.platform.start_engine("tk-testengine", self.tk, context)
+
+        # We can't load modules from a test because load_framework can only be called
+        # from within a Toolkit bundle or hook, so we'll do it from a hook.
+        qt_fw = self.engine.apps["tk-testapp"].frameworks["tk-framework-qtwidgets"]
+        filtering = qt_fw.import_module("filtering")
+        self.FilterItem = filtering.FilterItem
+        self.FilterItemProxyModel = filtering.FilterItemProxyModel
+
+        self.source_model = _TestListModel()
+        self.source_model.set_internal_data(
+            [
+                [{"name": "row one", "tag": "alpha"}],
+                [{"name": "row two", "tag": "beta"}],
+                [{"name": "some data", "tag": "alphabet"}],
+                [{"name": "more data", "tag": "gamma"}],
+                [{"name": "and more data", "tag": "alpha beta"}],
+                [{"name": "other", "tag": "data"}],
+            ]
+        )
+
+    def tearDown(self):
+        """
+        Destroy the engine and call the base test class to do the rest of the tear down.
+        """
+
+        self.engine.destroy()
+        super().tearDown()
+
+    def _create_filter_item(self, field, value):
+        """
+        Create a string filter item that accepts rows with field data containing the value.
+        """
+
+        return self.FilterItem.create(
+            "filter.{}".format(field),
+            {
+                "filter_type": self.FilterItem.FilterType.STR,
+                "filter_op": self.FilterItem.FilterOp.IN,
+                "filter_value": value,
+                "data_func": lambda index: index.data(QtCore.Qt.DisplayRole)[field],
+            },
+        )
+
+    def _get_accepted_rows(self, proxy_model):
+        """
+        Return the source model rows accepted by the proxy model.
+        """
+
+        return sorted(
+            proxy_model.mapToSource(proxy_model.index(row, 0)).row()
+            for row in range(proxy_model.rowCount())
+        )
+
+    def test_method_set_filter_items_refilter(self):
+        """
+        Test the rows accepted after setting filter items that narrow or loosen the previous
+        filter items, where only some of the rows are tested again, are the same as after
+        filtering all rows.
+        """
+
+        filter_values = [
+            # Narrowing then loosening the same filter.
+            [("name", v) for v in ("a", "data", "more data")],
+            [("name", v) for v in ("more data", "data", "")],
+            # Changing to a filter on a different field, with a value that would narrow or
+            # loosen the previous filter if it were on the same field.
+            [("name", "a"), ("tag", "alpha")],
+            [("tag", "alpha"), ("name", "a")],
+            [("tag", "alpha"), ("name", "alpha"), ("tag", "alp")],
+        ]
+
+        for filters in filter_values:
+            proxy_model = self.FilterItemProxyModel()
+            proxy_model.setSourceModel(self.source_model)
+
+            for field, value in filters:
+                filter_items = [self._create_filter_item(field, value)]
+                proxy_model.set_filter_items(filter_items)
+
+                # Filter all the rows with a new proxy model, that has no accepted rows cached.
+                expected_model = self.FilterItemProxyModel()
+                expected_model.setSourceModel(self.source_model)
+                expected_model.set_filter_items(filter_items)
+
+                assert self._get_accepted_rows(proxy_model) == self._get_accepted_rows(
+                    expected_model
+                ), (filters, value)
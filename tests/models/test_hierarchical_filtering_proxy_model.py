@@ -0,0 +1,136 @@
+# Copyright (c) 2021 Autodesk Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk Inc.
+
+import os
+import sys
+
+import pytest
+
+import sgtk
+
+try:
+    from sgtk.platform.qt import QtCore, QtGui
+except:
+    # components also use PySide, so make sure  we have this loaded up correctly
+    # before starting auto-doc.
+    from tank.util.qt_importer import QtImporter
+
+    importer = QtImporter()
+    sgtk.platform.qt.QtCore = importer.QtCore
+    sgtk.platform.qt.QtGui = importer.QtGui
+    from sgtk.platform.qt import QtCore, QtGui
+
+# Manually add the app modules to the path in order to import them here.
+base_dir = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "python")
+)
+models_dir = os.path.abspath(os.path.join(base_dir, "models"))
+sys.path.extend([base_dir, models_dir])
+from hierarchical_filtering_proxy_model import HierarchicalFilteringProxyModel
+
+####################################################################################################
+# HierarchicalFilteringProxyModel Fixtures
+####################################################################################################
+
+
+class _MatchFilteringProxyModel(HierarchicalFilteringProxyModel):
+    """
+    Accept the rows whose text contains "match", and all the descendants of accepted rows.
+    """
+
+    def _is_row_accepted(self, src_row, src_parent_idx, parent_accepted):
+        if parent_accepted:
+            return True
+        src_idx = self.sourceModel().index(src_row, 0, src_parent_idx)
+        return "match" in src_idx.data()
+
+
+@pytest.fixture()
+def source_model():
+    """
+    Fixture to create a small tree model:
+
+        root
+          parent
+            child 1 match
+            child 2
+              grandchild
+          other
+            child 3
+    """
+
+    model = QtGui.QStandardItemModel()
+    parent = QtGui.QStandardItem("parent")
+    parent.appendRow(QtGui.QStandardItem("child 1 match"))
+    child = QtGui.QStandardItem("child 2")
+    child.appendRow(QtGui.QStandardItem("grandchild"))
+    parent.appendRow(child)
+    model.appendRow(parent)
+    other = QtGui.QStandardItem("other")
+    other.appendRow(QtGui.QStandardItem("child 3"))
+    model.appendRow(other)
+    return model
+
+
+def _get_row_counts(model, parent=QtCore.QModelIndex()):
+    """
+    Return the row counts of the model, for every row in the tree.
+    """
+
+    counts = [model.rowCount(parent)]
+    for row in range(model.rowCount(parent)):
+        counts.extend(_get_row_counts(model, model.index(row, 0, parent)))
+    return counts
+
+
+####################################################################################################
+# HierarchicalFilteringProxyModel Test Cases
+####################################################################################################
+
+
+@pytest.mark.parametrize(
+    "path,text",
+    [
+        # The parent stays visible because of its accepted child, but becomes accepted itself,
+        # so all of its descendants become accepted.
+        ((0,), "parent match"),
+        # A child with children becomes accepted, so its children become accepted.
+        ((0, 1), "child 2 match"),
+        # A grandchild becomes accepted, so its parent becomes visible.
+        ((0, 1, 0), "grandchild match"),
+        # A child becomes accepted, so its parent becomes visible.
+        ((1, 0), "child 3 match"),
+    ],
+)
+@pytest.mark.parametrize("flip_back", [False, True])
+def test_incremental_filtering(source_model, path, text, flip_back):
+    """
+    Test the rows accepted after a source model data change with incremental filtering enabled
+    are the same as after a full re-filter.
+    """
+
+    proxy_model = _MatchFilteringProxyModel()
+    proxy_model.enable_incremental_filtering()
+    proxy_model.setSourceModel(source_model)
+    # Filter the whole tree, to fill the accepted caches.
+    _get_row_counts(proxy_model)
+
+    item = source_model.item(path[0])
+    for row in path[1:]:
+        item = item.child(row)
+    prev_text = item.text()
+    item.setText(text)
+    if flip_back:
+        _get_row_counts(proxy_model)
+        item.setText(prev_text)
+
+    result = _get_row_counts(proxy_model)
+    proxy_model.invalidateFilter()
+    assert result == _get_row_counts(proxy_model)